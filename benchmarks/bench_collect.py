@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+collect_data 端到端基准测试
+
+使用 HTTP_REPLAY_MODE 录制的 cassette 离线回放所有平台，重复运行完整的采集流程，
+记录墙钟时间、CPU 时间、峰值内存以及各阶段耗时：
+    fetch: 网络请求（回放时为读取 cassette）
+    decode: 响应体解码（JSON 解析 / 文本解码）
+    parse: 平台 fetch() 中除请求和解码之外的部分（HTML / 脚本解析、字段提取）
+    normalize: BaseCollector.normalize_data
+    group: group_by_category
+    serialize: 写入分类 JSON、CSV 和运行报告
+
+采集固定在单进程中进行（不受 COLLECT_WORKERS 影响），各阶段才能在本进程中计时。
+
+用法：
+    # 先在线采集一次并录制响应
+    python benchmarks/bench_collect.py --record
+    
+    # 回放 5 次，与基线对比
+    python benchmarks/bench_collect.py --iterations 5
+    
+    # 把本次结果保存为新的基线
+    python benchmarks/bench_collect.py --save-baseline
+"""
+
+import argparse
+import asyncio
+import functools
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+# 在导入 src 之前设置环境：独立的缓存目录，关闭熔断、请求合并与条件请求，
+# 保证每轮都完整地走一遍请求 -> 解码 -> 解析流程
+_BENCH_CACHE_DIR = tempfile.mkdtemp(prefix="bench_collect_cache_")
+os.environ["CACHE_DIR"] = _BENCH_CACHE_DIR
+os.environ.setdefault("CIRCUIT_BREAKER", "0")
+os.environ.setdefault("HTTP_COALESCE", "0")
+os.environ.setdefault("HTTP_CONDITIONAL_GET", "0")
+
+from loguru import logger  # noqa: E402
+
+from benchmarks.common import (  # noqa: E402
+    RESULTS_DIR,
+    compare,
+    environment,
+    load_json,
+    max_rss_mb,
+    print_comparison,
+    regressions,
+    summarize,
+    write_json,
+)
+from src import data_collector  # noqa: E402
+from src.cache.cache_manager import get_cache_manager  # noqa: E402
+from src.collectors.base import BaseCollector  # noqa: E402
+from src.platforms.registry import PLATFORMS  # noqa: E402
+from src.utils.http_client import close_shared_session  # noqa: E402
+from src.utils.http_metrics import get_network_metrics  # noqa: E402
+from src.utils.http_replay import HTTP_CASSETTE_DIR, configure_replay  # noqa: E402
+from src.utils.run_context import current_platform  # noqa: E402
+
+STAGES = ["fetch", "decode", "parse", "normalize", "group", "serialize"]
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline_collect.json")
+
+
+class StageTimer:
+    """按阶段和平台累计耗时"""
+    
+    def __init__(self):
+        self.totals: Dict[str, float] = defaultdict(float)
+        self.by_platform: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    
+    def add(self, stage: str, seconds: float):
+        """累计一次耗时，平台取自当前任务的上下文"""
+        self.totals[stage] += seconds
+        platform = current_platform.get()
+        if platform:
+            self.by_platform[platform][stage] += seconds
+    
+    def wrap(self, func: Callable, stage: str) -> Callable:
+        """包装同步函数"""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(stage, time.perf_counter() - start)
+        return wrapper
+    
+    def wrap_async(self, func: Callable, stage: str) -> Callable:
+        """包装协程函数"""
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self.add(stage, time.perf_counter() - start)
+        return wrapper
+
+
+class Patches:
+    """临时替换属性，退出时恢复"""
+    
+    def __init__(self):
+        self._saved: List[tuple] = []
+    
+    def set(self, owner: Any, name: str, value: Any):
+        self._saved.append((owner, name, name in vars(owner), getattr(owner, name)))
+        setattr(owner, name, value)
+    
+    def restore(self):
+        for owner, name, existed, original in reversed(self._saved):
+            if existed:
+                setattr(owner, name, original)
+            else:
+                delattr(owner, name)
+        self._saved.clear()
+
+
+def quiet_logger():
+    """只输出警告以上的日志到标准错误，不写日志文件"""
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING", format="{level: <8} | {message}")
+    return logger
+
+
+def install_timers(timer: StageTimer) -> Patches:
+    """在各阶段入口安装计时包装"""
+    patches = Patches()
+    patches.set(data_collector, "setup_logger", quiet_logger)
+    patches.set(data_collector, "group_by_category", timer.wrap(data_collector.group_by_category, "group"))
+    for name in ["save_to_json", "extract_titles_to_csv", "save_run_report"]:
+        patches.set(data_collector, name, timer.wrap(getattr(data_collector, name), "serialize"))
+    patches.set(BaseCollector, "normalize_data", timer.wrap(BaseCollector.normalize_data, "normalize"))
+    for cls in set(PLATFORMS.values()):
+        patches.set(cls, "fetch", timer.wrap_async(cls.fetch, "platform_fetch"))
+    return patches
+
+
+def run_iteration(data_dir: str) -> Dict[str, Any]:
+    """运行一轮完整采集，返回本轮的测量结果"""
+    timer = StageTimer()
+    patches = install_timers(timer)
+    
+    # 每轮清空平台缓存，保证真正执行采集
+    get_cache_manager().clear()
+    shutil.rmtree(data_dir, ignore_errors=True)
+    gc.collect()
+    
+    async def run():
+        try:
+            # 固定单进程采集：COLLECT_WORKERS > 1 时采集在子进程中进行，本进程的阶段计时记录不到，
+            # 结果也无法与基线对比
+            await data_collector.collect_data(data_dir=data_dir, workers=1)
+        finally:
+            await close_shared_session()
+    
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        asyncio.run(run())
+    finally:
+        patches.restore()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    
+    # 网络与解码耗时来自 HTTPClient 的请求记录
+    network_by_platform: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for record in get_network_metrics().records:
+        decode = record["decode"] or 0.0
+        timer.totals["fetch"] += record["total"] - decode
+        timer.totals["decode"] += decode
+        if record["platform"]:
+            network_by_platform[record["platform"]]["fetch"] += record["total"] - decode
+            network_by_platform[record["platform"]]["decode"] += decode
+    
+    # parse = 平台 fetch() 总耗时 - 其中的请求和解码耗时
+    platforms = {}
+    for name in PLATFORMS:
+        stages = timer.by_platform.get(name, {})
+        network = network_by_platform.get(name, {})
+        fetch_call = stages.get("platform_fetch", 0.0)
+        parse = max(0.0, fetch_call - network.get("fetch", 0.0) - network.get("decode", 0.0))
+        timer.totals["parse"] += parse
+        platforms[name] = {
+            "fetch": round(network.get("fetch", 0.0), 6),
+            "decode": round(network.get("decode", 0.0), 6),
+            "parse": round(parse, 6),
+            "normalize": round(stages.get("normalize", 0.0), 6),
+        }
+    
+    report = load_json(os.path.join(data_dir, datetime.now().strftime("%Y-%m-%d"), "run_report.json")) or {}
+    return {
+        "wall_s": round(wall, 6),
+        "cpu_s": round(cpu, 6),
+        "max_rss_mb": max_rss_mb(),
+        "successful_platforms": report.get("successful_platforms"),
+        "failed_platforms": report.get("failed_platforms"),
+        "total_items": report.get("total_items"),
+        "errors": report.get("errors", {}),
+        "stages": {stage: round(timer.totals.get(stage, 0.0), 6) for stage in STAGES},
+        "platforms": platforms,
+    }
+
+
+def build_summary(runs: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """汇总各轮结果"""
+    summary = {
+        "wall_s": summarize(run["wall_s"] for run in runs),
+        "cpu_s": summarize(run["cpu_s"] for run in runs),
+        "max_rss_mb": summarize(run["max_rss_mb"] for run in runs),
+    }
+    for stage in STAGES:
+        summary[f"stage_{stage}_s"] = summarize(run["stages"][stage] for run in runs)
+    return {metric: stats for metric, stats in summary.items() if stats}
+
+
+def platform_medians(runs: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """各平台各阶段耗时的中位数，按总耗时从高到低排列"""
+    result = {}
+    for name in PLATFORMS:
+        result[name] = {
+            stage: summarize(run["platforms"][name][stage] for run in runs)["median"]
+            for stage in ["fetch", "decode", "parse", "normalize"]
+        }
+    return dict(sorted(result.items(), key=lambda item: sum(item[1].values()), reverse=True))
+
+
+def record_fixtures(cassette_dir: str, data_dir: str):
+    """在线采集一次，录制所有平台的响应"""
+    configure_replay("record", cassette_dir=cassette_dir)
+    
+    async def run():
+        try:
+            # 与回放测量一致，固定单进程采集
+            await data_collector.collect_data(data_dir=data_dir, workers=1)
+        finally:
+            await close_shared_session()
+    
+    asyncio.run(run())
+    print(f"已录制到: {cassette_dir}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="collect_data 端到端基准测试（回放录制的响应）")
+    parser.add_argument("--cassettes", default=HTTP_CASSETTE_DIR, help="cassette 目录")
+    parser.add_argument("--iterations", type=int, default=5, help="测量轮数")
+    parser.add_argument("--warmup", type=int, default=1, help="预热轮数（不计入结果）")
+    parser.add_argument("--latency", default="0", help="回放延迟：秒数，或 recorded（按录制时的耗时）")
+    parser.add_argument("--output", help="结果文件路径，默认 benchmarks/results/collect-<时间>.json")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线文件路径")
+    parser.add_argument("--save-baseline", action="store_true", help="把本次结果保存为基线")
+    parser.add_argument("--threshold", type=float, default=10.0, help="中位数变慢超过该百分比视为退化")
+    parser.add_argument("--fail-on-regression", action="store_true", help="出现退化时以非 0 状态码退出")
+    parser.add_argument("--record", action="store_true", help="在线采集一次并录制响应，然后退出")
+    args = parser.parse_args()
+    
+    data_dir = tempfile.mkdtemp(prefix="bench_collect_data_")
+    try:
+        if args.record:
+            record_fixtures(args.cassettes, data_dir)
+            return 0
+        
+        if not os.path.isdir(args.cassettes):
+            print(f"cassette 目录不存在: {args.cassettes}，请先运行 --record 录制", file=sys.stderr)
+            return 2
+        configure_replay("replay", cassette_dir=args.cassettes, latency=args.latency)
+        
+        for _ in range(args.warmup):
+            run_iteration(data_dir)
+        
+        runs = []
+        for i in range(args.iterations):
+            run = run_iteration(data_dir)
+            runs.append(run)
+            print(
+                f"第 {i + 1}/{args.iterations} 轮: 墙钟 {run['wall_s']:.3f}s, CPU {run['cpu_s']:.3f}s, "
+                f"成功 {run['successful_platforms']}/{len(PLATFORMS)} 个平台, {run['total_items']} 条"
+            )
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+        shutil.rmtree(_BENCH_CACHE_DIR, ignore_errors=True)
+    
+    summary = build_summary(runs)
+    result = {
+        "benchmark": "collect_data",
+        "environment": environment(),
+        "settings": {
+            "cassettes": os.path.abspath(args.cassettes),
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "latency": args.latency,
+            "platforms": len(PLATFORMS),
+        },
+        "summary": summary,
+        "platforms": platform_medians(runs),
+        "runs": runs,
+        "comparison": None,
+    }
+    
+    baseline = load_json(args.baseline)
+    if baseline and not args.save_baseline:
+        result["comparison"] = compare(summary, baseline.get("summary", {}), args.threshold)
+        if baseline.get("runs") and baseline["runs"][0].get("successful_platforms") != runs[0]["successful_platforms"]:
+            print(
+                f"注意: 成功平台数与基线不同（{baseline['runs'][0].get('successful_platforms')} -> "
+                f"{runs[0]['successful_platforms']}），对比结果可能不可比"
+            )
+    
+    output = args.output or os.path.join(RESULTS_DIR, f"collect-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    write_json(output, result)
+    
+    print("")
+    print("汇总（中位数）:")
+    for metric, stats in summary.items():
+        print(f"  {metric:<22} {stats['median']:.4f}")
+    print("")
+    print("耗时最高的平台（中位数，秒）:")
+    for name, stages in list(result["platforms"].items())[:10]:
+        print("  " + f"{name:<16}" + "  ".join(f"{stage} {value:.4f}" for stage, value in stages.items()))
+    print("")
+    if result["comparison"]:
+        print_comparison(result["comparison"])
+        print("")
+    print(f"结果已保存: {output}")
+    
+    if args.save_baseline:
+        write_json(args.baseline, result)
+        print(f"基线已保存: {args.baseline}")
+    
+    if args.fail_on_regression and result["comparison"] and regressions(result["comparison"]):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+平台解析器微基准测试
+
+用合成的页面样本（按各平台真实页面的结构生成，列表长度为基础条数的 1x / 10x / 100x）
+单独测量各平台的解析步骤：平台的 http_client 替换为直接返回样本的桩对象，
+因此 fetch() 的耗时就是 HTML / 脚本解析与字段提取的耗时。
+用于发现列表变长时耗时增长超过线性的解析器。
+
+用法：
+    python benchmarks/bench_parsers.py
+    python benchmarks/bench_parsers.py --platforms ithome,kuaishou --scales 1,10
+    python benchmarks/bench_parsers.py --dump-samples /tmp/samples   # 保存生成的样本
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.common import (  # noqa: E402
+    RESULTS_DIR,
+    compare,
+    environment,
+    load_json,
+    print_comparison,
+    regressions,
+    summarize,
+    write_json,
+)
+from src.platforms.registry import PLATFORMS  # noqa: E402
+from src.utils import json_utils  # noqa: E402
+from src.utils.http_client import RawContent  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline_parsers.json")
+DEFAULT_SCALES = [1, 10, 100]
+# 100x 的耗时超过 1x 的 100 倍 * 该系数时视为增长超过线性
+SUPERLINEAR_FACTOR = 1.5
+
+
+def wrap_page(body: str, title: str) -> str:
+    """包上真实页面常见的头部、导航、样式和脚本，使 1x 样本也带有固定的页面开销"""
+    nav = "".join(f'<li class="nav-item"><a href="/channel/{i}">频道{i}</a></li>' for i in range(60))
+    style = "".join(f".c{i}{{margin:{i % 8}px;padding:{i % 5}px;color:#{i:06x}}}" for i in range(400))
+    script = "var config = " + json.dumps({f"key{i}": f"value{i}" * 4 for i in range(300)}) + ";"
+    return (
+        f'<!DOCTYPE html><html lang="zh-CN"><head><meta charset="utf-8"><title>{title}</title>'
+        f"<style>{style}</style><script>{script}</script></head>"
+        f'<body><header><ul class="nav">{nav}</ul></header>'
+        f'<div id="wrapper">{body}</div>'
+        f'<footer><p>Copyright {title}</p></footer></body></html>'
+    )
+
+
+def build_ithome(n: int) -> str:
+    items = "".join(
+        f'<div class="placeholder"><a href="https://m.ithome.com/html/{700000 + i}.htm">'
+        f'<img data-original="https://img.ithome.com/newsuploadfiles/{i}.jpg">'
+        f'<p class="plc-title">IT之家新闻标题 {i} 某厂商发布新品</p>'
+        f'<div class="plc-footer"><span class="post-time">{1700000000 + i}</span>'
+        f'<span class="review-num">{i * 7}评</span></div></a></div>'
+        for i in range(n)
+    )
+    return wrap_page(f'<div class="rank-box">{items}</div>', "IT之家")
+
+
+def build_douban_movie(n: int) -> str:
+    items = "".join(
+        f'<tr class="item"><td width="100"><a class="nbg" href="https://movie.douban.com/subject/{3000000 + i}/" title="电影 {i}">'
+        f'<img src="https://img.doubanio.com/view/photo/s_ratio_poster/public/p{i}.jpg" width="75"></a></td>'
+        f'<td valign="top"><div class="pl2"><a href="https://movie.douban.com/subject/{3000000 + i}/">电影 {i}</a>'
+        f'<p class="pl">2024-01-01(中国大陆) / 演员甲 / 演员乙 / 演员丙 / 剧情 / 喜剧</p>'
+        f'<div class="star clearfix"><span class="rating_nums">{7 + i % 3}.{i % 10}</span>'
+        f'<span class="pl">({10000 + i * 13}人评价)</span></div></div></td></tr>'
+        for i in range(n)
+    )
+    return wrap_page(f'<div class="article"><div class="indent"><table>{items}</table></div></div>', "豆瓣电影")
+
+
+def build_douban_group(n: int) -> str:
+    items = "".join(
+        f'<div class="channel-item"><div class="likes">{i}<br>喜欢</div><div class="bd">'
+        f'<h3><a href="https://www.douban.com/group/topic/{300000000 + i}/">小组话题 {i}</a></h3>'
+        f'<div class="block"><div class="pic"><div class="pic-wrap"><img src="https://img.doubanio.com/{i}.jpg"></div></div>'
+        f'<p>话题摘要 {i}，这里是一段比较长的正文摘录内容，用来模拟真实页面中的描述文字。</p></div>'
+        f'<div class="source"><span class="from">来自<a href="https://www.douban.com/group/{i}/">小组 {i}</a></span>'
+        f'<span class="pubtime">{1700000000 + i}</span></div></div></div>'
+        for i in range(n)
+    )
+    return wrap_page(f'<div class="article">{items}</div>', "豆瓣小组")
+
+
+def build_jianshu(n: int) -> str:
+    items = "".join(
+        f'<li id="note-{i}" class="have-img"><a class="wrap-img" href="/p/{i:012x}" target="_blank">'
+        f'<img class="img-blur-done" src="https://upload-images.jianshu.io/{i}.jpg"></a>'
+        f'<div class="content"><a class="title" target="_blank" href="/p/{i:012x}">简书文章 {i}</a>'
+        f'<p class="abstract">文章摘要 {i}，记录生活中的点点滴滴以及读书笔记与心得体会。</p>'
+        f'<div class="meta"><span class="jsd-meta">{i}</span><a class="nickname" href="/u/{i:08x}">作者{i}</a>'
+        f'<a href="/p/{i:012x}#comments"><i class="iconfont ic-list-comments"></i> {i % 50}</a>'
+        f'<span><i class="iconfont ic-list-like"></i> {i % 300}</span></div></div></li>'
+        for i in range(n)
+    )
+    return wrap_page(f'<div id="list-container"><ul class="note-list">{items}</ul></div>', "简书")
+
+
+def build_github(n: int) -> str:
+    items = "".join(
+        f'<article class="Box-row"><div class="float-right d-flex"><div class="BtnGroup">Star</div></div>'
+        f'<h2 class="h3 lh-condensed"><a href="/owner{i}/repo{i}" class="Link">'
+        f'<svg class="octicon"></svg><span class="text-normal">owner{i} /</span> repo{i}</a></h2>'
+        f'<p class="col-9 color-fg-muted my-1 pr-4">Repository {i} description with some details about the project.</p>'
+        f'<div class="f6 color-fg-muted mt-2"><span class="d-inline-block ml-0 mr-3">'
+        f'<span class="repo-language-color"></span><span itemprop="programmingLanguage">Python</span></span>'
+        f'<a href="/owner{i}/repo{i}/stargazers" class="Link">{1000 + i:,}</a>'
+        f'<a href="/owner{i}/repo{i}/forks" class="Link">{100 + i}</a>'
+        f'<span class="d-inline-block mr-3">Built by <img class="avatar mb-1" src="https://avatars.githubusercontent.com/u/{i}"></span>'
+        f'<span class="d-inline-block float-sm-right">{i} stars today</span></div></article>'
+        for i in range(n)
+    )
+    return wrap_page(f'<div class="Box"><div>{items}</div></div>', "GitHub Trending")
+
+
+def build_kuaishou(n: int) -> bytes:
+    state: Dict[str, Any] = {}
+    items = []
+    for i in range(n):
+        key = f"VisionHotRankItem:{i}"
+        items.append({"type": "id", "generated": False, "id": key, "typename": "VisionHotRankItem"})
+        state[key] = {
+            "rank": i,
+            "id": f"hot{i}",
+            "name": f"快手热榜 {i}",
+            "hotValue": f"{100 + i}.{i % 10}万",
+            "poster": quote(f"https://p1.a.yximgs.com/upic/{i}.jpg?tag=1-1", safe=""),
+            "photoIds": {"type": "json", "json": [f"3x{i:012d}"]},
+            "tagType": "",
+            "iconUrl": "",
+        }
+        # 真实页面里每个热榜条目旁还有大量视频 / 作者数据
+        for j in range(4):
+            state[f"VisionVideoDetailPhoto:{i}_{j}"] = {
+                "id": f"{i}_{j}",
+                "duration": 10000 + j,
+                "caption": f"视频描述 {i}-{j} " * 3,
+                "coverUrl": f"https://p2.a.yximgs.com/upic/{i}_{j}.jpg",
+                "manifest": {"adaptationSet": [{"representation": [{"url": f"https://v.kuaishou.com/{i}_{j}.mp4", "width": 720}]}]},
+            }
+    state['$ROOT_QUERY.visionHotRank({"page":"home"})'] = {"type": "id", "items": items}
+    apollo = json_utils.dumps({"defaultClient": state, "MODE": 2})
+    body = (
+        f"<script>window.__APOLLO_STATE__={apollo};(function(){{var s;(s=document.currentScript||"
+        f"document.scripts[document.scripts.length-1]).parentNode.removeChild(s);}}());</script>"
+    )
+    return wrap_page(body, "快手").encode("utf-8")
+
+
+def build_baidu(n: int) -> str:
+    content = [
+        {
+            "index": i,
+            "word": f"百度热搜 {i}",
+            "desc": f"热搜描述 {i}，相关新闻摘要内容。",
+            "img": f"https://fyb-2.cdn.bcebos.com/hotboard_image/{i}",
+            "show": [],
+            "hotScore": str(5000000 - i * 1000),
+            "query": f"百度热搜 {i}",
+            "rawUrl": f"https://www.baidu.com/s?wd=%E7%83%AD%E6%90%9C{i}",
+            "url": f"https://m.baidu.com/s?word=%E7%83%AD%E6%90%9C{i}",
+            "hotChange": "same",
+            "hotTag": "0",
+        }
+        for i in range(n)
+    ]
+    data = json_utils.dumps({"cards": [{"component": "hotList", "content": content, "more": 1}], "tabTextList": []})
+    body = f'<div id="sanRoot" class="wrapper"></div><!--s-data:{data}-->'
+    return wrap_page(body, "百度热搜")
+
+
+# 平台 -> (样本生成函数, 基础条数)
+SAMPLES: Dict[str, Tuple[Callable[[int], Any], int]] = {
+    "ithome": (build_ithome, 20),
+    "douban-movie": (build_douban_movie, 10),
+    "douban-group": (build_douban_group, 30),
+    "jianshu": (build_jianshu, 20),
+    "github": (build_github, 25),
+    "kuaishou": (build_kuaishou, 50),
+    "baidu": (build_baidu, 50),
+}
+
+
+class StubHTTPClient:
+    """直接返回样本的 HTTP 客户端，按 response_type 转换成与 HTTPClient 相同的类型"""
+    
+    def __init__(self, sample: Any):
+        self.sample = sample.encode("utf-8") if isinstance(sample, str) else sample
+    
+    async def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None, response_type: str = "json", **kwargs) -> Any:
+        if response_type == "raw":
+            return RawContent(self.sample, "utf-8")
+        if response_type == "bytes":
+            return self.sample
+        if response_type == "json":
+            return json_utils.loads(self.sample)
+        return self.sample.decode("utf-8")
+    
+    async def close(self):
+        pass
+
+
+async def time_parser(platform_name: str, sample: Any, min_time: float, min_repeats: int, max_repeats: int) -> Dict[str, Any]:
+    """重复运行平台的 fetch()，直到累计耗时超过 min_time 或达到 max_repeats 次"""
+    platform = PLATFORMS[platform_name]()
+    platform.http_client = StubHTTPClient(sample)
+    
+    times: List[float] = []
+    items: List[Dict[str, Any]] = []
+    while len(times) < max_repeats and (len(times) < min_repeats or sum(times) < min_time):
+        start = time.perf_counter()
+        items = await platform.fetch()
+        times.append(time.perf_counter() - start)
+    
+    stats = summarize(times)
+    return {
+        "items": len(items),
+        "bytes": len(sample.encode("utf-8") if isinstance(sample, str) else sample),
+        "repeats": len(times),
+        "median_s": stats["median"],
+        "min_s": stats["min"],
+        "us_per_item": round(stats["median"] / max(1, len(items)) * 1e6, 2),
+        "times": [round(t, 6) for t in times],
+    }
+
+
+async def run(platforms: List[str], scales: List[int], min_time: float, min_repeats: int, max_repeats: int) -> Dict[str, Dict[str, Any]]:
+    """测量所有平台在各个规模下的解析耗时"""
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in platforms:
+        build, base = SAMPLES[name]
+        results[name] = {}
+        for scale in scales:
+            sample = build(base * scale)
+            result = await time_parser(name, sample, min_time, min_repeats, max_repeats)
+            if result["items"] != base * scale:
+                result["warning"] = f"解析出 {result['items']} 条，预期 {base * scale} 条"
+            results[name][f"{scale}x"] = result
+            print(
+                f"  {name:<14} {scale:>4}x  {result['items']:>6} 条  {result['bytes'] / 1024:>9.1f} KB  "
+                f"{result['median_s'] * 1000:>10.3f} ms  {result['us_per_item']:>10.2f} us/条"
+                + (f"  ({result['warning']})" if "warning" in result else "")
+            )
+        
+        # 规模增长倍数对应的耗时增长倍数，接近 1 表示线性
+        smallest, largest = min(scales), max(scales)
+        if largest > smallest:
+            ratio = results[name][f"{largest}x"]["median_s"] / results[name][f"{smallest}x"]["median_s"]
+            growth = ratio / (largest / smallest)
+            results[name]["scaling"] = {
+                "from": f"{smallest}x",
+                "to": f"{largest}x",
+                "time_ratio": round(ratio, 2),
+                "per_item_growth": round(growth, 2),
+                "superlinear": growth > SUPERLINEAR_FACTOR,
+            }
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="平台解析器微基准测试（合成样本，按列表长度缩放）")
+    parser.add_argument("--platforms", default=",".join(SAMPLES), help="逗号分隔的平台列表")
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES), help="逗号分隔的规模倍数")
+    parser.add_argument("--min-time", type=float, default=0.5, help="每个用例的最少累计测量时间（秒）")
+    parser.add_argument("--min-repeats", type=int, default=3, help="每个用例的最少运行次数")
+    parser.add_argument("--max-repeats", type=int, default=200, help="每个用例的最多运行次数")
+    parser.add_argument("--output", help="结果文件路径，默认 benchmarks/results/parsers-<时间>.json")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线文件路径")
+    parser.add_argument("--save-baseline", action="store_true", help="把本次结果保存为基线")
+    parser.add_argument("--threshold", type=float, default=10.0, help="中位数变慢超过该百分比视为退化")
+    parser.add_argument("--fail-on-regression", action="store_true", help="出现退化时以非 0 状态码退出")
+    parser.add_argument("--dump-samples", metavar="DIR", help="把生成的样本保存到目录后退出")
+    args = parser.parse_args()
+    
+    platforms = [name.strip() for name in args.platforms.split(",") if name.strip()]
+    unknown = [name for name in platforms if name not in SAMPLES]
+    if unknown:
+        print(f"没有样本的平台: {', '.join(unknown)}（可选: {', '.join(SAMPLES)}）", file=sys.stderr)
+        return 2
+    scales = sorted(int(s) for s in args.scales.split(",") if s.strip())
+    
+    if args.dump_samples:
+        os.makedirs(args.dump_samples, exist_ok=True)
+        for name in platforms:
+            build, base = SAMPLES[name]
+            for scale in scales:
+                sample = build(base * scale)
+                path = os.path.join(args.dump_samples, f"{name}-{scale}x.html")
+                with open(path, "wb") as f:
+                    f.write(sample.encode("utf-8") if isinstance(sample, str) else sample)
+        print(f"样本已保存: {args.dump_samples}")
+        return 0
+    
+    print("解析耗时（中位数）:")
+    results = asyncio.run(run(platforms, scales, args.min_time, args.min_repeats, args.max_repeats))
+    
+    summary = {
+        f"{name}@{scale}": summarize(case["times"])
+        for name, cases in results.items()
+        for scale, case in cases.items()
+        if scale != "scaling"
+    }
+    result = {
+        "benchmark": "parsers",
+        "environment": environment(),
+        "settings": {
+            "scales": scales,
+            "min_time": args.min_time,
+            "min_repeats": args.min_repeats,
+            "max_repeats": args.max_repeats,
+        },
+        "summary": summary,
+        "results": results,
+        "comparison": None,
+    }
+    
+    print("")
+    print(f"规模增长时单条耗时的变化（> {SUPERLINEAR_FACTOR} 视为超线性）:")
+    for name, cases in results.items():
+        scaling = cases.get("scaling")
+        if scaling:
+            flag = "  <-- 超线性" if scaling["superlinear"] else ""
+            print(f"  {name:<14} {scaling['from']} -> {scaling['to']}: 单条耗时 x{scaling['per_item_growth']:.2f}{flag}")
+    
+    baseline = load_json(args.baseline)
+    if baseline and not args.save_baseline:
+        result["comparison"] = compare(summary, baseline.get("summary", {}), args.threshold)
+        print("")
+        print_comparison(result["comparison"])
+    
+    output = args.output or os.path.join(RESULTS_DIR, f"parsers-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    write_json(output, result)
+    print("")
+    print(f"结果已保存: {output}")
+    
+    if args.save_baseline:
+        write_json(args.baseline, result)
+        print(f"基线已保存: {args.baseline}")
+    
+    if args.fail_on_regression and result["comparison"] and regressions(result["comparison"]):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
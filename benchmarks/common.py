@@ -0,0 +1,120 @@
+"""基准测试公共工具 - 统计汇总、结果保存与基线对比"""
+
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# 基准测试目录与默认结果目录
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+
+def max_rss_mb() -> Optional[float]:
+    """进程峰值常驻内存（MB），平台不支持时返回 None"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为 KB，macOS 为字节
+    if sys.platform == "darwin":
+        rss /= 1024
+    return round(rss / 1024, 1)
+
+
+def summarize(values: Iterable[float]) -> Dict[str, float]:
+    """计算中位数、最小值、平均值、最大值"""
+    values = [v for v in values if v is not None]
+    if not values:
+        return {}
+    return {
+        "median": round(statistics.median(values), 6),
+        "min": round(min(values), 6),
+        "mean": round(statistics.fmean(values), 6),
+        "max": round(max(values), 6),
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """运行环境信息，写入结果便于对比时确认条件一致"""
+    from src.utils import json_utils
+    
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "json_backend": json_utils.BACKEND,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def load_json(path: str) -> Optional[Dict[str, Any]]:
+    """读取 JSON 文件，不存在或格式错误时返回 None"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: str, data: Dict[str, Any]):
+    """写入 JSON 文件"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def compare(current: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> Dict[str, Dict[str, Any]]:
+    """
+    按中位数对比当前结果与基线
+    
+    Args:
+        current: 当前结果的 summary（指标 -> summarize() 结果）
+        baseline: 基线的 summary
+        threshold: 变慢超过该百分比时视为退化
+    
+    Returns:
+        指标 -> {"baseline", "current", "change_pct", "regression"}
+    """
+    result = {}
+    for metric, stats in current.items():
+        base = baseline.get(metric, {}).get("median")
+        value = stats.get("median")
+        if base is None or value is None:
+            continue
+        change = (value - base) / base * 100 if base else 0.0
+        result[metric] = {
+            "baseline": base,
+            "current": value,
+            "change_pct": round(change, 2),
+            "regression": change > threshold,
+        }
+    return result
+
+
+def print_comparison(comparison: Dict[str, Dict[str, Any]], title: str = "与基线对比（中位数）"):
+    """输出对比表格"""
+    if not comparison:
+        return
+    print(title)
+    width = max(len(metric) for metric in comparison)
+    for metric, item in comparison.items():
+        flag = "  <-- 退化" if item["regression"] else ""
+        print(
+            f"  {metric:<{width}}  {item['baseline']:>12.4f} -> {item['current']:>12.4f}"
+            f"  ({item['change_pct']:+.1f}%){flag}"
+        )
+
+
+def regressions(comparison: Dict[str, Dict[str, Any]]) -> List[str]:
+    """退化的指标列表"""
+    return [metric for metric, item in comparison.items() if item["regression"]]
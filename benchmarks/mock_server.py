@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+本地模拟平台服务器
+
+配合 HTTP_URL_REWRITE 使用：采集器把所有请求改发到本服务器，原主机名放在路径第一段，
+例如 http://127.0.0.1:8900/weibo.com/ajax/side/hotSearch。
+
+响应来源（按顺序）：
+    1. --cassettes 指定的录制响应（HTTP_REPLAY_MODE=record 录制）
+    2. 内置的合成数据：微博热搜、B 站排行榜、HackerNews、TopHub 页面，
+       以及 bench_parsers 中的 HTML 页面（ithome、豆瓣、简书、GitHub、快手、百度）
+    3. 压测用的合成数据源 source-<n>.mock/list（见 stress.py）
+    都没有时返回 404。
+
+可配置延迟、错误率、429 比例、慢速分块返回和数据量，也可以通过 --host-config
+（JSON 文件，主机 -> 配置）为单个主机单独设置。
+
+用法：
+    python benchmarks/mock_server.py --port 8900 --latency 0.2 --error-rate 0.05
+    HTTP_URL_REWRITE=http://127.0.0.1:8900 python run.py
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Any, Dict, Optional, Tuple
+
+from aiohttp import web
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks import bench_parsers  # noqa: E402
+from src.utils import json_utils  # noqa: E402
+from src.utils.http_replay import Cassette  # noqa: E402
+
+
+@dataclass
+class MockConfig:
+    """模拟行为配置"""
+    # 平均延迟（秒）与抖动比例（延迟在 latency * (1 ± jitter) 之间均匀分布）
+    latency: float = 0.05
+    jitter: float = 0.5
+    # 返回 503 的比例
+    error_rate: float = 0.0
+    # 返回 429 的比例，以及 429 响应的 Retry-After（秒）
+    rate_429: float = 0.0
+    retry_after: float = 1.0
+    # 慢速返回：每块字节数（0 表示一次返回）与块间隔（秒）
+    drip_chunk: int = 0
+    drip_interval: float = 0.05
+    # 合成数据的列表长度倍数
+    payload_scale: int = 1
+
+
+class MockServer:
+    """模拟平台服务器"""
+    
+    def __init__(
+        self,
+        config: Optional[MockConfig] = None,
+        host_config: Optional[Dict[str, Dict[str, Any]]] = None,
+        cassette_dir: Optional[str] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        初始化服务器
+        
+        Args:
+            config: 默认配置
+            host_config: 主机 -> 覆盖的配置项（按域名后缀匹配）
+            cassette_dir: 录制响应的目录，优先于合成数据
+            seed: 随机种子，便于复现错误分布
+        """
+        self.config = config or MockConfig()
+        self.host_config = host_config or {}
+        self.cassette = Cassette(cassette_dir=cassette_dir, latency="0") if cassette_dir else None
+        self.random = random.Random(seed)
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self._payload_cache: Dict[Tuple[str, str, int], Tuple[str, bytes]] = {}
+        self._runner: Optional[web.AppRunner] = None
+    
+    def config_for(self, host: str) -> MockConfig:
+        """主机的生效配置"""
+        for suffix, overrides in self.host_config.items():
+            if host == suffix or host.endswith("." + suffix):
+                known = {f.name for f in fields(MockConfig)}
+                return replace(self.config, **{k: v for k, v in overrides.items() if k in known})
+        return self.config
+    
+    def _count(self, host: str, key: str):
+        host_stats = self.stats.setdefault(host, {})
+        host_stats[key] = host_stats.get(key, 0) + 1
+    
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        """处理请求：路径第一段为原主机名"""
+        host, _, path = request.match_info["tail"].partition("/")
+        path = "/" + path
+        config = self.config_for(host)
+        self._count(host, "requests")
+        
+        delay = config.latency * (1 + self.random.uniform(-config.jitter, config.jitter))
+        if delay > 0:
+            await asyncio.sleep(delay)
+        
+        roll = self.random.random()
+        if roll < config.rate_429:
+            self._count(host, "429")
+            return web.Response(status=429, headers={"Retry-After": f"{config.retry_after:g}"})
+        if roll < config.rate_429 + config.error_rate:
+            self._count(host, "503")
+            return web.Response(status=503)
+        
+        body = await request.read()
+        found = self.payload(request.method, host, path, request.query_string, body, config.payload_scale)
+        if found is None:
+            self._count(host, "404")
+            return web.Response(status=404)
+        status, headers, content = found
+        self._count(host, str(status))
+        
+        if config.drip_chunk <= 0:
+            return web.Response(status=status, headers=headers, body=content)
+        
+        response = web.StreamResponse(status=status, headers=headers)
+        response.content_length = len(content)
+        await response.prepare(request)
+        for offset in range(0, len(content), config.drip_chunk):
+            await response.write(content[offset:offset + config.drip_chunk])
+            await asyncio.sleep(config.drip_interval)
+        await response.write_eof()
+        return response
+    
+    def payload(self, method: str, host: str, path: str, query: str, body: bytes, scale: int) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """查找响应：录制的响应优先，其次是合成数据"""
+        if self.cassette is not None:
+            url = f"https://{host}{path}" + (f"?{query}" if query else "")
+            json_data = None
+            if body:
+                try:
+                    json_data = json_utils.loads(body)
+                except json_utils.JSONDecodeError:
+                    json_data = None
+            entry = self.cassette.load(method, url, data=None if json_data is not None else (body or None), json_data=json_data)
+            if entry is not None:
+                headers = {
+                    k: v for k, v in entry.get("headers", [])
+                    if k.lower() not in ["content-length", "content-encoding", "transfer-encoding", "connection"]
+                }
+                return entry["status"], headers, base64.b64decode(entry.get("body", ""))
+        
+        key = (host, path, scale)
+        cached = self._payload_cache.get(key)
+        if cached is None:
+            cached = synthetic_payload(host, path, scale)
+            if cached is None:
+                return None
+            self._payload_cache[key] = cached
+        content_type, content = cached
+        return 200, {"Content-Type": content_type}, content
+    
+    async def start(self, host: str = "127.0.0.1", port: int = 8900) -> str:
+        """启动服务器，返回供 HTTP_URL_REWRITE 使用的地址（port=0 时自动分配端口）"""
+        app = web.Application(client_max_size=16 * 1024 * 1024)
+        app.router.add_route("*", "/{tail:.*}", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        actual_port = self._runner.addresses[0][1]
+        return f"http://{host}:{actual_port}"
+    
+    async def stop(self):
+        """停止服务器"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def _json(data: Any) -> Tuple[str, bytes]:
+    return "application/json; charset=utf-8", json_utils.dumps_bytes(data)
+
+
+def _html(html: Any) -> Tuple[str, bytes]:
+    return "text/html; charset=utf-8", html if isinstance(html, bytes) else html.encode("utf-8")
+
+
+def _tophub_page(n: int) -> str:
+    rows = "".join(
+        f'<tr><td class="al"><a href="/l?e={i}" target="_blank">TopHub 榜单条目 {i}</a></td>'
+        f'<td>{1000 - i}万</td></tr>'
+        for i in range(n)
+    )
+    return bench_parsers.wrap_page(f'<div class="Zd-p-Sc"><table class="table"><tbody>{rows}</tbody></table></div>', "今日热榜")
+
+
+# bench_parsers 中的页面样本：主机 -> 平台名
+_PARSER_SAMPLE_HOSTS = {
+    "m.ithome.com": "ithome",
+    "movie.douban.com": "douban-movie",
+    "www.douban.com": "douban-group",
+    "www.jianshu.com": "jianshu",
+    "github.com": "github",
+    "www.kuaishou.com": "kuaishou",
+    "top.baidu.com": "baidu",
+}
+
+
+def synthetic_payload(host: str, path: str, scale: int) -> Optional[Tuple[str, bytes]]:
+    """生成合成响应，返回 (Content-Type, 响应体)；没有对应数据时返回 None"""
+    now = int(time.time())
+    
+    if host in _PARSER_SAMPLE_HOSTS:
+        build, base = bench_parsers.SAMPLES[_PARSER_SAMPLE_HOSTS[host]]
+        return _html(build(base * scale))
+    
+    if host == "weibo.com" and path.startswith("/ajax/side/hotSearch"):
+        return _json({"ok": 1, "data": {"realtime": [
+            {"mid": str(4900000000 + i), "word": f"微博热搜 {i}", "word_scheme": f"#微博热搜 {i}#", "onboard_time": now - i * 60, "num": 1000000 - i}
+            for i in range(50 * scale)
+        ]}})
+    
+    if host == "api.bilibili.com":
+        if path.startswith("/x/web-interface/nav"):
+            return _json({"code": -101, "data": {"wbi_img": {
+                "img_url": "https://i0.hdslb.com/bfs/wbi/7cd084941338484aae1ad9425b84077c.png",
+                "sub_url": "https://i0.hdslb.com/bfs/wbi/4932caff0ff746eab6f01bf08b70ac45.png",
+            }}})
+        if path.startswith("/x/web-interface/ranking"):
+            return _json({"code": 0, "data": {"list": [
+                {"bvid": f"BV1mock{i:05d}", "title": f"B站视频 {i}", "desc": "简介", "pic": f"http://i0.hdslb.com/{i}.jpg",
+                 "owner": {"name": f"UP主{i}"}, "pubdate": now - i * 3600, "stat": {"view": 100000 - i}}
+                for i in range(100 * scale)
+            ]}})
+    
+    if host == "hacker-news.firebaseio.com":
+        if path == "/v0/topstories.json":
+            return _json(list(range(40000000, 40000000 + 500)))
+        if path.startswith("/v0/item/"):
+            item_id = int(path.rsplit("/", 1)[-1].split(".")[0] or 0)
+            return _json({"id": item_id, "type": "story", "title": f"HN story {item_id}", "by": "mock",
+                          "score": item_id % 1000, "time": now, "url": f"https://example.com/{item_id}"})
+    
+    if host == "tophub.today":
+        return _html(_tophub_page(50 * scale))
+    
+    if host.startswith("source-") and host.endswith(".mock"):
+        return _json({"data": [
+            {"id": f"{host}-{i}", "title": f"{host} 条目 {i}", "hot": 1000 - i, "url": f"https://{host}/item/{i}"}
+            for i in range(20 * scale)
+        ]})
+    
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地模拟平台服务器（配合 HTTP_URL_REWRITE 使用）")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--cassettes", help="录制响应的目录，优先于合成数据")
+    parser.add_argument("--host-config", help="按主机覆盖配置的 JSON 文件，如 {\"tophub.today\": {\"rate_429\": 0.2}}")
+    parser.add_argument("--seed", type=int)
+    defaults = MockConfig()
+    for field in fields(MockConfig):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=type(getattr(defaults, field.name)), default=getattr(defaults, field.name))
+    args = parser.parse_args()
+    
+    config = MockConfig(**{field.name: getattr(args, field.name) for field in fields(MockConfig)})
+    host_config = {}
+    if args.host_config:
+        with open(args.host_config, "r", encoding="utf-8") as f:
+            host_config = json.load(f)
+    
+    async def serve():
+        server = MockServer(config, host_config, args.cassettes, args.seed)
+        base = await server.start(args.host, args.port)
+        print(f"模拟服务器已启动: {base}")
+        print(f"配置: {json.dumps(asdict(config), ensure_ascii=False)}")
+        print(f"使用方式: HTTP_URL_REWRITE={base} python run.py")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+            print(json.dumps(server.stats, ensure_ascii=False, indent=2))
+    
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
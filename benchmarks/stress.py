@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+并发压测
+
+启动本地模拟服务器（或连接 --server 指定的服务器），生成 N 个合成数据源（每个数据源一个独立主机
+source-<n>.mock），通过 collect_all_platforms 采集，统计耗时、成功率、请求数、重试、429 / 503
+以及熔断器状态。用于在单机上验证并发上限、主机限流、重试和熔断在大量数据源下的表现。
+
+用法：
+    python benchmarks/stress.py --sources 300 --concurrency 20 --latency 0.2 --error-rate 0.05
+    python benchmarks/stress.py --sources 100 --with-registry    # 同时采集注册表中的全部平台
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import fields
+from typing import Any, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+# 独立的缓存目录（平台缓存、熔断器状态），不影响正常运行的数据
+os.environ["CACHE_DIR"] = tempfile.mkdtemp(prefix="stress_cache_")
+
+from loguru import logger  # noqa: E402
+
+from benchmarks.common import RESULTS_DIR, environment, write_json  # noqa: E402
+from benchmarks.mock_server import MockConfig, MockServer  # noqa: E402
+from src.data_collector import collect_all_platforms  # noqa: E402
+from src.platforms.base_platform import BasePlatform  # noqa: E402
+from src.platforms.registry import get_all_platforms  # noqa: E402
+from src.utils.adaptive_limiter import format_trajectory  # noqa: E402
+from src.utils.http_client import close_shared_session  # noqa: E402
+from src.utils.http_metrics import get_network_metrics  # noqa: E402
+from src.utils.http_replay import set_url_rewrite  # noqa: E402
+
+
+class SyntheticSource(BasePlatform):
+    """合成数据源：从 https://source-<n>.mock/list 获取 JSON 列表"""
+    
+    def __init__(self, index: int):
+        super().__init__()
+        self.name = f"source-{index}"
+        self.title = f"合成数据源 {index}"
+        self.type = "压测"
+        self.description = "stress.py 生成的合成数据源"
+        self.link = f"https://source-{index}.mock/list"
+        self.category = "压测"
+    
+    async def fetch(self, **kwargs) -> List[Dict[str, Any]]:
+        """获取数据"""
+        result = await self.http_client.get(url=self.link)
+        return result.get("data", [])
+
+
+def _percentile(values: List[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def network_totals() -> Dict[str, Any]:
+    """汇总所有请求的耗时分布与状态码"""
+    records = list(get_network_metrics().records)
+    totals = [r["total"] for r in records]
+    statuses: Dict[str, int] = {}
+    for record in records:
+        key = str(record["status"] or record["error"] or "unknown")
+        statuses[key] = statuses.get(key, 0) + 1
+    return {
+        "requests": len(records),
+        "retries": sum(1 for r in records if r["attempt"] > 0),
+        "errors": sum(1 for r in records if r["error"]),
+        "statuses": dict(sorted(statuses.items())),
+        "p50_ms": round(_percentile(totals, 50) * 1000, 1) if totals else None,
+        "p95_ms": round(_percentile(totals, 95) * 1000, 1) if totals else None,
+        "p99_ms": round(_percentile(totals, 99) * 1000, 1) if totals else None,
+    }
+
+
+async def run(args: argparse.Namespace, config: MockConfig) -> Dict[str, Any]:
+    """启动服务器并执行一次压测"""
+    server = None
+    base = args.server
+    if not base:
+        server = MockServer(config, seed=args.seed)
+        base = await server.start(port=0)
+    set_url_rewrite(base)
+    
+    platforms: Dict[str, Any] = {f"source-{i}": SyntheticSource(i) for i in range(args.sources)}
+    if args.with_registry:
+        platforms.update(get_all_platforms())
+    
+    start = time.perf_counter()
+    try:
+        data = await collect_all_platforms(concurrent_limit=args.concurrency, platforms=platforms, workers=1)
+    finally:
+        await close_shared_session()
+        if server is not None:
+            await server.stop()
+    wall = time.perf_counter() - start
+    
+    open_breakers = {k: v for k, v in data["circuit_breakers"].items() if v["state"] != "closed"}
+    return {
+        "wall_s": round(wall, 3),
+        "sources": len(platforms),
+        "successful": len(data["results"]),
+        "failed": len(data["errors"]),
+        "throughput_per_s": round(len(platforms) / wall, 2) if wall else None,
+        "network": network_totals(),
+        "server": server.stats if server is not None else None,
+        "open_breakers": len(open_breakers),
+        "concurrency": data["concurrency"],
+        "errors": data["errors"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="并发压测（本地模拟服务器 + 合成数据源）")
+    parser.add_argument("--sources", type=int, default=200, help="合成数据源数量")
+    parser.add_argument("--concurrency", type=int, default=10, help="同时采集的数据源数")
+    parser.add_argument("--with-registry", action="store_true", help="同时采集注册表中的全部平台")
+    parser.add_argument("--server", help="使用已启动的模拟服务器（如 http://127.0.0.1:8900），不在进程内启动")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--output", help="结果文件路径，默认 benchmarks/results/stress-<时间>.json")
+    defaults = MockConfig()
+    for field in fields(MockConfig):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=type(getattr(defaults, field.name)), default=getattr(defaults, field.name))
+    args = parser.parse_args()
+    
+    config = MockConfig(**{field.name: getattr(args, field.name) for field in fields(MockConfig)})
+    
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR", format="{level: <8} | {message}")
+    
+    result = asyncio.run(run(args, config))
+    result = {
+        "benchmark": "stress",
+        "environment": environment(),
+        "settings": {
+            "sources": args.sources,
+            "concurrency": args.concurrency,
+            "with_registry": args.with_registry,
+            "mock": vars(config),
+        },
+        **result,
+    }
+    
+    network = result["network"]
+    print(f"数据源: {result['sources']}，成功 {result['successful']}，失败 {result['failed']}")
+    print(f"耗时: {result['wall_s']:.2f}s，吞吐: {result['throughput_per_s']} 个/秒")
+    print(
+        f"请求: {network['requests']} 次，重试 {network['retries']} 次，失败 {network['errors']} 次，"
+        f"p50 {network['p50_ms']} ms / p95 {network['p95_ms']} ms / p99 {network['p99_ms']} ms"
+    )
+    print(f"状态码: {network['statuses']}")
+    print(f"打开的熔断器: {result['open_breakers']}")
+    concurrency = result["concurrency"]
+    print(f"并发数: {format_trajectory(concurrency['trajectory'], concurrency['initial'])}")
+    
+    output = args.output or os.path.join(RESULTS_DIR, f"stress-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    write_json(output, result)
+    print(f"结果已保存: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,28 +4,47 @@
 import sys
 import os
 import asyncio
+
+from dotenv import load_dotenv
+
 from src.data_collector import collect_data
-from src.get_ai_summary import doubao_chat_example  # 已注释，暂不使用
+from src.utils.http_client import close_shared_session
+from src.utils.parse_executor import shutdown_parse_executor
 
 # 添加项目根目录到路径
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
+load_dotenv()
+
+# 采集完成后是否运行 AI 总结（需要 Chrome、selenium 和 undetected-chromedriver），默认不运行
+AI_SUMMARY = os.getenv("AI_SUMMARY", "0") not in ["0", "false", "False"]
+
+
+def run_summary():
+    """运行 AI 总结（也可单独运行：python -m src.get_ai_summary）"""
+    # AI 总结依赖 selenium / undetected-chromedriver，只在需要时导入，纯采集运行不加载
+    from src.get_ai_summary import doubao_chat_example
+    
+    doubao_chat_example()
+
+
 async def run_all():
-    """运行所有任务：数据采集 + AI总结"""
+    """运行所有任务：数据采集 + AI总结（AI_SUMMARY=1 时）"""
     
-    # 1. 先运行数据采集
-    await collect_data()
+    # 1. 先运行数据采集（结束后关闭共享连接池和解析执行器）
+    try:
+        await collect_data()
+    finally:
+        await close_shared_session()
+        shutdown_parse_executor()
     
     # 2. 然后运行AI总结
-    # print("\n" + "=" * 80)
-    # print("开始运行AI总结...")
-    # print("=" * 80)
-    
-    # try:
-    #     doubao_chat_example()
-    # except Exception as e:
-    #     raise
+    if AI_SUMMARY:
+        print("\n" + "=" * 80)
+        print("开始运行AI总结...")
+        print("=" * 80)
+        run_summary()
 
 if __name__ == "__main__":
-    asyncio.run(run_all())
\ No newline at end of file
+    asyncio.run(run_all())
@@ -0,0 +1,5 @@
+"""缓存模块"""
+
+from .cache_manager import CacheManager, get_cache_manager
+
+__all__ = ["CacheManager", "get_cache_manager"]
@@ -0,0 +1,163 @@
+"""缓存管理器 - 内存 LRU + 磁盘两级缓存"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import diskcache
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 项目根目录（src 的上一级）
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CACHE_TTL = int(os.getenv("CACHE_TTL", "3600"))
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(_PROJECT_ROOT, "cache"))
+CACHE_MEMORY_SIZE = int(os.getenv("CACHE_MEMORY_SIZE", "512"))
+
+_MISSING = object()
+
+
+class CacheManager:
+    """
+    两级缓存管理器
+    
+    前端是进程内 LRU（条目数有上限），命中时直接返回对象本身，无需反序列化；
+    后端是 diskcache 磁盘缓存，跨进程、跨运行持久化。两级共用同一个过期时间。
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        default_ttl: Optional[int] = None,
+        memory_size: Optional[int] = None,
+    ):
+        """
+        初始化缓存管理器
+        
+        Args:
+            cache_dir: 磁盘缓存目录，默认 CACHE_DIR
+            default_ttl: 默认过期时间（秒），默认 CACHE_TTL
+            memory_size: 内存缓存最大条目数，默认 CACHE_MEMORY_SIZE
+        """
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.default_ttl = CACHE_TTL if default_ttl is None else default_ttl
+        self.memory_size = CACHE_MEMORY_SIZE if memory_size is None else memory_size
+        
+        # key -> (过期时间戳或 None, 值)
+        self._memory: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: Optional[diskcache.Cache] = None
+        self._disk_failed = False
+    
+    def _get_disk(self) -> Optional[diskcache.Cache]:
+        """按需打开磁盘缓存，打开失败时退化为纯内存缓存"""
+        if self._disk is None and not self._disk_failed:
+            try:
+                self._disk = diskcache.Cache(self.cache_dir)
+            except Exception:
+                self._disk_failed = True
+        return self._disk
+    
+    def _remember(self, key: str, value: Any, expire_at: Optional[float]):
+        """写入内存 LRU，超出容量时淘汰最久未使用的条目"""
+        if self.memory_size <= 0:
+            return
+        with self._lock:
+            self._memory[key] = (expire_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """读取缓存，先查内存再查磁盘"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expire_at, value = entry
+                if expire_at is None or expire_at > now:
+                    self._memory.move_to_end(key)
+                    return value
+                del self._memory[key]
+        
+        disk = self._get_disk()
+        if disk is None:
+            return default
+        
+        try:
+            value, expire_at = disk.get(key, default=_MISSING, expire_time=True)
+        except Exception:
+            return default
+        if value is _MISSING:
+            return default
+        
+        # 回填内存，下次命中无需再反序列化
+        self._remember(key, value, expire_at)
+        return value
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        """
+        写入缓存
+        
+        Args:
+            key: 缓存键
+            value: 缓存值（需可 pickle）
+            ttl: 过期时间（秒），None 使用 default_ttl，<= 0 表示永不过期
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        expire = ttl if ttl and ttl > 0 else None
+        expire_at = time.time() + expire if expire else None
+        
+        self._remember(key, value, expire_at)
+        
+        disk = self._get_disk()
+        if disk is not None:
+            try:
+                disk.set(key, value, expire=expire)
+            except Exception:
+                pass
+    
+    def delete(self, key: str):
+        """删除缓存"""
+        with self._lock:
+            self._memory.pop(key, None)
+        disk = self._get_disk()
+        if disk is not None:
+            try:
+                disk.delete(key)
+            except Exception:
+                pass
+    
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._memory.clear()
+        disk = self._get_disk()
+        if disk is not None:
+            try:
+                disk.clear()
+            except Exception:
+                pass
+    
+    def close(self):
+        """关闭磁盘缓存"""
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+
+# 进程级共享缓存实例
+_shared_cache_manager: Optional[CacheManager] = None
+
+
+def get_cache_manager() -> CacheManager:
+    """获取所有平台共享的缓存管理器"""
+    global _shared_cache_manager
+    
+    if _shared_cache_manager is None:
+        _shared_cache_manager = CacheManager()
+    return _shared_cache_manager
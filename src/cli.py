@@ -0,0 +1,183 @@
+"""
+命令行入口 - 按平台 / 类别采集、常驻调度和 AI 总结
+
+用法：
+    python -m src.cli                                    # 采集全部平台（同 run.py）
+    python -m src.cli --platforms weibo,douyin,baidu     # 只采集指定平台，结果合并到当天的分类文件
+    python -m src.cli --category 技术社区 --no-cache      # 按类别采集，跳过缓存
+    python -m src.cli --concurrency 20 --deadline 300 --output-format json
+    python -m src.cli list                               # 列出所有类别和平台
+    python -m src.cli daemon --category 社交媒体          # 常驻调度（可只调度部分平台）
+    python -m src.cli summary                            # 基于当天的标题 CSV 运行 AI 总结
+"""
+
+import argparse
+import asyncio
+import math
+import sys
+from typing import List, Optional
+
+from .output_formats import OUTPUT_ALL, OUTPUT_FORMATS
+from .platforms.manifest import CATEGORIES, MANIFEST
+
+COMMANDS = ["collect", "list", "daemon", "summary"]
+
+
+def _positive_int(value: str) -> int:
+    """大于等于 1 的整数参数"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"应为整数: {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"应不小于 1: {value}")
+    return number
+
+
+def _non_negative_float(value: str) -> float:
+    """大于等于 0 的数值参数"""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"应为数值: {value}")
+    if not math.isfinite(number) or number < 0:
+        raise argparse.ArgumentTypeError(f"应为不小于 0 的有限数值: {value}")
+    return number
+
+
+def _split(values: Optional[List[str]]) -> List[str]:
+    """展开可重复、逗号分隔的参数值"""
+    return [item.strip() for value in values or [] for item in value.split(",") if item.strip()]
+
+
+def select_platforms(parser: argparse.ArgumentParser, args: argparse.Namespace) -> Optional[List[str]]:
+    """
+    根据 --platforms / --category 选出平台名称（按清单顺序，去重）
+    
+    Returns:
+        平台名称列表；两个参数都未指定时返回 None，表示全部平台
+    """
+    names = _split(args.platforms)
+    categories = _split(args.category)
+    if not names and not categories:
+        return None
+    
+    unknown = [name for name in names if name not in MANIFEST]
+    if unknown:
+        parser.error(f"未知的平台: {', '.join(unknown)}（可用平台见 python -m src.cli list）")
+    unknown = [category for category in categories if category not in CATEGORIES]
+    if unknown:
+        parser.error(f"未知的类别: {', '.join(unknown)}（可用类别: {', '.join(CATEGORIES)}）")
+    
+    selected = set(names)
+    for category in categories:
+        selected.update(CATEGORIES[category])
+    return [name for name in MANIFEST if name in selected]
+
+
+def _add_selection_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--platforms", "-p", action="append", metavar="NAMES",
+        help="要采集的平台，逗号分隔或多次指定，如 weibo,douyin,baidu",
+    )
+    parser.add_argument(
+        "--category", "-c", action="append", metavar="CATEGORY",
+        help=f"要采集的类别（可多次指定）: {', '.join(CATEGORIES)}",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """构建命令行参数解析器"""
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Daily Hot Collector - 热榜数据采集工具")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    collect = subparsers.add_parser("collect", help="采集一次（默认命令）")
+    _add_selection_arguments(collect)
+    collect.add_argument("--no-cache", action="store_true", help="跳过缓存，直接请求各平台")
+    collect.add_argument("--concurrency", type=_positive_int, metavar="N", help="同时采集的平台数（自适应并发的初始值），默认 CONCURRENT_LIMIT")
+    collect.add_argument("--deadline", type=_non_negative_float, metavar="SECONDS", help="采集截止时间（秒），0 表示不限制，默认 RUN_DEADLINE")
+    collect.add_argument("--workers", type=_positive_int, metavar="N", help="采集进程数，默认 COLLECT_WORKERS")
+    collect.add_argument(
+        "--output-format", choices=OUTPUT_FORMATS, default=OUTPUT_ALL,
+        help="all：分类 JSON 和标题 CSV；json：只保存分类 JSON；csv：只生成标题 CSV（运行报告总会保存）",
+    )
+    collect.add_argument("--output-dir", metavar="DIR", help="数据输出目录，默认为项目根目录下的 data")
+    
+    subparsers.add_parser("list", help="列出所有类别和平台")
+    
+    daemon = subparsers.add_parser("daemon", help="常驻调度，按各平台的间隔轮询，直到收到 SIGINT / SIGTERM")
+    _add_selection_arguments(daemon)
+    daemon.add_argument("--output-dir", metavar="DIR", help="数据输出目录，默认为项目根目录下的 data")
+    
+    subparsers.add_parser("summary", help="基于当天的标题 CSV 运行 AI 总结（需要 Chrome、selenium 和 undetected-chromedriver）")
+    return parser
+
+
+def list_platforms():
+    """输出所有类别和平台（只读取清单，不导入平台代码）"""
+    for category, names in CATEGORIES.items():
+        print(f"{category}（{len(names)}）: {', '.join(names)}")
+
+
+async def run_collect(args: argparse.Namespace, platforms: Optional[List[str]]):
+    """采集一次，结束后关闭共享连接池和解析执行器"""
+    from .data_collector import RUN_DEADLINE, collect_data
+    from .sharded_collector import COLLECT_WORKERS
+    from .utils.adaptive_limiter import CONCURRENT_LIMIT
+    from .utils.http_client import close_shared_session
+    from .utils.parse_executor import shutdown_parse_executor
+    
+    try:
+        await collect_data(
+            data_dir=args.output_dir,
+            deadline=RUN_DEADLINE if args.deadline is None else args.deadline,
+            platforms=platforms,
+            no_cache=args.no_cache,
+            concurrent_limit=CONCURRENT_LIMIT if args.concurrency is None else args.concurrency,
+            output_format=args.output_format,
+            workers=COLLECT_WORKERS if args.workers is None else args.workers,
+        )
+    finally:
+        await close_shared_session()
+        shutdown_parse_executor()
+
+
+def run_summary():
+    """运行 AI 总结（依赖 selenium / undetected-chromedriver，只在这里导入）"""
+    from .get_ai_summary import doubao_chat_example
+    
+    doubao_chat_example()
+
+
+def main(argv: Optional[List[str]] = None):
+    """命令行入口：python -m src.cli"""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # 未指定子命令时默认为 collect，如 python -m src.cli --platforms weibo
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ["-h", "--help"]):
+        argv.insert(0, "collect")
+    
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    if args.command == "list":
+        list_platforms()
+    elif args.command == "summary":
+        run_summary()
+    elif args.command == "daemon":
+        from .platforms.registry import get_all_platforms
+        from .scheduler import run_daemon
+        
+        platforms = select_platforms(parser, args)
+        try:
+            asyncio.run(run_daemon(
+                platforms=get_all_platforms(platforms) if platforms is not None else None,
+                data_dir=args.output_dir,
+            ))
+        except KeyboardInterrupt:
+            pass
+    else:
+        asyncio.run(run_collect(args, select_platforms(parser, args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,21 @@
 """数据采集器模块"""
 
+import importlib
+
 from .base import BaseCollector
-from .api_collector import APICollector
-from .html_collector import HTMLCollector
-from .rss_collector import RSSCollector
+
+# 依赖 bs4 / parsel / feedparser 等较重第三方库的采集器在首次访问时才导入
+_LAZY_COLLECTORS = {
+    "APICollector": ".api_collector",
+    "HTMLCollector": ".html_collector",
+    "RSSCollector": ".rss_collector",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_COLLECTORS:
+        return getattr(importlib.import_module(_LAZY_COLLECTORS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["BaseCollector", "APICollector", "HTMLCollector", "RSSCollector"]
@@ -2,11 +2,14 @@
 
 import json
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from functools import partial
+from typing import Callable, Dict, List, Optional, Any
 from datetime import datetime
 
-from ..cache.cache_manager import CacheManager
-from ..utils.http_client import HTTPClient
+from ..cache.cache_manager import CacheManager, get_cache_manager
+from ..utils.hedging import PRIMARY, Source, first_valid
+from ..utils.http_client import HTTPClient, get_http_client
+from ..utils.parse_executor import run_parser
 from ..utils.time_utils import format_time
 
 
@@ -15,8 +18,8 @@ class BaseCollector(ABC):
     
     def __init__(self, cache_manager: Optional[CacheManager] = None, http_client: Optional[HTTPClient] = None):
         """初始化采集器"""
-        self.cache_manager = cache_manager or CacheManager()
-        self.http_client = http_client or HTTPClient()
+        self.cache_manager = cache_manager or get_cache_manager()
+        self.http_client = http_client or get_http_client()
         self.name = ""
         self.title = ""
         self.type = ""
@@ -37,6 +40,14 @@ class BaseCollector(ABC):
             "mobileUrl": item.get("mobileUrl", item.get("url", "")),
         }
     
+    async def run_parser(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        在解析执行器中运行 CPU 密集的解析（PARSE_EXECUTOR：inline / thread / process），避免阻塞事件循环
+        
+        func 应为模块级纯函数，接收 str / bytes，返回由 dict / list 组成的普通数据。
+        """
+        return await run_parser(func, *args)
+    
     def normalize_data(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """标准化数据列表"""
         return [self.normalize_item(item) for item in data]
@@ -46,6 +57,15 @@ class BaseCollector(ABC):
         """获取数据（子类必须实现）"""
         pass
     
+    def sources(self, **kwargs) -> List[Source]:
+        """
+        数据源列表（按优先级排列），默认只有 fetch
+        
+        子类可以追加备用数据源（如 TopHub 页面、RSS）。采集时主数据源失败或超过 HEDGE_DELAY 秒未返回
+        就启动下一个，取第一个返回有效数据的结果，见 utils.hedging.first_valid。
+        """
+        return [Source(PRIMARY, partial(self.fetch, **kwargs))]
+    
     async def collect(self, no_cache: bool = False, **kwargs) -> Dict[str, Any]:
         """采集数据"""
         cache_key = f"{self.name}:{json.dumps(kwargs, sort_keys=True)}"
@@ -57,22 +77,28 @@ class BaseCollector(ABC):
                 return {
                     "fromCache": True,
                     "updateTime": cached_data.get("updateTime"),
+                    "source": cached_data.get("source", PRIMARY),
                     "data": cached_data.get("data", []),
                 }
         
         # 获取新数据
         try:
-            data = await self.fetch(**kwargs)
+            source, data = await first_valid(self.sources(**kwargs))
             normalized_data = self.normalize_data(data)
             update_time = format_time()
             
             # 保存到缓存
             if not no_cache:
-                self.cache_manager.set(cache_key, {"data": normalized_data}, ttl=self.cache_manager.default_ttl)
+                self.cache_manager.set(
+                    cache_key,
+                    {"data": normalized_data, "updateTime": update_time, "source": source},
+                    ttl=self.cache_manager.default_ttl,
+                )
             
             return {
                 "fromCache": False,
                 "updateTime": update_time,
+                "source": source,
                 "data": normalized_data,
             }
         except Exception as e:
@@ -7,6 +7,7 @@ from bs4 import BeautifulSoup
 from parsel import Selector
 
 from .base import BaseCollector
+from ..utils import json_utils
 from ..utils.http_client import HTTPClient
 from ..cache.cache_manager import CacheManager
 
@@ -50,8 +51,7 @@ class HTMLCollector(BaseCollector):
         match = re.search(pattern, html, re.DOTALL)
         if match:
             try:
-                import json
-                return json.loads(match.group(1))
+                return json_utils.loads(match.group(1))
             except Exception:
                 pass
         return None
@@ -2,17 +2,50 @@
 
 import asyncio
 import csv
-import json
 import os
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Optional, Any, Union
 
+from dotenv import load_dotenv
 from loguru import logger
 
-from .platforms.registry import get_all_platforms, get_platforms_by_category, CATEGORIES
-from .utils.tophub_fallback import fetch_douyin_from_tophub, fetch_tieba_from_tophub
-from .utils.http_client import HTTPClient
-from .utils.time_utils import format_time
+from .output_formats import OUTPUT_ALL, OUTPUT_CSV, OUTPUT_JSON, OUTPUT_FORMATS  # noqa: F401
+from .platforms.registry import PLATFORMS, get_all_platforms, get_platforms_by_category, CATEGORIES
+from .sharded_collector import COLLECT_WORKERS, collect_sharded
+from .utils import json_utils
+from .utils.adaptive_limiter import CONCURRENCY_ADAPTIVE, CONCURRENT_LIMIT, AdaptiveLimiter, format_trajectory
+from .utils.circuit_breaker import get_circuit_breakers
+from .utils.hedging import PRIMARY
+from .utils.http_client import close_shared_session
+from .utils.http_metrics import get_network_metrics
+from .utils.loop_monitor import LOOP_MONITOR, LoopMonitor
+from .utils.parse_executor import shutdown_parse_executor
+from .utils.run_context import current_platform
+
+load_dotenv()
+
+# 单个平台的采集时间上限（秒，从拿到并发名额开始计算，包含备用方案），0 表示不限制
+PLATFORM_TIMEOUT = float(os.getenv("PLATFORM_TIMEOUT", "120"))
+# 按平台覆盖采集时间上限（JSON），如 {"tieba": 60}
+PLATFORM_TIMEOUTS = os.getenv("PLATFORM_TIMEOUTS", "")
+# 整次运行的采集截止时间（秒），到时未完成的平台被取消并记为超时，0 表示不限制
+RUN_DEADLINE = float(os.getenv("RUN_DEADLINE", "0"))
+
+_platform_timeouts: Optional[Dict[str, float]] = None
+
+
+def platform_timeout(platform_name: str) -> float:
+    """平台的采集时间上限（秒），0 表示不限制"""
+    global _platform_timeouts
+    
+    if _platform_timeouts is None:
+        _platform_timeouts = {}
+        if PLATFORM_TIMEOUTS:
+            try:
+                _platform_timeouts = {name: float(value) for name, value in json_utils.loads(PLATFORM_TIMEOUTS).items()}
+            except (json_utils.JSONDecodeError, AttributeError, TypeError, ValueError) as e:
+                logger.warning(f"PLATFORM_TIMEOUTS 配置无效，已忽略: {e}")
+    return _platform_timeouts.get(platform_name, PLATFORM_TIMEOUT)
 
 
 def truncate_log_file_half(file_path: str, max_size: int = 5 * 1024 * 1024):
@@ -129,172 +162,236 @@ def setup_logger():
     return logger
 
 
-async def collect_platform(platform_name: str, platform_instance, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
-    """采集单个平台数据"""
+async def collect_platform(
+    platform_name: str,
+    platform_instance,
+    semaphore: Union[asyncio.Semaphore, AdaptiveLimiter],
+    no_cache: bool = False,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    采集单个平台数据
+    
+    Args:
+        platform_name: 平台名称
+        platform_instance: 平台实例
+        semaphore: 并发限制（asyncio.Semaphore 或 AdaptiveLimiter）
+        no_cache: 跳过平台缓存直接采集（常驻调度按自己的间隔轮询，不能被缓存时间挡住）
+        timeout: 采集时间上限（秒，从拿到并发名额开始计算，包含备用方案），默认按 PLATFORM_TIMEOUT / PLATFORM_TIMEOUTS
+    """
+    # 每个平台在各自的任务中运行，网络耗时记录据此归属到平台
+    current_platform.set(platform_name)
+    budget = platform_timeout(platform_name) if timeout is None else timeout
     async with semaphore:
-        # 保存平台实例的属性，以便在close后使用
-        platform_title = platform_instance.title
-        platform_type = platform_instance.type
-        platform_description = platform_instance.description
-        platform_link = platform_instance.link
-        
         try:
-            # 先尝试使用缓存
-            result = await platform_instance.get_route_data(no_cache=False)
-            total_items = result.get("total", 0)
-            
-            # 如果缓存中的数据为0条，强制重新采集
-            if total_items == 0 and result.get("fromCache", False):
-                logger.info(f"平台 {platform_name} 缓存数据为0条，强制重新采集...")
-                result = await platform_instance.get_route_data(no_cache=True)
-                total_items = result.get("total", 0)
-            
-            await platform_instance.close()
-            
-            # 必须是采集数据数 >= 1 才算是成功采集
-            if total_items >= 1:
-                logger.info(f"✓ 平台 {platform_name} 采集成功，共 {total_items} 条数据")
-                return {
-                    "success": True,
-                    "platform": platform_name,
-                    "data": result,
-                    "error": None,
-                }
-            else:
-                logger.warning(f"✗ 平台 {platform_name} 采集失败: 采集数据数为0")
-                
-                # 如果是 douyin 或 tieba，尝试从 TopHub 获取备用数据
-                if platform_name in ["douyin", "tieba"]:
-                    logger.info(f"尝试从 TopHub 获取 {platform_name} 备用数据...")
-                    try:
-                        fallback_http_client = HTTPClient()
-                        
-                        if platform_name == "douyin":
-                            fallback_data = await fetch_douyin_from_tophub(fallback_http_client)
-                        elif platform_name == "tieba":
-                            fallback_data = await fetch_tieba_from_tophub(fallback_http_client)
-                        else:
-                            fallback_data = []
-                        
-                        await fallback_http_client.close()
-                        
-                        if fallback_data and len(fallback_data) >= 1:
-                            # 构建与原始格式一致的结果
-                            fallback_result = {
-                                "name": result.get("name", platform_name),
-                                "title": result.get("title", platform_title),
-                                "type": result.get("type", platform_type),
-                                "description": result.get("description", platform_description),
-                                "link": result.get("link", platform_link),
-                                "total": len(fallback_data),
-                                "fromCache": False,
-                                "updateTime": format_time(),
-                                "data": fallback_data,
-                            }
-                            
-                            logger.info(f"✓ 平台 {platform_name} 从 TopHub 备用方案采集成功，共 {len(fallback_data)} 条数据")
-                            return {
-                                "success": True,
-                                "platform": platform_name,
-                                "data": fallback_result,
-                                "error": None,
-                            }
-                        else:
-                            logger.warning(f"✗ 平台 {platform_name} TopHub 备用方案也失败: 未获取到数据")
-                    except Exception as fallback_error:
-                        logger.warning(f"✗ 平台 {platform_name} TopHub 备用方案失败: {str(fallback_error)}")
-                
-                return {
-                    "success": False,
-                    "platform": platform_name,
-                    "data": None,
-                    "error": "采集数据数为0",
-                }
-        except Exception as e:
+            return await asyncio.wait_for(
+                _collect_platform_data(platform_name, platform_instance, no_cache),
+                timeout=budget if budget > 0 else None,
+            )
+        except asyncio.TimeoutError:
+            # 平台内部的请求超时已在 _collect_platform_data 中处理，这里只会是超过时间上限被取消
             await platform_instance.close()
-            logger.error(f"✗ 平台 {platform_name} 采集失败: {str(e)}")
-            
-            # 如果是 douyin 或 tieba，尝试从 TopHub 获取备用数据
-            if platform_name in ["douyin", "tieba"]:
-                logger.info(f"尝试从 TopHub 获取 {platform_name} 备用数据...")
-                try:
-                    fallback_http_client = HTTPClient()
-                    
-                    if platform_name == "douyin":
-                        fallback_data = await fetch_douyin_from_tophub(fallback_http_client)
-                    elif platform_name == "tieba":
-                        fallback_data = await fetch_tieba_from_tophub(fallback_http_client)
-                    else:
-                        fallback_data = []
-                    
-                    await fallback_http_client.close()
-                    
-                    if fallback_data and len(fallback_data) >= 1:
-                        # 构建与原始格式一致的结果
-                        fallback_result = {
-                            "name": platform_name,
-                            "title": platform_title,
-                            "type": platform_type,
-                            "description": platform_description,
-                            "link": platform_link,
-                            "total": len(fallback_data),
-                            "fromCache": False,
-                            "updateTime": format_time(),
-                            "data": fallback_data,
-                        }
-                        
-                        logger.info(f"✓ 平台 {platform_name} 从 TopHub 备用方案采集成功，共 {len(fallback_data)} 条数据")
-                        return {
-                            "success": True,
-                            "platform": platform_name,
-                            "data": fallback_result,
-                            "error": None,
-                        }
-                    else:
-                        logger.warning(f"✗ 平台 {platform_name} TopHub 备用方案也失败: 未获取到数据")
-                except Exception as fallback_error:
-                    logger.warning(f"✗ 平台 {platform_name} TopHub 备用方案失败: {str(fallback_error)}")
-            
+            error = f"采集超时（超过 {budget:.0f} 秒），已取消"
+            logger.error(f"✗ 平台 {platform_name} {error}")
             return {
                 "success": False,
                 "platform": platform_name,
                 "data": None,
-                "error": str(e),
+                "error": error,
             }
 
 
-async def collect_all_platforms(concurrent_limit: int = 10) -> Dict[str, Any]:
-    """采集所有平台数据"""
-    platforms = get_all_platforms()
-    semaphore = asyncio.Semaphore(concurrent_limit)
+async def _collect_platform_data(platform_name: str, platform_instance, no_cache: bool) -> Dict[str, Any]:
+    """采集单个平台数据（备用数据源由平台的 sources() 声明，在 collect 中按 HEDGE_DELAY 对冲）"""
+    try:
+        # 先尝试使用缓存
+        result = await platform_instance.get_route_data(no_cache=no_cache)
+        total_items = result.get("total", 0)
+        
+        # 如果缓存中的数据为0条，强制重新采集
+        if total_items == 0 and result.get("fromCache", False):
+            logger.info(f"平台 {platform_name} 缓存数据为0条，强制重新采集...")
+            result = await platform_instance.get_route_data(no_cache=True)
+            total_items = result.get("total", 0)
+        
+        await platform_instance.close()
+        
+        # 必须是采集数据数 >= 1 才算是成功采集
+        if total_items >= 1:
+            source = result.get("source", PRIMARY)
+            via = f"（备用数据源 {source}）" if source != PRIMARY else ""
+            logger.info(f"✓ 平台 {platform_name} 采集成功{via}，共 {total_items} 条数据")
+            return {
+                "success": True,
+                "platform": platform_name,
+                "data": result,
+                "error": None,
+            }
+        else:
+            logger.warning(f"✗ 平台 {platform_name} 采集失败: 采集数据数为0")
+            return {
+                "success": False,
+                "platform": platform_name,
+                "data": None,
+                "error": "采集数据数为0",
+            }
+    except Exception as e:
+        await platform_instance.close()
+        logger.error(f"✗ 平台 {platform_name} 采集失败: {str(e)}")
+        return {
+            "success": False,
+            "platform": platform_name,
+            "data": None,
+            "error": str(e),
+        }
+
+
+async def collect_all_platforms(
+    concurrent_limit: int = CONCURRENT_LIMIT,
+    platforms: Optional[Dict[str, Any]] = None,
+    adaptive: bool = CONCURRENCY_ADAPTIVE,
+    deadline: Optional[float] = None,
+    workers: int = COLLECT_WORKERS,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    loop_monitor: bool = LOOP_MONITOR,
+    no_cache: bool = False,
+) -> Dict[str, Any]:
+    """
+    采集所有平台数据
+    
+    Args:
+        concurrent_limit: 同时采集的平台数（启用自适应时为初始值）
+        platforms: 平台名称 -> 平台实例，默认为注册表中的所有平台
+        adaptive: 是否根据超时、429 和请求耗时自动调整并发数（AIMD）
+        deadline: 采集截止时间（秒），到时取消未完成的平台并记为超时，None 或 0 表示不限制
+        workers: 大于 1 时把平台分到多个子进程采集（子进程按名称重新创建平台实例，platforms 中只能是注册表中的平台）
+        on_result: 每个平台完成时以 collect_platform 的返回值调用
+        loop_monitor: 是否监控事件循环的调度延迟和慢回调
+        no_cache: 是否跳过缓存，直接请求各平台
     
-    tasks = [
-        collect_platform(name, platform, semaphore)
+    Returns:
+        results / errors / timed_out（因截止时间被取消的平台）/ circuit_breakers / network / concurrency /
+        loop（事件循环监控结果，未启用时为空）
+    """
+    if workers > 1:
+        names = list(PLATFORMS) if platforms is None else list(platforms)
+        return await collect_sharded(names, workers, concurrent_limit, adaptive, deadline, loop_monitor, no_cache)
+    if platforms is None:
+        platforms = get_all_platforms()
+    metrics = get_network_metrics()
+    metrics.reset()
+    
+    limiter = AdaptiveLimiter(initial=concurrent_limit)
+    if adaptive:
+        metrics.add_listener(limiter.on_record)
+    
+    monitor = LoopMonitor() if loop_monitor else None
+    if monitor is not None:
+        monitor.start()
+    
+    loop = asyncio.get_running_loop()
+    deadline_at = loop.time() + deadline if deadline else None
+    tasks = {
+        asyncio.create_task(collect_platform(name, platform, limiter, no_cache)): name
         for name, platform in platforms.items()
-    ]
+    }
     
     # 处理结果（实时处理完成的任务）
     all_results = {}
     errors = {}
+    timed_out = []
     
-    # 使用 as_completed 来实时处理完成的任务
-    for task in asyncio.as_completed(tasks):
-        try:
-            result = await task
-            platform_name = result["platform"]
-            if result["success"]:
-                all_results[platform_name] = result["data"]
-            else:
-                errors[platform_name] = result["error"]
-        except Exception as e:
-            logger.error(f"✗ 平台采集异常: {str(e)}")
+    pending = set(tasks)
+    try:
+        while pending:
+            timeout = None if deadline_at is None else max(0.0, deadline_at - loop.time())
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                try:
+                    result = task.result()
+                    if on_result is not None:
+                        on_result(result)
+                    platform_name = result["platform"]
+                    if result["success"]:
+                        all_results[platform_name] = result["data"]
+                    else:
+                        errors[platform_name] = result["error"]
+                except Exception as e:
+                    logger.error(f"✗ 平台 {tasks[task]} 采集异常: {str(e)}")
+                    errors[tasks[task]] = str(e)
+        
+        # 到达截止时间：取消未完成的平台，已完成的结果照常保存
+        if pending:
+            for task in pending:
+                task.cancel()
+                timed_out.append(tasks[task])
+                errors[tasks[task]] = f"超时：超过运行截止时间 {deadline:.0f} 秒，未完成"
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.warning(f"已到运行截止时间（{deadline:.0f} 秒），取消 {len(pending)} 个未完成的平台: {', '.join(sorted(timed_out))}")
+    finally:
+        metrics.remove_listener(limiter.on_record)
+        if monitor is not None:
+            await monitor.stop()
     
     return {
         "results": all_results,
         "errors": errors,
+        "timed_out": sorted(timed_out),
+        "circuit_breakers": get_circuit_breakers().snapshot(),
+        "network": metrics.summary(),
+        "concurrency": limiter.snapshot(),
+        "loop": monitor.summary() if monitor is not None else {},
     }
 
 
+def log_network_summary(network: Dict[str, Any], top: int = 10):
+    """输出耗时最高的主机（按总耗时 p95 排序）"""
+    hosts = network.get("hosts", {})
+    if not hosts:
+        return
+    
+    logger.info(f"网络请求: {network['requests']} 次，失败 {network['errors']} 次，共 {network['bytes'] / 1024:.0f} KB")
+    logger.info("耗时最高的主机（p50 / p95，毫秒）:")
+    for host, stats in list(hosts.items())[:top]:
+        phases = stats["phases"]
+        parts = [
+            f"{phase} {phases[phase]['p50_ms']:.0f}/{phases[phase]['p95_ms']:.0f}"
+            for phase in ["total", "dns", "connect", "ttfb", "body"]
+            if phase in phases
+        ]
+        logger.info(
+            f"  - {host} ({stats['requests']} 次, 重试 {stats['retries']}, 失败 {stats['errors']}): "
+            + ", ".join(parts)
+        )
+
+
+def log_loop_summary(loop_stats: Dict[str, Any], top: int = 5):
+    """输出事件循环调度延迟分布和最慢的回调"""
+    if not loop_stats:
+        return
+    
+    lag = loop_stats["lag"]
+    if lag:
+        logger.info(
+            f"事件循环调度延迟（毫秒，采样 {loop_stats['samples']} 次）: "
+            f"p50 {lag['p50_ms']:.1f} / p95 {lag['p95_ms']:.1f} / p99 {lag['p99_ms']:.1f} / 最大 {lag['max_ms']:.1f}"
+        )
+        logger.info("  分布: " + ", ".join(f"{label} {count}" for label, count in loop_stats["histogram"].items() if count))
+    
+    if loop_stats["slow_callbacks"]:
+        logger.warning(
+            f"阻塞事件循环的慢回调（超过 {loop_stats['slow_threshold_ms']:.0f} 毫秒）: "
+            f"{loop_stats['slow_callbacks']} 次，共 {loop_stats['blocked_ms'] / 1000:.2f} 秒"
+        )
+        for platform, stats in list(loop_stats["platforms"].items())[:top]:
+            logger.warning(f"  - {platform}: {stats['count']} 次，共 {stats['total_ms']:.0f} 毫秒，最长 {stats['max_ms']:.0f} 毫秒")
+        logger.warning("  最慢的回调:")
+        for item in loop_stats["slowest"][:top]:
+            logger.warning(f"  - {item['duration_ms']:.0f} 毫秒 [{item['platform']}] {item['callback']}")
+
+
 def group_by_category(data: Dict[str, Any]) -> Dict[str, Any]:
     """按类别分组数据"""
     categorized = {}
@@ -339,12 +436,104 @@ def save_to_json(data: Dict[str, Any], base_dir: str = "data"):
         filename = f"{category}.json"
         filepath = os.path.join(output_dir, filename)
         
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(category_data, f, ensure_ascii=False, indent=2)
+        with open(filepath, "wb") as f:
+            f.write(json_utils.dumps_bytes(category_data, indent=True))
         
         logger.info(f"✓ 已保存: {filepath} ({category_data['total_items']} 条数据)")
 
 
+def load_category_files(base_dir: str = "data") -> Dict[str, Any]:
+    """读取当天已保存的分类文件，返回 类别 -> 分类数据（没有文件的类别不包含在内）"""
+    today = datetime.now().strftime("%Y-%m-%d")
+    output_dir = os.path.join(base_dir, today, "categories")
+    
+    categorized = {}
+    for category in CATEGORIES:
+        filepath = os.path.join(output_dir, f"{category}.json")
+        try:
+            with open(filepath, "rb") as f:
+                categorized[category] = json_utils.loads(f.read())
+        except FileNotFoundError:
+            continue
+        except (OSError, json_utils.JSONDecodeError) as e:
+            logger.warning(f"读取分类文件失败，将重新生成: {filepath}: {e}")
+    return categorized
+
+
+def merge_category_results(data: Dict[str, Any], base_dir: str = "data", write: bool = True) -> Dict[str, Any]:
+    """
+    把部分平台的采集结果合并到当天已有的分类文件中
+    
+    只改写涉及到的类别文件，其余平台的数据保持不变；采集失败的平台保留之前成功采集的数据，
+    同时在 errors 中记录本次的错误。文件先写临时文件再替换，读取方不会读到写了一半的文件。
+    
+    Args:
+        data: 与 collect_all_platforms 返回值相同结构的 results / errors
+        base_dir: 数据输出目录
+        write: 是否写回分类文件；False 时只返回合并结果（如只输出 CSV 时）
+    
+    Returns:
+        本次改写的类别 -> 合并后的分类数据
+    """
+    today = datetime.now().strftime("%Y-%m-%d")
+    output_dir = os.path.join(base_dir, today, "categories")
+    if write:
+        os.makedirs(output_dir, exist_ok=True)
+    
+    existing = load_category_files(base_dir)
+    fresh = group_by_category({"results": {}, "errors": {}})
+    
+    merged = {}
+    for category, platform_names in CATEGORIES.items():
+        touched = [name for name in platform_names if name in data["results"] or name in data["errors"]]
+        if not touched:
+            continue
+        
+        category_data = existing.get(category) or fresh[category]
+        category_data.setdefault("platforms", {})
+        category_data.setdefault("errors", {})
+        for platform_name in touched:
+            if platform_name in data["results"]:
+                category_data["platforms"][platform_name] = data["results"][platform_name]
+                category_data["errors"].pop(platform_name, None)
+            else:
+                category_data["errors"][platform_name] = data["errors"][platform_name]
+        
+        platforms = category_data["platforms"]
+        category_data["timestamp"] = datetime.now().isoformat()
+        category_data["total_platforms"] = len(platform_names)
+        category_data["successful_platforms"] = len(platforms)
+        category_data["failed_platforms"] = len([name for name in category_data["errors"] if name not in platforms])
+        category_data["total_items"] = sum(platform_data.get("total", 0) for platform_data in platforms.values())
+        
+        merged[category] = category_data
+        if not write:
+            continue
+        
+        filepath = os.path.join(output_dir, f"{category}.json")
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json_utils.dumps_bytes(category_data, indent=True))
+        os.replace(tmp_path, filepath)
+        logger.debug(f"✓ 已合并: {filepath} ({category_data['total_items']} 条数据)")
+    
+    return merged
+
+
+def save_run_report(report: Dict[str, Any], base_dir: str = "data") -> str:
+    """保存本次运行报告到当天目录下的 run_report.json"""
+    today = datetime.now().strftime("%Y-%m-%d")
+    output_dir = os.path.join(base_dir, today)
+    os.makedirs(output_dir, exist_ok=True)
+    
+    filepath = os.path.join(output_dir, "run_report.json")
+    with open(filepath, "wb") as f:
+        f.write(json_utils.dumps_bytes(report, indent=True))
+    
+    logger.info(f"✓ 已保存运行报告: {filepath}")
+    return filepath
+
+
 def extract_titles_to_csv(categorized_data: Dict[str, Any], base_dir: str = "data"):
     """从分类数据中提取所有标题，生成CSV文件（每天覆盖）"""
     # 确保data目录存在
@@ -387,16 +576,38 @@ def extract_titles_to_csv(categorized_data: Dict[str, Any], base_dir: str = "dat
         return None
 
 
-async def collect_data():
-    """采集所有平台的热榜数据"""
+async def collect_data(
+    data_dir: Optional[str] = None,
+    deadline: Optional[float] = RUN_DEADLINE,
+    platforms: Optional[List[str]] = None,
+    no_cache: bool = False,
+    concurrent_limit: int = CONCURRENT_LIMIT,
+    output_format: str = OUTPUT_ALL,
+    workers: int = COLLECT_WORKERS,
+):
+    """
+    采集热榜数据
+    
+    Args:
+        data_dir: 数据输出目录，默认为项目根目录下的 data
+        deadline: 采集截止时间（秒），到时保存已完成的平台，其余平台在分类文件的 errors 中记为超时；
+            None 或 0 表示不限制，默认 RUN_DEADLINE
+        platforms: 要采集的平台名称，默认为全部平台；只采集部分平台时结果合并到当天已有的分类文件中，
+            其余平台的数据保持不变
+        no_cache: 是否跳过缓存，直接请求各平台
+        concurrent_limit: 同时采集的平台数（启用自适应时为初始值）
+        output_format: all（分类 JSON 和标题 CSV）、json 或 csv；运行报告总会保存
+        workers: 采集进程数
+    """
     # 配置日志
     setup_logger()
     
     # 获取项目根目录（run.py 所在的目录）
     # data_collector.py 在 src/ 目录下，所以项目根目录是 src 的上一级
-    current_file_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(current_file_dir)
-    data_dir = os.path.join(project_root, "data")
+    if data_dir is None:
+        current_file_dir = os.path.dirname(os.path.abspath(__file__))
+        project_root = os.path.dirname(current_file_dir)
+        data_dir = os.path.join(project_root, "data")
     
     logger.info("=" * 80)
     logger.info("Daily Hot Collector - 热榜数据采集工具")
@@ -405,10 +616,21 @@ async def collect_data():
     logger.info(f"开始时间: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
     logger.info("")
     
-    # 采集所有平台数据
-    logger.info("正在采集所有平台数据...")
+    # 采集平台数据
+    if platforms is None:
+        logger.info("正在采集所有平台数据...")
+    else:
+        logger.info(f"正在采集 {len(platforms)} 个平台的数据: {', '.join(platforms)}")
     logger.info("")
-    data = await collect_all_platforms(concurrent_limit=10)
+    if deadline:
+        logger.info(f"采集截止时间: {deadline:.0f} 秒")
+    data = await collect_all_platforms(
+        concurrent_limit=concurrent_limit,
+        platforms=get_all_platforms(platforms) if platforms is not None else None,
+        deadline=deadline,
+        workers=workers,
+        no_cache=no_cache,
+    )
     
     # 统计信息
     total_platforms = len(data["results"]) + len(data["errors"])
@@ -426,6 +648,8 @@ async def collect_data():
     logger.info(f"总平台数: {total_platforms}")
     logger.info(f"成功: {successful_platforms}")
     logger.info(f"失败: {failed_platforms}")
+    if data["timed_out"]:
+        logger.warning(f"超过截止时间被取消: {len(data['timed_out'])}")
     
     # 如果有失败的平台，列出它们的名字和错误信息
     if failed_platforms > 0:
@@ -434,34 +658,122 @@ async def collect_data():
             logger.warning(f"  - {platform_name}: {error_msg}")
     
     logger.info(f"总数据条数: {total_items}")
+    
+    # 使用备用数据源的平台
+    fallbacks = {
+        platform_name: platform_data["source"]
+        for platform_name, platform_data in data["results"].items()
+        if platform_data.get("source", PRIMARY) != PRIMARY
+    }
+    if fallbacks:
+        logger.info(f"使用备用数据源: {', '.join(f'{name}（{source}）' for name, source in fallbacks.items())}")
+    
+    # 熔断器状态
+    circuit_breakers = data.get("circuit_breakers", {})
+    if circuit_breakers:
+        logger.warning("熔断器状态:")
+        for endpoint, breaker in circuit_breakers.items():
+            logger.warning(f"  - {endpoint}: {breaker['state']}（连续失败 {breaker['failures']} 次）")
     logger.info("")
     
-    # 按类别分组
-    logger.info("正在按类别分组数据...")
-    categorized_data = group_by_category(data)
+    # 并发调整过程
+    concurrency = data.get("concurrency", {})
+    if concurrency:
+        # 多进程采集时初始 / 结束为各进程之和，最高 / 最低为单个进程的值
+        per_process = "单进程" if concurrency.get("shards") else ""
+        logger.info(
+            f"并发数: 初始 {concurrency['initial']}，结束 {concurrency['final']}"
+            f"（{per_process}最高 {concurrency['peak']}，{per_process}最低 {concurrency['lowest']}，"
+            f"增加 {concurrency['increases']} 次，减少 {concurrency['decreases']} 次）"
+        )
+        if concurrency["trajectory"]:
+            logger.info(f"  调整过程: {format_trajectory(concurrency['trajectory'], concurrency['initial'])}")
+    
+    # 网络耗时
+    network = data.get("network", {})
+    log_network_summary(network)
+    
+    # 事件循环健康状况（LOOP_MONITOR=1 时）
+    loop_stats = data.get("loop", {})
+    log_loop_summary(loop_stats)
+    logger.info("")
     
-    # 保存到 JSON 文件
+    write_json = output_format in [OUTPUT_ALL, OUTPUT_JSON]
+    write_csv = output_format in [OUTPUT_ALL, OUTPUT_CSV]
     today = datetime.now().strftime("%Y-%m-%d")
-    logger.info(f"正在保存数据到 JSON 文件 (日期: {today})...")
-    save_to_json(categorized_data, base_dir=data_dir)
-    logger.info(f"数据保存路径: {os.path.join(data_dir, today, 'categories')}")
+    
+    if platforms is None:
+        # 按类别分组
+        logger.info("正在按类别分组数据...")
+        categorized_data = group_by_category(data)
+        
+        # 保存到 JSON 文件
+        if write_json:
+            logger.info(f"正在保存数据到 JSON 文件 (日期: {today})...")
+            save_to_json(categorized_data, base_dir=data_dir)
+            logger.info(f"数据保存路径: {os.path.join(data_dir, today, 'categories')}")
+    else:
+        # 只采集了部分平台：合并到当天已有的分类文件，CSV 按合并后的全部分类生成
+        logger.info(f"正在合并到当天的分类文件 (日期: {today})...")
+        merged = merge_category_results(data, base_dir=data_dir, write=write_json)
+        existing = load_category_files(data_dir)
+        categorized_data = {
+            category: merged.get(category) or existing[category]
+            for category in CATEGORIES
+            if category in merged or category in existing
+        }
+        if write_json:
+            logger.info(f"已更新类别: {', '.join(merged) or '无'}")
     
     # 提取标题生成CSV文件（每天覆盖）
+    if write_csv:
+        logger.info("")
+        logger.info("正在提取标题生成CSV文件...")
+        csv_path = extract_titles_to_csv(categorized_data, base_dir=data_dir)
+        if csv_path:
+            logger.info(f"CSV文件路径: {csv_path}")
+    
+    end_time = datetime.now()
+    duration = (end_time - start_time).total_seconds()
+    
+    # 保存运行报告
     logger.info("")
-    logger.info("正在提取标题生成CSV文件...")
-    csv_path = extract_titles_to_csv(categorized_data, base_dir=data_dir)
-    if csv_path:
-        logger.info(f"CSV文件路径: {csv_path}")
+    save_run_report({
+        "start_time": start_time.isoformat(),
+        "end_time": end_time.isoformat(),
+        "duration": round(duration, 3),
+        "total_platforms": total_platforms,
+        "successful_platforms": successful_platforms,
+        "failed_platforms": failed_platforms,
+        "total_items": total_items,
+        "errors": data["errors"],
+        "fallbacks": fallbacks,
+        "platforms": platforms,
+        "output_format": output_format,
+        "deadline": deadline or None,
+        "timed_out": data["timed_out"],
+        "circuit_breakers": circuit_breakers,
+        "concurrency": concurrency,
+        "network": network,
+        "loop": loop_stats,
+    }, base_dir=data_dir)
     
     logger.info("")
     logger.info("=" * 80)
-    end_time = datetime.now()
-    duration = (end_time - start_time).total_seconds()
     logger.info("完成!")
     logger.info(f"结束时间: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
     logger.info(f"耗时: {duration:.2f} 秒")
     logger.info("=" * 80)
 
 
+async def main():
+    """命令行入口：采集一次后关闭共享连接池"""
+    try:
+        await collect_data()
+    finally:
+        await close_shared_session()
+        shutdown_parse_executor()
+
+
 if __name__ == "__main__":
-    asyncio.run(collect_data())
+    asyncio.run(main())
@@ -100,7 +100,6 @@ USER_DATA_DIR = Path(__file__).parent / '.browser_data'
 
 # 保存回答的目录
 RESPONSES_DIR = Path(__file__).parent / 'responses'
-RESPONSES_DIR.mkdir(exist_ok=True)
 
 # Chrome 二进制文件路径（如果为 None，则使用系统默认的 Chrome）
 # 示例路径（根据实际情况修改）:
@@ -649,6 +648,8 @@ def save_response(question: str, answer: str):
         print("未获取到AI回答，跳过保存")
         return
     
+    # 在真正保存时才创建目录，导入本模块不产生副作用
+    RESPONSES_DIR.mkdir(exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = RESPONSES_DIR / f"response_{timestamp}.json"
     
@@ -0,0 +1,7 @@
+"""输出格式 - 采集结果保存哪些文件（纯常量，命令行解析参数时不需要导入采集模块）"""
+
+# 输出格式：分类 JSON 和标题 CSV 都输出、只输出分类 JSON、只输出标题 CSV
+OUTPUT_ALL = "all"
+OUTPUT_JSON = "json"
+OUTPUT_CSV = "csv"
+OUTPUT_FORMATS = [OUTPUT_ALL, OUTPUT_JSON, OUTPUT_CSV]
@@ -1,5 +1,5 @@
 """平台实现模块"""
 
-from .registry import get_platform, get_all_platforms, get_platforms_by_category, CATEGORIES
+from .registry import get_platform, get_all_platforms, get_platforms_by_category, CATEGORIES, MANIFEST
 
-__all__ = ["get_platform", "get_all_platforms", "get_platforms_by_category", "CATEGORIES"]
+__all__ = ["get_platform", "get_all_platforms", "get_platforms_by_category", "CATEGORIES", "MANIFEST"]
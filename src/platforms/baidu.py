@@ -4,6 +4,7 @@ import re
 from typing import Dict, List, Any
 
 from .base_platform import BasePlatform
+from ..utils import json_utils
 
 
 class BaiduPlatform(BasePlatform):
@@ -29,27 +30,31 @@ class BaiduPlatform(BasePlatform):
             response_type="text"
         )
         
-        # 正则提取 JSON 数据
-        pattern = r'<!--s-data:(.*?)-->'
-        match = re.search(pattern, html, re.DOTALL)
-        if not match:
-            return []
-        
-        import json
-        json_data = json.loads(match.group(1))
-        list_data = json_data.get("cards", [{}])[0].get("content", [])
-        
-        return [
-            {
-                "id": item.get("index", 0),
-                "title": item.get("word", ""),
-                "desc": item.get("desc", ""),
-                "cover": item.get("img", ""),
-                "author": " ".join(item.get("show", [])) if item.get("show") else "",
-                "timestamp": 0,
-                "hot": int(item.get("hotScore", 0)),
-                "url": f"https://www.baidu.com/s?wd={item.get('query', '')}",
-                "mobileUrl": item.get("rawUrl", ""),
-            }
-            for item in list_data
-        ]
+        return await self.run_parser(parse_board, html)
+
+
+def parse_board(html: str) -> List[Dict[str, Any]]:
+    """从页面注释中的 s-data 解析热搜榜（模块级纯函数，可在解析执行器中运行）"""
+    # 正则提取 JSON 数据
+    pattern = r'<!--s-data:(.*?)-->'
+    match = re.search(pattern, html, re.DOTALL)
+    if not match:
+        return []
+    
+    json_data = json_utils.loads(match.group(1))
+    list_data = json_data.get("cards", [{}])[0].get("content", [])
+    
+    return [
+        {
+            "id": item.get("index", 0),
+            "title": item.get("word", ""),
+            "desc": item.get("desc", ""),
+            "cover": item.get("img", ""),
+            "author": " ".join(item.get("show", [])) if item.get("show") else "",
+            "timestamp": 0,
+            "hot": int(item.get("hotScore", 0)),
+            "url": f"https://www.baidu.com/s?wd={item.get('query', '')}",
+            "mobileUrl": item.get("rawUrl", ""),
+        }
+        for item in list_data
+    ]
@@ -20,32 +20,38 @@ class DoubanGroupPlatform(BasePlatform):
         self.link = "https://www.douban.com/group/explore"
         self.category = "娱乐内容"
     
-    def _get_numbers(self, text: str) -> int:
-        """提取数字"""
-        if not text:
-            return 100000000
-        match = re.search(r'\d+', text)
-        return int(match.group(0)) if match else 100000000
-    
     async def fetch(self, **kwargs) -> List[Dict[str, Any]]:
         """获取数据"""
         url = "https://www.douban.com/group/explore"
         
         html = await self.http_client.get(url=url, response_type="text")
         
-        soup = BeautifulSoup(html, "html.parser")
-        list_dom = soup.select(".article .channel-item")
-        
-        return [
-            {
-                "id": self._get_numbers(item.select_one("h3 a").get("href", "") if item.select_one("h3 a") else ""),
-                "title": item.select_one("h3 a").text.strip() if item.select_one("h3 a") else "",
-                "cover": item.select_one(".pic-wrap img").get("src", "") if item.select_one(".pic-wrap img") else "",
-                "desc": item.select_one(".block p").text.strip() if item.select_one(".block p") else "",
-                "timestamp": get_time(item.select_one("span.pubtime").text.strip() if item.select_one("span.pubtime") else ""),
-                "hot": 0,
-                "url": item.select_one("h3 a").get("href", "") if item.select_one("h3 a") else "",
-                "mobileUrl": f"https://m.douban.com/group/topic/{self._get_numbers(item.select_one('h3 a').get('href', '') if item.select_one('h3 a') else '')}/",
-            }
-            for item in list_dom
-        ]
+        return await self.run_parser(parse_explore, html)
+
+
+def _get_numbers(text: str) -> int:
+    """提取数字"""
+    if not text:
+        return 100000000
+    match = re.search(r'\d+', text)
+    return int(match.group(0)) if match else 100000000
+
+
+def parse_explore(html: str) -> List[Dict[str, Any]]:
+    """解析讨论精选页面（模块级纯函数，可在解析执行器中运行）"""
+    soup = BeautifulSoup(html, "html.parser")
+    list_dom = soup.select(".article .channel-item")
+    
+    return [
+        {
+            "id": _get_numbers(item.select_one("h3 a").get("href", "") if item.select_one("h3 a") else ""),
+            "title": item.select_one("h3 a").text.strip() if item.select_one("h3 a") else "",
+            "cover": item.select_one(".pic-wrap img").get("src", "") if item.select_one(".pic-wrap img") else "",
+            "desc": item.select_one(".block p").text.strip() if item.select_one(".block p") else "",
+            "timestamp": get_time(item.select_one("span.pubtime").text.strip() if item.select_one("span.pubtime") else ""),
+            "hot": 0,
+            "url": item.select_one("h3 a").get("href", "") if item.select_one("h3 a") else "",
+            "mobileUrl": f"https://m.douban.com/group/topic/{_get_numbers(item.select_one('h3 a').get('href', '') if item.select_one('h3 a') else '')}/",
+        }
+        for item in list_dom
+    ]
@@ -19,13 +19,6 @@ class DoubanMoviePlatform(BasePlatform):
         self.link = "https://movie.douban.com/chart"
         self.category = "娱乐内容"
     
-    def _get_numbers(self, text: str) -> int:
-        """提取数字"""
-        if not text:
-            return 0
-        match = re.search(r'\d+', text)
-        return int(match.group(0)) if match else 0
-    
     async def fetch(self, **kwargs) -> List[Dict[str, Any]]:
         """获取数据"""
         url = "https://movie.douban.com/chart/"
@@ -38,19 +31,32 @@ class DoubanMoviePlatform(BasePlatform):
             response_type="text"
         )
         
-        soup = BeautifulSoup(html, "html.parser")
-        list_dom = soup.select(".article tr.item")
-        
-        return [
-            {
-                "id": self._get_numbers(item.select_one("a").get("href", "") if item.select_one("a") else ""),
-                "title": f"【{item.select_one('.rating_nums').text if item.select_one('.rating_nums') else '0.0'}】{item.select_one('a').get('title', '') if item.select_one('a') else ''}",
-                "cover": item.select_one("img").get("src", "") if item.select_one("img") else "",
-                "desc": item.select_one("p.pl").text if item.select_one("p.pl") else "",
-                "timestamp": None,
-                "hot": self._get_numbers(item.select_one("span.pl").text if item.select_one("span.pl") else ""),
-                "url": item.select_one("a").get("href", "") if item.select_one("a") else "",
-                "mobileUrl": f"https://m.douban.com/movie/subject/{self._get_numbers(item.select_one('a').get('href', '') if item.select_one('a') else '')}/",
-            }
-            for item in list_dom
-        ]
+        return await self.run_parser(parse_chart, html)
+
+
+def _get_numbers(text: str) -> int:
+    """提取数字"""
+    if not text:
+        return 0
+    match = re.search(r'\d+', text)
+    return int(match.group(0)) if match else 0
+
+
+def parse_chart(html: str) -> List[Dict[str, Any]]:
+    """解析新片榜页面（模块级纯函数，可在解析执行器中运行）"""
+    soup = BeautifulSoup(html, "html.parser")
+    list_dom = soup.select(".article tr.item")
+    
+    return [
+        {
+            "id": _get_numbers(item.select_one("a").get("href", "") if item.select_one("a") else ""),
+            "title": f"【{item.select_one('.rating_nums').text if item.select_one('.rating_nums') else '0.0'}】{item.select_one('a').get('title', '') if item.select_one('a') else ''}",
+            "cover": item.select_one("img").get("src", "") if item.select_one("img") else "",
+            "desc": item.select_one("p.pl").text if item.select_one("p.pl") else "",
+            "timestamp": None,
+            "hot": _get_numbers(item.select_one("span.pl").text if item.select_one("span.pl") else ""),
+            "url": item.select_one("a").get("href", "") if item.select_one("a") else "",
+            "mobileUrl": f"https://m.douban.com/movie/subject/{_get_numbers(item.select_one('a').get('href', '') if item.select_one('a') else '')}/",
+        }
+        for item in list_dom
+    ]
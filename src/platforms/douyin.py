@@ -4,6 +4,7 @@ import re
 from typing import Dict, List, Any
 
 from .base_platform import BasePlatform
+from ..utils.hedging import Source
 from ..utils.time_utils import get_time
 from ..utils.token_utils import get_douyin_cookie
 
@@ -20,6 +21,17 @@ class DouyinPlatform(BasePlatform):
         self.link = "https://www.douyin.com"
         self.category = "社交媒体"
     
+    def sources(self, **kwargs) -> List[Source]:
+        """抖音接口，TopHub 抖音总榜作为备用"""
+        return [*super().sources(**kwargs), Source("tophub", self.fetch_tophub)]
+    
+    async def fetch_tophub(self) -> List[Dict[str, Any]]:
+        """从 TopHub 获取抖音总榜数据"""
+        # 备用方案依赖 bs4，只在用到时导入
+        from ..utils.tophub_fallback import fetch_douyin_from_tophub
+        
+        return await fetch_douyin_from_tophub(self.http_client)
+    
     async def fetch(self, **kwargs) -> List[Dict[str, Any]]:
         """获取数据"""
         try:
@@ -31,48 +31,53 @@ class GithubPlatform(BasePlatform):
             response_type="text"
         )
         
-        soup = BeautifulSoup(html, "html.parser")
-        articles = soup.select("article.Box-row")
+        return await self.run_parser(parse_trending, html)
+
+
+def parse_trending(html: str) -> List[Dict[str, Any]]:
+    """解析 Trending 页面（模块级纯函数，可在解析执行器中运行）"""
+    soup = BeautifulSoup(html, "html.parser")
+    articles = soup.select("article.Box-row")
+    
+    result = []
+    for article in articles:
+        # 仓库标题和链接
+        repo_anchor = article.select_one("h2 a")
+        if not repo_anchor:
+            continue
+        
+        full_name_text = repo_anchor.get_text(strip=True).replace("\n", "").replace("  ", " ")
+        parts = [s.strip() for s in full_name_text.split("/")]
+        owner = parts[0] if len(parts) > 0 else ""
+        repo_name = parts[1] if len(parts) > 1 else ""
+        
+        repo_url = "https://github.com" + repo_anchor.get("href", "")
         
-        result = []
-        for article in articles:
-            # 仓库标题和链接
-            repo_anchor = article.select_one("h2 a")
-            if not repo_anchor:
-                continue
-            
-            full_name_text = repo_anchor.get_text(strip=True).replace("\n", "").replace("  ", " ")
-            parts = [s.strip() for s in full_name_text.split("/")]
-            owner = parts[0] if len(parts) > 0 else ""
-            repo_name = parts[1] if len(parts) > 1 else ""
-            
-            repo_url = "https://github.com" + repo_anchor.get("href", "")
-            
-            # 描述
-            desc_elem = article.select_one("p.col-9.color-fg-muted")
-            description = desc_elem.get_text(strip=True) if desc_elem else ""
-            
-            # 语言
-            lang_elem = article.select_one('[itemprop="programmingLanguage"]')
-            language = lang_elem.get_text(strip=True) if lang_elem else ""
-            
-            # Stars
-            stars_elem = article.select_one('a[href$="/stargazers"]')
-            stars = stars_elem.get_text(strip=True) if stars_elem else "0"
-            
-            # Forks
-            forks_elem = article.select_one('a[href$="/forks"]')
-            forks = forks_elem.get_text(strip=True) if forks_elem else "0"
-            
-            result.append({
-                "id": f"{owner}/{repo_name}",
-                "title": f"{owner}/{repo_name}",
-                "desc": description,
-                "author": owner,
-                "hot": stars,
-                "timestamp": None,
-                "url": repo_url,
-                "mobileUrl": repo_url,
-            })
+        # 描述
+        desc_elem = article.select_one("p.col-9.color-fg-muted")
+        description = desc_elem.get_text(strip=True) if desc_elem else ""
         
-        return result
+        # 语言
+        lang_elem = article.select_one('[itemprop="programmingLanguage"]')
+        language = lang_elem.get_text(strip=True) if lang_elem else ""
+        
+        # Stars
+        stars_elem = article.select_one('a[href$="/stargazers"]')
+        stars = stars_elem.get_text(strip=True) if stars_elem else "0"
+        
+        # Forks
+        forks_elem = article.select_one('a[href$="/forks"]')
+        forks = forks_elem.get_text(strip=True) if forks_elem else "0"
+        
+        result.append({
+            "id": f"{owner}/{repo_name}",
+            "title": f"{owner}/{repo_name}",
+            "desc": description,
+            "author": owner,
+            "hot": stars,
+            "timestamp": None,
+            "url": repo_url,
+            "mobileUrl": repo_url,
+        })
+    
+    return result
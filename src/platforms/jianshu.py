@@ -20,13 +20,6 @@ class JianshuPlatform(BasePlatform):
         self.link = "https://www.jianshu.com/"
         self.category = "新闻资讯"
     
-    def _get_id(self, url: str) -> str:
-        """获取 ID"""
-        if not url:
-            return "undefined"
-        match = re.search(r'([^/]+)$', url)
-        return match.group(1) if match else "undefined"
-    
     async def fetch(self, **kwargs) -> List[Dict[str, Any]]:
         """获取数据"""
         url = "https://www.jianshu.com/"
@@ -37,20 +30,33 @@ class JianshuPlatform(BasePlatform):
             response_type="text"
         )
         
-        soup = BeautifulSoup(html, "html.parser")
-        list_dom = soup.select("ul.note-list li")
-        
-        return [
-            {
-                "id": self._get_id(item.select_one("a").get("href", "") if item.select_one("a") else ""),
-                "title": item.select_one("a.title").text.strip() if item.select_one("a.title") else "",
-                "cover": item.select_one("img").get("src", "") if item.select_one("img") else "",
-                "desc": item.select_one("p.abstract").text.strip() if item.select_one("p.abstract") else "",
-                "author": item.select_one("a.nickname").text.strip() if item.select_one("a.nickname") else "",
-                "hot": None,
-                "timestamp": None,
-                "url": f"https://www.jianshu.com{item.select_one('a').get('href', '')}" if item.select_one("a") else "",
-                "mobileUrl": f"https://www.jianshu.com{item.select_one('a').get('href', '')}" if item.select_one("a") else "",
-            }
-            for item in list_dom
-        ]
+        return await self.run_parser(parse_home, html)
+
+
+def _get_id(url: str) -> str:
+    """获取 ID"""
+    if not url:
+        return "undefined"
+    match = re.search(r'([^/]+)$', url)
+    return match.group(1) if match else "undefined"
+
+
+def parse_home(html: str) -> List[Dict[str, Any]]:
+    """解析首页推荐列表（模块级纯函数，可在解析执行器中运行）"""
+    soup = BeautifulSoup(html, "html.parser")
+    list_dom = soup.select("ul.note-list li")
+    
+    return [
+        {
+            "id": _get_id(item.select_one("a").get("href", "") if item.select_one("a") else ""),
+            "title": item.select_one("a.title").text.strip() if item.select_one("a.title") else "",
+            "cover": item.select_one("img").get("src", "") if item.select_one("img") else "",
+            "desc": item.select_one("p.abstract").text.strip() if item.select_one("p.abstract") else "",
+            "author": item.select_one("a.nickname").text.strip() if item.select_one("a.nickname") else "",
+            "hot": None,
+            "timestamp": None,
+            "url": f"https://www.jianshu.com{item.select_one('a').get('href', '')}" if item.select_one("a") else "",
+            "mobileUrl": f"https://www.jianshu.com{item.select_one('a').get('href', '')}" if item.select_one("a") else "",
+        }
+        for item in list_dom
+    ]
@@ -1,9 +1,9 @@
 """快手平台"""
 
-import json
 from typing import Dict, List, Any
 
 from .base_platform import BasePlatform
+from ..utils import json_utils
 from ..utils.number_utils import parse_chinese_number
 
 
@@ -23,65 +23,74 @@ class KuaishouPlatform(BasePlatform):
         """获取数据"""
         url = "https://www.kuaishou.com/?isHome=1"
         
-        html = await self.http_client.get(
+        # 以原始字节获取页面，直接在 bytes 上定位并解析数 MB 的 APOLLO_STATE，省去整页解码
+        raw = await self.http_client.get(
             url=url,
             headers={
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
             },
-            response_type="text"
+            response_type="raw"
         )
+        html = raw.content
+        if raw.encoding not in ["utf-8", "ascii"]:
+            html = html.decode(raw.encoding, errors="replace").encode("utf-8")
         
-        # 提取 APOLLO_STATE
-        APOLLO_STATE_PREFIX = "window.__APOLLO_STATE__="
-        start = html.find(APOLLO_STATE_PREFIX)
-        if start == -1:
-            raise ValueError("快手页面结构变更，未找到 APOLLO_STATE")
-        
-        script_slice = html[start + len(APOLLO_STATE_PREFIX):]
-        sentinel_a = script_slice.find(";(function(")
-        sentinel_b = script_slice.find("</script>")
-        
-        cut_index = min(sentinel_a, sentinel_b) if sentinel_a != -1 and sentinel_b != -1 else max(sentinel_a, sentinel_b)
-        if cut_index == -1:
-            raise ValueError("快手页面结构变更，未找到 APOLLO_STATE 结束标记")
-        
-        raw = script_slice[:cut_index].strip().rstrip(";")
-        
-        # 解析 JSON
-        try:
-            last_brace = raw.rfind("}")
-            clean_raw = raw[:last_brace + 1] if last_brace != -1 else raw
-            json_object = json.loads(clean_raw)["defaultClient"]
-        except Exception as e:
-            raise ValueError(f"快手数据解析失败: {str(e)}")
-        
-        # 获取热榜数据
-        all_items = (
-            json_object.get('$ROOT_QUERY.visionHotRank({"page":"home"})', {}).get("items", []) or
-            json_object.get('$ROOT_QUERY.visionHotRank({"page":"home","platform":"web"})', {}).get("items", [])
-        )
+        return await self.run_parser(parse_hot_rank, html)
+
+
+def parse_hot_rank(html: bytes) -> List[Dict[str, Any]]:
+    """从页面的 APOLLO_STATE 解析热榜（模块级纯函数，可在解析执行器中运行）"""
+    # 提取 APOLLO_STATE
+    APOLLO_STATE_PREFIX = b"window.__APOLLO_STATE__="
+    start = html.find(APOLLO_STATE_PREFIX)
+    if start == -1:
+        raise ValueError("快手页面结构变更，未找到 APOLLO_STATE")
+    
+    script_slice = html[start + len(APOLLO_STATE_PREFIX):]
+    sentinel_a = script_slice.find(b";(function(")
+    sentinel_b = script_slice.find(b"</script>")
+    
+    cut_index = min(sentinel_a, sentinel_b) if sentinel_a != -1 and sentinel_b != -1 else max(sentinel_a, sentinel_b)
+    if cut_index == -1:
+        raise ValueError("快手页面结构变更，未找到 APOLLO_STATE 结束标记")
+    
+    raw_state = script_slice[:cut_index].strip().rstrip(b";")
+    
+    # 解析 JSON
+    try:
+        last_brace = raw_state.rfind(b"}")
+        clean_raw = raw_state[:last_brace + 1] if last_brace != -1 else raw_state
+        json_object = json_utils.loads(clean_raw)["defaultClient"]
+    except Exception as e:
+        raise ValueError(f"快手数据解析失败: {str(e)}")
+    
+    # 获取热榜数据
+    all_items = (
+        json_object.get('$ROOT_QUERY.visionHotRank({"page":"home"})', {}).get("items", []) or
+        json_object.get('$ROOT_QUERY.visionHotRank({"page":"home","platform":"web"})', {}).get("items", [])
+    )
+    
+    result = []
+    for item in all_items:
+        hot_item = json_object.get(item.get("id", ""))
+        if not hot_item:
+            continue
         
-        result = []
-        for item in all_items:
-            hot_item = json_object.get(item.get("id", ""))
-            if not hot_item:
-                continue
-            
-            photo_id = hot_item.get("photoIds", {}).get("json", [""])[0] if hot_item.get("photoIds", {}).get("json") else ""
-            hot_value = hot_item.get("hotValue", "")
-            poster = hot_item.get("poster", "")
-            if poster:
-                import urllib.parse
-                poster = urllib.parse.unquote(poster)
-            
-            result.append({
-                "id": hot_item.get("id", ""),
-                "title": hot_item.get("name", ""),
-                "cover": poster,
-                "hot": parse_chinese_number(str(hot_value)),
-                "timestamp": None,
-                "url": f"https://www.kuaishou.com/short-video/{photo_id}",
-                "mobileUrl": f"https://www.kuaishou.com/short-video/{photo_id}",
-            })
+        photo_id = hot_item.get("photoIds", {}).get("json", [""])[0] if hot_item.get("photoIds", {}).get("json") else ""
+        hot_value = hot_item.get("hotValue", "")
+        poster = hot_item.get("poster", "")
+        if poster:
+            import urllib.parse
+            poster = urllib.parse.unquote(poster)
         
-        return result
+        result.append({
+            "id": hot_item.get("id", ""),
+            "title": hot_item.get("name", ""),
+            "cover": poster,
+            "hot": parse_chinese_number(str(hot_value)),
+            "timestamp": None,
+            "url": f"https://www.kuaishou.com/short-video/{photo_id}",
+            "mobileUrl": f"https://www.kuaishou.com/short-video/{photo_id}",
+        })
+    
+    return result
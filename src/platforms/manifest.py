@@ -0,0 +1,102 @@
+"""平台清单 - 平台名称、类别、模块和访问的主机（纯数据，读取时不导入任何平台代码和第三方库）"""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class PlatformSpec(NamedTuple):
+    """平台清单项"""
+    
+    name: str
+    category: str
+    # src.platforms 下的模块名和平台类名，选中平台时才导入
+    module: str
+    class_name: str
+    # 采集时会访问的主机（含 TopHub 备用数据源）或共用限流配额的主机组，用于多进程采集时把
+    # 共用主机的平台分到同一个进程
+    hosts: Tuple[str, ...]
+
+
+# TopHub 聚合页
+TOPHUB = "tophub.today"
+# 新浪：sina（newsapp.sina.cn）和 sina-news（top.*.sina.com.cn）主机不同，但共用新浪的限流配额
+# （见 utils.rate_limiter.HOST_LIMITS 中的 group），需要分到同一个进程
+SINA = "sina"
+
+# 平台分类（类别内的顺序即分类文件中平台的顺序）
+CATEGORIES: Dict[str, List[str]] = {
+    "新闻资讯": ["baidu", "toutiao", "ithome", "netease-news", "zhihu-daily", "36kr", "qq-news", "thepaper", "sina-news", "sina", "huxiu", "ifanr", "guokr", "jianshu", "jiqizhixin", "qbitai", "readhub"],
+    "社交媒体": ["weibo", "zhihu", "bilibili", "douyin", "acfun", "tieba", "kuaishou", "wechat-hot", "jike"],
+    "技术社区": ["juejin", "v2ex", "csdn", "52pojie", "github", "hackernews", "oschina"],
+    "娱乐内容": ["douban-movie", "douban-group", "weread", "ngabbs", "taptap"],
+    "生活消费": ["sspai", "hupu"],
+    "金融财经": ["xueqiu"],
+    "设计创意": ["zcool"],
+    "汽车": ["dongchedi", "autohome"],
+    "简报": ["tophub-ai-brief"],
+}
+
+# 平台名称 -> 类别
+_CATEGORY_OF = {name: category for category, names in CATEGORIES.items() for name in names}
+
+
+def _spec(name: str, module: str, class_name: str, hosts: Tuple[str, ...]) -> PlatformSpec:
+    return PlatformSpec(name, _CATEGORY_OF.get(name, ""), module, class_name, hosts)
+
+
+# 平台清单（顺序即全量采集时启动各平台的顺序）
+PLATFORM_SPECS: List[PlatformSpec] = [
+    _spec("bilibili", "bilibili", "BilibiliPlatform", ("api.bilibili.com",)),
+    _spec("weibo", "weibo", "WeiboPlatform", ("weibo.com",)),
+    _spec("zhihu", "zhihu", "ZhihuPlatform", ("api.zhihu.com",)),
+    _spec("baidu", "baidu", "BaiduPlatform", ("top.baidu.com",)),
+    _spec("douban-movie", "douban_movie", "DoubanMoviePlatform", ("movie.douban.com",)),
+    _spec("zhihu-daily", "zhihu_daily", "ZhihuDailyPlatform", ("daily.zhihu.com",)),
+    _spec("juejin", "juejin", "JuejinPlatform", ("api.juejin.cn",)),
+    _spec("v2ex", "v2ex", "V2exPlatform", ("www.v2ex.com",)),
+    _spec("toutiao", "toutiao", "ToutiaoPlatform", ("www.toutiao.com",)),
+    _spec("netease-news", "netease_news", "NeteaseNewsPlatform", ("m.163.com",)),
+    _spec("ithome", "ithome", "IthomePlatform", ("m.ithome.com",)),
+    _spec("36kr", "platform_36kr", "Platform36kr", ("gateway.36kr.com",)),
+    _spec("douyin", "douyin", "DouyinPlatform", ("www.douyin.com", TOPHUB)),
+    _spec("qq-news", "qq_news", "QqNewsPlatform", ("r.inews.qq.com",)),
+    _spec("thepaper", "thepaper", "ThepaperPlatform", ("cache.thepaper.cn",)),
+    _spec("csdn", "csdn", "CsdnPlatform", ("blog.csdn.net",)),
+    _spec("acfun", "acfun", "AcfunPlatform", ("www.acfun.cn",)),
+    _spec("tieba", "tieba", "TiebaPlatform", ("tieba.baidu.com", TOPHUB)),
+    _spec("sspai", "sspai", "SspaiPlatform", ("sspai.com",)),
+    _spec("weread", "weread", "WereadPlatform", ("weread.qq.com",)),
+    _spec("hupu", "hupu", "HupuPlatform", ("m.hupu.com",)),
+    _spec("douban-group", "douban_group", "DoubanGroupPlatform", ("www.douban.com",)),
+    _spec("kuaishou", "kuaishou", "KuaishouPlatform", ("www.kuaishou.com",)),
+    _spec("sina-news", "sina_news", "SinaNewsPlatform", ("top.news.sina.com.cn", SINA)),
+    _spec("sina", "sina", "SinaPlatform", ("newsapp.sina.cn", SINA)),
+    _spec("huxiu", "huxiu", "HuxiuPlatform", ("moment-api.huxiu.com",)),
+    _spec("ifanr", "ifanr", "IfanrPlatform", ("sso.ifanr.com",)),
+    _spec("guokr", "guokr", "GuokrPlatform", ("www.guokr.com",)),
+    _spec("jianshu", "jianshu", "JianshuPlatform", ("www.jianshu.com",)),
+    _spec("52pojie", "platform_52pojie", "Platform52pojie", ("www.52pojie.cn",)),
+    _spec("github", "github", "GithubPlatform", ("github.com",)),
+    _spec("hackernews", "hackernews", "HackernewsPlatform", ("hacker-news.firebaseio.com",)),
+    _spec("ngabbs", "ngabbs", "NgabbsPlatform", ("ngabbs.com",)),
+    _spec("tophub-ai-brief", "tophub_ai_brief", "TopHubAIBriefPlatform", (TOPHUB, "idaily.today")),
+    _spec("wechat-hot", "wechat_hot", "WechatHotPlatform", (TOPHUB,)),
+    _spec("jiqizhixin", "jiqizhixin", "JiqizhixinPlatform", (TOPHUB,)),
+    _spec("qbitai", "qbitai", "QbitaiPlatform", (TOPHUB,)),
+    _spec("xueqiu", "xueqiu", "XueqiuPlatform", (TOPHUB,)),
+    _spec("taptap", "taptap", "TaptapPlatform", (TOPHUB,)),
+    _spec("oschina", "oschina", "OsChinaPlatform", (TOPHUB,)),
+    _spec("readhub", "readhub", "ReadhubPlatform", (TOPHUB,)),
+    _spec("jike", "jike", "JikePlatform", (TOPHUB,)),
+    _spec("zcool", "zcool", "ZcoolPlatform", (TOPHUB,)),
+    _spec("dongchedi", "dongchedi", "DongchediPlatform", (TOPHUB,)),
+    _spec("autohome", "autohome", "AutohomePlatform", (TOPHUB,)),
+]
+
+# 平台名称 -> 清单项
+MANIFEST: Dict[str, PlatformSpec] = {spec.name: spec for spec in PLATFORM_SPECS}
+
+
+def platform_hosts(name: str) -> Tuple[str, ...]:
+    """平台会访问的主机，不在清单中的平台返回空元组"""
+    spec: Optional[PlatformSpec] = MANIFEST.get(name)
+    return spec.hosts if spec is not None else ()
@@ -1,10 +1,10 @@
 """新浪新闻平台"""
 
-import json
 from datetime import datetime
 from typing import Dict, List, Any
 
 from .base_platform import BasePlatform
+from ..utils import json_utils
 from ..utils.time_utils import get_time
 
 
@@ -34,8 +34,8 @@ class SinaNewsPlatform(BasePlatform):
         
         if json_string.startswith("{") and json_string.endswith("}"):
             try:
-                return json.loads(json_string)
-            except json.JSONDecodeError as e:
+                return json_utils.loads(json_string)
+            except json_utils.JSONDecodeError as e:
                 raise ValueError(f"Failed to parse JSON: {e}")
         else:
             raise ValueError("Invalid JSON format")
@@ -1,10 +1,18 @@
 """百度贴吧平台"""
 
+import asyncio
+import subprocess
 from typing import Dict, List, Any
 
 from .base_platform import BasePlatform
+from ..utils import json_utils
+from ..utils.circuit_breaker import get_circuit_breakers
+from ..utils.hedging import Source
+from ..utils.http_replay import replay_mode
 from ..utils.time_utils import get_time
 
+TOPIC_LIST_URL = "https://tieba.baidu.com/hottopic/browse/topicList"
+
 
 class TiebaPlatform(BasePlatform):
     """百度贴吧平台"""
@@ -18,72 +26,91 @@ class TiebaPlatform(BasePlatform):
         self.link = "https://tieba.baidu.com/hottopic/browse/topicList"
         self.category = "社交媒体"
     
+    def sources(self, **kwargs) -> List[Source]:
+        """贴吧接口（aiohttp），curl / requests 访问同一接口，TopHub 贴吧热议榜作为最后的备用"""
+        sources = super().sources(**kwargs)
+        # 录制 / 回放时只走 HTTPClient，curl / requests 的请求无法录制和回放
+        if not replay_mode():
+            # curl / requests 在线程中运行，无法取消：只在前面的数据源失败、没有其他数据源运行时启动，
+            # 启动后也不对冲，避免被其他数据源抢先后线程和 curl 进程继续占用最长约 95 秒
+            sources.append(Source("curl", self.fetch_curl, hedge_after=0, failover_only=True))
+        sources.append(Source("tophub", self.fetch_tophub))
+        return sources
+    
     async def fetch(self, **kwargs) -> List[Dict[str, Any]]:
         """获取数据"""
-        url = "https://tieba.baidu.com/hottopic/browse/topicList"
+        # 为tieba平台使用更长的超时时间和特定的请求头
+        from aiohttp import ClientTimeout
+        timeout = ClientTimeout(total=60, connect=30)
         
-        # 尝试使用aiohttp，如果失败则使用requests作为备选
-        try:
-            # 为tieba平台使用更长的超时时间和特定的请求头
-            from aiohttp import ClientTimeout
-            timeout = ClientTimeout(total=60, connect=30)
-            
-            result = await self.http_client.get(
-                url=url,
-                headers={
-                    "Referer": "https://tieba.baidu.com/",
-                    "Accept": "application/json, text/plain, */*",
-                },
-                timeout=timeout
-            )
-        except Exception:
-            # 如果aiohttp失败，使用curl作为备选方案（因为curl可以正常访问）
-            import asyncio
-            import subprocess
-            import json
-            
-            def curl_fetch():
-                try:
-                    # 使用curl命令获取数据
-                    cmd = [
-                        'curl', '-s', '-m', '30',
-                        url,
-                        '-H', 'User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
-                        '-H', 'Referer: https://tieba.baidu.com/',
-                        '-H', 'Accept: application/json, text/plain, */*',
-                    ]
-                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=35)
-                    result.check_returncode()
-                    return json.loads(result.stdout)
-                except Exception as e:
-                    # 如果curl也失败，尝试使用requests
-                    import requests
-                    response = requests.get(
-                        url,
-                        headers={
-                            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
-                            "Referer": "https://tieba.baidu.com/",
-                            "Accept": "application/json, text/plain, */*",
-                        },
-                        timeout=(10, 60)  # (connect timeout, read timeout)
-                    )
-                    response.raise_for_status()
-                    return response.json()
-            
-            result = await asyncio.to_thread(curl_fetch)
-            
-        list_data = result.get("data", {}).get("bang_topic", {}).get("topic_list", [])
+        result = await self.http_client.get(
+            url=TOPIC_LIST_URL,
+            headers={
+                "Referer": "https://tieba.baidu.com/",
+                "Accept": "application/json, text/plain, */*",
+            },
+            timeout=timeout
+        )
+        return parse_topic_list(result)
+    
+    async def fetch_curl(self) -> List[Dict[str, Any]]:
+        """使用 curl 获取数据（aiohttp 访问失败时 curl 通常可以正常访问），curl 也失败时使用 requests"""
+        # 接口已熔断时直接失败，交给 TopHub 备用方案；curl 的结果不回报熔断器，不占用半开试探名额
+        get_circuit_breakers().check(TOPIC_LIST_URL, probe=False)
         
-        return [
-            {
-                "id": item.get("topic_id", ""),
-                "title": item.get("topic_name", ""),
-                "desc": item.get("topic_desc", ""),
-                "cover": item.get("topic_pic", ""),
-                "hot": item.get("discuss_num", 0),
-                "timestamp": get_time(item.get("create_time")),
-                "url": item.get("topic_url", ""),
-                "mobileUrl": item.get("topic_url", ""),
-            }
-            for item in list_data
-        ]
+        def curl_fetch():
+            try:
+                # 使用curl命令获取数据
+                cmd = [
+                    'curl', '-s', '-m', '30',
+                    TOPIC_LIST_URL,
+                    '-H', 'User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
+                    '-H', 'Referer: https://tieba.baidu.com/',
+                    '-H', 'Accept: application/json, text/plain, */*',
+                ]
+                result = subprocess.run(cmd, capture_output=True, timeout=35)
+                result.check_returncode()
+                return json_utils.loads(result.stdout)
+            except Exception as e:
+                # 如果curl也失败，尝试使用requests
+                import requests
+                response = requests.get(
+                    TOPIC_LIST_URL,
+                    headers={
+                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+                        "Referer": "https://tieba.baidu.com/",
+                        "Accept": "application/json, text/plain, */*",
+                    },
+                    timeout=(10, 60)  # (connect timeout, read timeout)
+                )
+                response.raise_for_status()
+                return response.json()
+        
+        # 在线程中运行，被取消（如超过平台采集时间上限）时线程里的 curl / requests 会继续跑完，但不再等待它
+        return parse_topic_list(await asyncio.to_thread(curl_fetch))
+    
+    async def fetch_tophub(self) -> List[Dict[str, Any]]:
+        """从 TopHub 获取百度贴吧热议榜数据"""
+        # 备用方案依赖 bs4，只在用到时导入
+        from ..utils.tophub_fallback import fetch_tieba_from_tophub
+        
+        return await fetch_tieba_from_tophub(self.http_client)
+
+
+def parse_topic_list(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """解析热议榜接口返回的数据"""
+    list_data = result.get("data", {}).get("bang_topic", {}).get("topic_list", [])
+    
+    return [
+        {
+            "id": item.get("topic_id", ""),
+            "title": item.get("topic_name", ""),
+            "desc": item.get("topic_desc", ""),
+            "cover": item.get("topic_pic", ""),
+            "hot": item.get("discuss_num", 0),
+            "timestamp": get_time(item.get("create_time")),
+            "url": item.get("topic_url", ""),
+            "mobileUrl": item.get("topic_url", ""),
+        }
+        for item in list_data
+    ]
@@ -1,11 +1,11 @@
 """TopHub 今日简报 • AI 平台"""
 
-import json
 import re
 from typing import Dict, List, Any
 from bs4 import BeautifulSoup
 
 from .base_platform import BasePlatform
+from ..utils import json_utils
 
 
 class TopHubAIBriefPlatform(BasePlatform):
@@ -37,12 +37,7 @@ class TopHubAIBriefPlatform(BasePlatform):
         )
         
         # 2. 提取hash值
-        soup = BeautifulSoup(html, 'html.parser')
-        ai_content = soup.find('div', id='ai-summary-content')
-        if not ai_content:
-            return []
-        
-        hash_value = ai_content.get('data-hash', '')
+        hash_value = await self.run_parser(find_brief_hash, html)
         if not hash_value:
             return []
         
@@ -74,61 +69,75 @@ class TopHubAIBriefPlatform(BasePlatform):
             # 移除JSONP包装
             if text.startswith(callback + '('):
                 json_str = text[len(callback) + 1:-1]  # 移除 callback( 和 )
-                api_data = json.loads(json_str)
+                api_data = json_utils.loads(json_str)
             else:
                 # 尝试匹配任何jQuery回调
                 match = re.match(r'jQuery\d+_\d+\((.*)\);?$', text)
                 if match:
                     json_str = match.group(1)
-                    api_data = json.loads(json_str)
+                    api_data = json_utils.loads(json_str)
                 else:
                     return []
             
             # 4. 解析HTML内容
-            result = []
-            if isinstance(api_data, list):
-                for item in api_data:
-                    if isinstance(item, dict) and 'html' in item:
-                        category_title = item.get('title', '')
-                        html_content = item['html']
-                        
-                        # 解析HTML，提取标题和内容
-                        soup = BeautifulSoup(html_content, 'html.parser')
-                        lis = soup.find_all('li')
-                        
-                        for idx, li in enumerate(lis):
-                            strong = li.find('strong')
-                            if strong:
-                                title = strong.get_text(strip=True)
-                                # 移除strong标签后获取剩余文本
-                                strong.extract()
-                                content = li.get_text(strip=True)
-                                # 去除content开头的冒号和空格
-                                if content.startswith('：'):
-                                    content = content[1:].strip()
-                                elif content.startswith(':'):
-                                    content = content[1:].strip()
-                            else:
-                                title = ""
-                                content = li.get_text(strip=True)
-                            
-                            # 生成唯一ID
-                            item_id = f"{hash_value}_{category_title}_{idx}"
-                            
-                            result.append({
-                                "id": item_id,
-                                "title": title,
-                                "desc": content,
-                                "cover": None,
-                                "author": None,
-                                "hot": None,
-                                "timestamp": None,
-                                "url": self.link,
-                                "mobileUrl": self.link,
-                            })
-            
-            return result
-            
+            return await self.run_parser(parse_brief, api_data, hash_value, self.link)
+        
         except Exception as e:
             # 如果API调用失败，返回空列表
             return []
+
+
+def find_brief_hash(html: str) -> str:
+    """从简报页面提取 AI 摘要的 hash（模块级纯函数，可在解析执行器中运行）"""
+    soup = BeautifulSoup(html, 'html.parser')
+    ai_content = soup.find('div', id='ai-summary-content')
+    if not ai_content:
+        return ""
+    return ai_content.get('data-hash', '')
+
+
+def parse_brief(api_data: Any, hash_value: str, link: str) -> List[Dict[str, Any]]:
+    """解析简报接口返回的各分类 HTML，提取标题和内容（模块级纯函数，可在解析执行器中运行）"""
+    result = []
+    if isinstance(api_data, list):
+        for item in api_data:
+            if isinstance(item, dict) and 'html' in item:
+                category_title = item.get('title', '')
+                html_content = item['html']
+                
+                # 解析HTML，提取标题和内容
+                soup = BeautifulSoup(html_content, 'html.parser')
+                lis = soup.find_all('li')
+                
+                for idx, li in enumerate(lis):
+                    strong = li.find('strong')
+                    if strong:
+                        title = strong.get_text(strip=True)
+                        # 移除strong标签后获取剩余文本
+                        strong.extract()
+                        content = li.get_text(strip=True)
+                        # 去除content开头的冒号和空格
+                        if content.startswith('：'):
+                            content = content[1:].strip()
+                        elif content.startswith(':'):
+                            content = content[1:].strip()
+                    else:
+                        title = ""
+                        content = li.get_text(strip=True)
+                    
+                    # 生成唯一ID
+                    item_id = f"{hash_value}_{category_title}_{idx}"
+                    
+                    result.append({
+                        "id": item_id,
+                        "title": title,
+                        "desc": content,
+                        "cover": None,
+                        "author": None,
+                        "hot": None,
+                        "timestamp": None,
+                        "url": link,
+                        "mobileUrl": link,
+                    })
+    
+    return result
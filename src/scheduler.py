@@ -0,0 +1,311 @@
+"""常驻调度 - 进程常驻，按平台各自的间隔轮询采集，每轮增量写入当天的分类文件"""
+
+import asyncio
+import os
+import random
+import signal
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+from loguru import logger
+
+from .cache.cache_manager import get_cache_manager
+from .data_collector import (
+    collect_platform,
+    extract_titles_to_csv,
+    load_category_files,
+    merge_category_results,
+    setup_logger,
+)
+from .platforms.registry import get_all_platforms
+from .utils import json_utils
+from .utils.adaptive_interval import POLL_ADAPTIVE, AdaptiveIntervals
+from .utils.adaptive_limiter import CONCURRENCY_ADAPTIVE, CONCURRENT_LIMIT, AdaptiveLimiter
+from .utils.http_client import close_shared_session
+from .utils.http_metrics import get_network_metrics
+from .utils.parse_executor import shutdown_parse_executor
+
+load_dotenv()
+
+# 默认轮询间隔（秒）
+POLL_INTERVAL = float(os.getenv("POLL_INTERVAL", "900"))
+# 每次间隔在 interval * (1 ± POLL_JITTER) 之间随机，避免所有平台同时请求
+POLL_JITTER = float(os.getenv("POLL_JITTER", "0.1"))
+# 启动时把首轮采集分散到多少秒内
+POLL_STARTUP_SPREAD = float(os.getenv("POLL_STARTUP_SPREAD", "30"))
+# 按平台覆盖轮询间隔（JSON），如 {"weibo": 60, "weread": 21600}
+POLL_INTERVALS = os.getenv("POLL_INTERVALS", "")
+# 收到退出信号后等待进行中的采集完成的时间（秒）
+SHUTDOWN_TIMEOUT = float(os.getenv("SHUTDOWN_TIMEOUT", "30"))
+
+# 各平台默认轮询间隔（秒），按平台的更新频率设置，未列出的平台使用 POLL_INTERVAL
+DEFAULT_INTERVALS = {
+    # 分钟级更新的实时榜单
+    "weibo": 60,
+    "baidu": 300,
+    "douyin": 300,
+    "toutiao": 300,
+    "zhihu": 300,
+    "bilibili": 600,
+    "kuaishou": 600,
+    "tieba": 600,
+    "hackernews": 600,
+    "thepaper": 600,
+    "netease-news": 600,
+    "qq-news": 600,
+    "sina-news": 600,
+    "ithome": 600,
+    "36kr": 600,
+    "xueqiu": 600,
+    # 变化缓慢的榜单
+    "github": 3600,
+    "douban-group": 3600,
+    "jianshu": 3600,
+    "tophub-ai-brief": 3600,
+    "douban-movie": 21600,
+    "weread": 21600,
+}
+
+
+def load_intervals() -> Dict[str, float]:
+    """默认轮询间隔与 POLL_INTERVALS 合并后的结果"""
+    intervals = {name: float(value) for name, value in DEFAULT_INTERVALS.items()}
+    if POLL_INTERVALS:
+        try:
+            overrides = json_utils.loads(POLL_INTERVALS)
+            intervals.update({name: float(value) for name, value in overrides.items()})
+        except (json_utils.JSONDecodeError, AttributeError, TypeError, ValueError) as e:
+            logger.warning(f"POLL_INTERVALS 配置无效，已忽略: {e}")
+    return intervals
+
+
+class PlatformScheduler:
+    """
+    平台轮询调度器
+    
+    平台实例、共享连接池和缓存在整个进程内复用。每个平台到期后进入一轮采集（同一时刻到期的
+    平台合并为一轮），采集完成后只改写涉及到的类别文件并重新生成 CSV，再按该平台的间隔加随机
+    抖动安排下一次采集。收到 SIGINT / SIGTERM 后不再开始新的采集，等待进行中的采集完成后退出。
+    
+    启用自适应间隔时，配置的间隔只作为初始值，之后按平台榜单实际的变化速度调整（见 AdaptiveIntervals）。
+    """
+    
+    def __init__(
+        self,
+        platforms: Optional[Dict[str, Any]] = None,
+        data_dir: Optional[str] = None,
+        concurrent_limit: int = CONCURRENT_LIMIT,
+        intervals: Optional[Dict[str, float]] = None,
+        default_interval: float = POLL_INTERVAL,
+        jitter: float = POLL_JITTER,
+        adaptive: bool = POLL_ADAPTIVE,
+    ):
+        """
+        初始化调度器
+        
+        Args:
+            platforms: 平台名称 -> 平台实例，默认为注册表中的所有平台
+            data_dir: 数据输出目录，默认为项目根目录下的 data
+            concurrent_limit: 同时采集的平台数
+            intervals: 平台名称 -> 轮询间隔（秒），默认为 DEFAULT_INTERVALS 与 POLL_INTERVALS 合并的结果
+            default_interval: 未配置间隔的平台使用的间隔（秒）
+            jitter: 间隔的随机抖动比例
+            adaptive: 是否按榜单的变化速度自动调整间隔
+        """
+        if data_dir is None:
+            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            data_dir = os.path.join(project_root, "data")
+        
+        self.platforms = platforms if platforms is not None else get_all_platforms()
+        self.data_dir = data_dir
+        self.concurrent_limit = concurrent_limit
+        self.intervals = intervals if intervals is not None else load_intervals()
+        self.default_interval = default_interval
+        self.jitter = jitter
+        self.adaptive = AdaptiveIntervals(self.intervals, default_interval) if adaptive else None
+        
+        # 平台名称 -> 下一次采集的时间（事件循环时间），采集进行中的平台不在其中
+        self.next_run: Dict[str, float] = {}
+        # 平台名称 -> 最近一次采集的状态，写入 scheduler_status.json
+        self.status: Dict[str, Dict[str, Any]] = {}
+        self._limiter: Optional[AdaptiveLimiter] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._ticks: set = set()
+    
+    def interval_for(self, platform_name: str) -> float:
+        """平台的轮询间隔（秒）"""
+        if self.adaptive is not None:
+            return self.adaptive.interval_for(platform_name)
+        return self.intervals.get(platform_name, self.default_interval)
+    
+    def next_delay(self, platform_name: str) -> float:
+        """距离下一次采集的时间：轮询间隔加随机抖动"""
+        interval = self.interval_for(platform_name)
+        return max(1.0, interval * (1 + random.uniform(-self.jitter, self.jitter)))
+    
+    def stop(self):
+        """请求退出：不再开始新的采集"""
+        if not self._stopping:
+            logger.info("收到退出信号，等待进行中的采集完成...")
+        self._stopping = True
+        if self._wake is not None:
+            self._wake.set()
+    
+    def _install_signal_handlers(self, loop: asyncio.AbstractEventLoop) -> List[int]:
+        installed = []
+        for sig in [signal.SIGINT, signal.SIGTERM]:
+            try:
+                loop.add_signal_handler(sig, self.stop)
+                installed.append(sig)
+            except (NotImplementedError, RuntimeError):
+                # Windows 不支持 add_signal_handler，Ctrl+C 时由 KeyboardInterrupt 退出
+                pass
+        return installed
+    
+    async def run(self):
+        """运行调度循环，直到收到退出信号"""
+        loop = asyncio.get_running_loop()
+        self._limiter = AdaptiveLimiter(initial=self.concurrent_limit)
+        if CONCURRENCY_ADAPTIVE:
+            get_network_metrics().add_listener(self._limiter.on_record)
+        self._wake = asyncio.Event()
+        self._stopping = False
+        installed = self._install_signal_handlers(loop)
+        
+        # 首轮采集分散到 POLL_STARTUP_SPREAD 秒内
+        now = loop.time()
+        for name in self.platforms:
+            spread = min(POLL_STARTUP_SPREAD, self.interval_for(name))
+            self.next_run[name] = now + random.uniform(0, spread)
+        
+        logger.info(f"常驻调度已启动: {len(self.platforms)} 个平台，并发 {self.concurrent_limit}")
+        try:
+            while not self._stopping:
+                now = loop.time()
+                due = [name for name, at in self.next_run.items() if at <= now]
+                if due:
+                    for name in due:
+                        del self.next_run[name]
+                    tick = asyncio.create_task(self._tick(due))
+                    self._ticks.add(tick)
+                    tick.add_done_callback(self._ticks.discard)
+                
+                timeout = min(self.next_run.values()) - loop.time() if self.next_run else None
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=max(0.0, timeout) if timeout is not None else None)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self._shutdown()
+            get_network_metrics().remove_listener(self._limiter.on_record)
+            for sig in installed:
+                loop.remove_signal_handler(sig)
+    
+    async def _shutdown(self):
+        """等待进行中的采集完成（超时则取消），然后关闭共享连接池和缓存"""
+        if self._ticks:
+            done, pending = await asyncio.wait(set(self._ticks), timeout=SHUTDOWN_TIMEOUT)
+            for tick in pending:
+                tick.cancel()
+            if pending:
+                logger.warning(f"{len(pending)} 轮采集未在 {SHUTDOWN_TIMEOUT:.0f} 秒内完成，已取消")
+                await asyncio.gather(*pending, return_exceptions=True)
+        await close_shared_session()
+        shutdown_parse_executor()
+        get_cache_manager().close()
+        logger.info("常驻调度已退出")
+    
+    async def _tick(self, names: List[str]):
+        """采集一轮到期的平台，增量写入结果并安排下一次采集"""
+        started = time.time()
+        try:
+            results = await asyncio.gather(
+                *(collect_platform(name, self.platforms[name], self._limiter, no_cache=True) for name in names),
+                return_exceptions=True,
+            )
+            
+            data: Dict[str, Any] = {"results": {}, "errors": {}}
+            for name, result in zip(names, results):
+                if isinstance(result, BaseException):
+                    data["errors"][name] = str(result)
+                elif result["success"]:
+                    data["results"][name] = result["data"]
+                else:
+                    data["errors"][name] = result["error"]
+            
+            if self.adaptive is not None:
+                for name, platform_data in data["results"].items():
+                    self.adaptive.observe(name, platform_data.get("data", []))
+            
+            self._write_outputs(data)
+            self._update_status(data, started)
+        except Exception as e:
+            logger.error(f"✗ 本轮采集异常（{', '.join(names)}）: {e}")
+        finally:
+            now = asyncio.get_running_loop().time()
+            for name in names:
+                self.next_run[name] = now + self.next_delay(name)
+            self._wake.set()
+    
+    def _write_outputs(self, data: Dict[str, Any]):
+        """合并本轮结果到分类文件，并根据当天全部分类文件重新生成 CSV"""
+        merged = merge_category_results(data, base_dir=self.data_dir)
+        if not merged:
+            return
+        extract_titles_to_csv(load_category_files(self.data_dir), base_dir=self.data_dir)
+        logger.info(
+            f"本轮采集: 成功 {len(data['results'])}，失败 {len(data['errors'])}，"
+            f"已更新类别: {', '.join(merged)}"
+        )
+    
+    def _update_status(self, data: Dict[str, Any], started: float):
+        """记录各平台最近一次采集的状态，保存到当天目录下的 scheduler_status.json"""
+        for name in list(data["results"]) + list(data["errors"]):
+            entry = self.status.setdefault(name, {"runs": 0, "failures": 0})
+            entry["runs"] += 1
+            entry["interval"] = round(self.interval_for(name), 1)
+            if self.adaptive is not None:
+                entry["last_change"] = self.adaptive.snapshot().get(name, {}).get("last_change")
+            entry["last_run"] = datetime.fromtimestamp(started).isoformat()
+            if name in data["results"]:
+                entry["last_success"] = entry["last_run"]
+                entry["items"] = data["results"][name].get("total", 0)
+                entry["error"] = None
+            else:
+                entry["failures"] += 1
+                entry["error"] = data["errors"][name]
+        
+        today = datetime.now().strftime("%Y-%m-%d")
+        output_dir = os.path.join(self.data_dir, today)
+        os.makedirs(output_dir, exist_ok=True)
+        filepath = os.path.join(output_dir, "scheduler_status.json")
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json_utils.dumps_bytes({
+                "updated": datetime.now().isoformat(),
+                "concurrency": self._limiter.limit,
+                "platforms": dict(sorted(self.status.items())),
+            }, indent=True))
+        os.replace(tmp_path, filepath)
+
+
+async def run_daemon(platforms: Optional[Dict[str, Any]] = None, data_dir: Optional[str] = None):
+    """以常驻模式运行采集，直到收到 SIGINT / SIGTERM"""
+    setup_logger()
+    await PlatformScheduler(platforms=platforms, data_dir=data_dir).run()
+
+
+def main():
+    """命令行入口：python -m src.scheduler"""
+    try:
+        asyncio.run(run_daemon())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""多进程分片采集 - 把平台分到多个子进程，各自运行事件循环和连接池，结果实时传回主进程"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+import queue
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from loguru import logger
+
+from .platforms.manifest import platform_hosts
+from .utils.circuit_breaker import get_circuit_breakers
+from .utils.http_metrics import get_network_metrics
+from .utils.http_replay import configure_replay, get_cassette, replay_mode, set_url_rewrite, url_rewrite
+from .utils.loop_monitor import merge_summaries
+from .utils.parse_executor import PARSE_EXECUTOR, PROCESS
+
+load_dotenv()
+
+# 采集进程数，1 表示在当前进程内采集
+COLLECT_WORKERS = int(os.getenv("COLLECT_WORKERS", "1"))
+# 到达截止时间后，等待子进程把已完成的结果和统计传回的时间（秒）
+SHARD_GRACE_PERIOD = 5.0
+# 主进程读取消息队列的轮询间隔（秒），同时用于检查子进程是否异常退出
+QUEUE_POLL_INTERVAL = 0.5
+
+LOG = "log"
+RESULT = "result"
+DONE = "done"
+
+
+def group_by_host(platform_names: List[str]) -> List[List[str]]:
+    """按清单中的主机把平台分组：直接或间接共用主机的平台在同一组（如所有经 TopHub 采集的平台）"""
+    parent = {name: name for name in platform_names}
+    
+    def find(name: str) -> str:
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+    
+    owners: Dict[str, str] = {}
+    for name in platform_names:
+        for host in platform_hosts(name):
+            if host in owners:
+                parent[find(name)] = find(owners[host])
+            else:
+                owners[host] = name
+    
+    groups: Dict[str, List[str]] = {}
+    for name in platform_names:
+        groups.setdefault(find(name), []).append(name)
+    return list(groups.values())
+
+
+def shard_platforms(platform_names: List[str], workers: int) -> List[List[str]]:
+    """
+    把平台分到 workers 个分片，去掉空分片
+    
+    共用主机的平台分到同一个分片，使按主机限流、熔断和连接复用在一个进程内生效，
+    不会因为分到多个进程而对同一主机成倍并发；各组按平台数从多到少依次分给平台最少的分片。
+    """
+    shards: List[List[str]] = [[] for _ in range(max(1, workers))]
+    for group in sorted(group_by_host(platform_names), key=len, reverse=True):
+        min(shards, key=len).extend(group)
+    return [shard for shard in shards if shard]
+
+
+def transport_settings() -> Dict[str, Any]:
+    """当前进程中的录制 / 回放与 URL 重写设置（可能是代码中设置的，子进程无法从环境变量得到）"""
+    cassette = get_cassette()
+    return {
+        "mode": replay_mode(),
+        "cassette_dir": cassette.cassette_dir,
+        "latency": cassette.latency,
+        "rewrite": url_rewrite(),
+    }
+
+
+def _shard_main(
+    index: int,
+    platform_names: List[str],
+    messages: multiprocessing.Queue,
+    concurrent_limit: int,
+    adaptive: bool,
+    ends_at: Optional[float],
+    transport: Dict[str, Any],
+    loop_monitor: bool,
+    no_cache: bool,
+):
+    """子进程入口：采集分到的平台，每完成一个平台发送一条结果，最后发送网络统计等汇总"""
+    # 子进程的日志通过队列交给主进程输出，和单进程运行时写到同一个控制台和日志文件
+    logger.remove()
+    logger.add(lambda message: messages.put((LOG, index, message.record["level"].name, message.record["message"])), level="DEBUG")
+    
+    if transport["mode"]:
+        configure_replay(transport["mode"], transport["cassette_dir"], transport["latency"])
+    set_url_rewrite(transport["rewrite"])
+    
+    from .data_collector import collect_all_platforms
+    from .platforms.registry import get_platform
+    from .utils.http_client import close_shared_session
+    from .utils.parse_executor import shutdown_parse_executor
+    
+    async def run() -> Dict[str, Any]:
+        try:
+            return await collect_all_platforms(
+                concurrent_limit=concurrent_limit,
+                platforms={name: get_platform(name) for name in platform_names},
+                adaptive=adaptive,
+                # 截止时间按墙钟时间换算，子进程启动的耗时也计算在内
+                deadline=max(0.001, ends_at - time.time()) if ends_at else None,
+                workers=1,
+                on_result=lambda result: messages.put((RESULT, index, result)),
+                loop_monitor=loop_monitor,
+                no_cache=no_cache,
+            )
+        finally:
+            await close_shared_session()
+            shutdown_parse_executor()
+    
+    data = asyncio.run(run())
+    messages.put((DONE, index, {
+        # 超过截止时间被取消或任务异常的平台没有单独的结果消息，在汇总中一并传回
+        "errors": data["errors"],
+        "timed_out": data["timed_out"],
+        "circuit_breakers": data["circuit_breakers"],
+        "concurrency": data["concurrency"],
+        "loop": data["loop"],
+        "records": list(get_network_metrics().records),
+    }))
+
+
+def _merge_concurrency(snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    合并各分片的并发数调整记录
+    
+    初始值、结束值和调整次数为各分片之和；各分片的最高 / 最低值不在同一时刻出现，相加没有意义，
+    peak / lowest 取单个分片中的最大 / 最小值。调整过程按分片保留。
+    """
+    merged = {
+        key: sum(snapshot[key] for snapshot in snapshots)
+        for key in ["initial", "final", "increases", "decreases"]
+    }
+    merged["peak"] = max(snapshot["peak"] for snapshot in snapshots)
+    merged["lowest"] = min(snapshot["lowest"] for snapshot in snapshots)
+    merged["trajectory"] = []
+    merged["shards"] = snapshots
+    return merged
+
+
+async def collect_sharded(
+    platform_names: List[str],
+    workers: int,
+    concurrent_limit: int,
+    adaptive: bool,
+    deadline: Optional[float] = None,
+    loop_monitor: bool = False,
+    no_cache: bool = False,
+) -> Dict[str, Any]:
+    """
+    多进程采集（返回值与 collect_all_platforms 相同）
+    
+    平台按主机分到 workers 个子进程（spawn 方式启动），每个子进程用自己的事件循环、连接池和并发限制
+    采集分到的平台，并发数按进程数平分。每完成一个平台就通过队列把结果传回主进程，解析等 CPU 密集
+    的工作分散到多个核心上。子进程异常退出时，其未完成的平台记为失败；到达截止时间后子进程自行
+    取消剩余平台，超过 SHARD_GRACE_PERIOD 仍未结束的子进程被终止。
+    
+    Args:
+        platform_names: 注册表中的平台名称
+        workers: 子进程数
+        concurrent_limit: 总并发数（各子进程平分）
+        adaptive: 是否自适应调整并发数
+        deadline: 采集截止时间（秒），None 或 0 表示不限制
+        loop_monitor: 是否在各子进程中监控事件循环（结果合并后返回）
+        no_cache: 是否跳过缓存
+    """
+    shards = shard_platforms(platform_names, workers)
+    per_shard_limit = max(1, math.ceil(concurrent_limit / len(shards)))
+    context = multiprocessing.get_context("spawn")
+    messages = context.Queue()
+    transport = transport_settings()
+    ends_at = time.time() + deadline if deadline else None
+    
+    processes = []
+    for index, names in enumerate(shards):
+        process = context.Process(
+            target=_shard_main,
+            args=(index, names, messages, per_shard_limit, adaptive, ends_at, transport, loop_monitor, no_cache),
+            name=f"collector-shard-{index}",
+            daemon=True,
+        )
+        process.start()
+        processes.append(process)
+    logger.info(f"已启动 {len(processes)} 个采集进程，每个进程并发 {per_shard_limit}")
+    if PARSE_EXECUTOR == PROCESS:
+        # 子进程是守护进程，不能再创建进程池
+        logger.info("多进程采集时子进程内的解析改用线程池执行（PARSE_EXECUTOR=process 不生效）")
+    
+    metrics = get_network_metrics()
+    metrics.reset()
+    loop = asyncio.get_running_loop()
+    stop_at = loop.time() + deadline + SHARD_GRACE_PERIOD if deadline else None
+    
+    all_results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    timed_out: List[str] = []
+    circuit_breakers = dict(get_circuit_breakers().snapshot())
+    concurrency: List[Dict[str, Any]] = []
+    loops: List[Dict[str, Any]] = []
+    finished = set()
+    
+    def handle(message: Tuple[Any, ...]):
+        """处理子进程发来的一条消息"""
+        kind, index = message[0], message[1]
+        if kind == LOG:
+            logger.log(message[2], message[3])
+        elif kind == RESULT:
+            result = message[2]
+            if result["success"]:
+                all_results[result["platform"]] = result["data"]
+            else:
+                errors[result["platform"]] = result["error"]
+        elif kind == DONE:
+            summary = message[2]
+            finished.add(index)
+            for name, error in summary["errors"].items():
+                errors.setdefault(name, error)
+            timed_out.extend(summary["timed_out"])
+            circuit_breakers.update(summary["circuit_breakers"])
+            concurrency.append(summary["concurrency"])
+            if summary["loop"]:
+                loops.append(summary["loop"])
+            metrics.records.extend(summary["records"])
+    
+    def drain():
+        """处理队列中已到达的全部消息"""
+        while True:
+            try:
+                handle(messages.get_nowait())
+            except queue.Empty:
+                break
+    
+    # 已退出但还没收到汇总的正常退出（exitcode=0）进程，多等一个轮询周期
+    exited = set()
+    try:
+        while len(finished) < len(shards):
+            timeout = QUEUE_POLL_INTERVAL
+            if stop_at is not None:
+                timeout = min(timeout, stop_at - loop.time())
+                if timeout <= 0:
+                    break
+            try:
+                message = await loop.run_in_executor(None, messages.get, True, timeout)
+            except queue.Empty:
+                dead = [
+                    index for index, process in enumerate(processes)
+                    if index not in finished and not process.is_alive()
+                ]
+                if not dead:
+                    continue
+                # 子进程可能刚发出汇总就退出，汇总还在管道中：先取完队列里剩余的消息再判断
+                drain()
+                for index in dead:
+                    if index in finished:
+                        continue
+                    exitcode = processes[index].exitcode
+                    if exitcode == 0 and index not in exited:
+                        exited.add(index)
+                        continue
+                    # 进程已退出却没有发送汇总，说明子进程异常退出
+                    logger.error(f"✗ 采集进程 {index} 异常退出（exitcode={exitcode}）")
+                    finished.add(index)
+                continue
+            
+            handle(message)
+    finally:
+        # 到达截止时间时队列中可能还有截止前完成的平台的结果，终止子进程前先取出
+        drain()
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join(timeout=5)
+        messages.close()
+    
+    # 没有结果的平台：到达截止时间的记为超时，其余是子进程异常退出
+    for name in platform_names:
+        if name in all_results or name in errors:
+            continue
+        if stop_at is not None and loop.time() >= stop_at:
+            timed_out.append(name)
+            errors[name] = f"超时：超过运行截止时间 {deadline:.0f} 秒，未完成"
+        else:
+            errors[name] = "采集进程异常退出，未完成"
+    
+    return {
+        "results": all_results,
+        "errors": errors,
+        "timed_out": sorted(timed_out),
+        "circuit_breakers": dict(sorted(circuit_breakers.items())),
+        "network": metrics.summary(),
+        "concurrency": _merge_concurrency(concurrency) if concurrency else {},
+        "loop": merge_summaries(loops),
+    }
@@ -0,0 +1,207 @@
+"""自适应轮询间隔 - 根据各平台榜单实际的变化速度调整下一次轮询间隔，学习结果跨运行持久化"""
+
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from dotenv import load_dotenv
+
+from ..cache.cache_manager import CACHE_DIR
+
+load_dotenv()
+
+# 是否启用自适应间隔
+POLL_ADAPTIVE = os.getenv("POLL_ADAPTIVE", "1") not in ["0", "false", "False"]
+# 自适应间隔的上下限（秒）
+POLL_MIN_INTERVAL = float(os.getenv("POLL_MIN_INTERVAL", "30"))
+POLL_MAX_INTERVAL = float(os.getenv("POLL_MAX_INTERVAL", "43200"))
+# 期望每次轮询看到的条目变化比例：变化越快间隔越短，使每次轮询大约看到这么多新条目
+POLL_TARGET_CHANGE = float(os.getenv("POLL_TARGET_CHANGE", "0.2"))
+# 变化速度的指数平滑系数（0-1，越大越看重最近一次观察）
+POLL_ADAPT_SMOOTHING = float(os.getenv("POLL_ADAPT_SMOOTHING", "0.3"))
+POLL_STATE_FILE = os.getenv("POLL_STATE_FILE", os.path.join(CACHE_DIR, "poll_intervals.json"))
+
+# 单次调整的最大倍数，避免一次异常观察让间隔大幅跳变
+MAX_STEP = 2.0
+
+
+def item_keys(items: Iterable[Dict[str, Any]]) -> set:
+    """条目标识：标题优先（部分平台的 id 是排名序号），没有标题时用 id / url；忽略排名顺序"""
+    keys = set()
+    for item in items:
+        key = str(item.get("title") or "").strip() or str(item.get("id") or "") or str(item.get("url") or "")
+        if key:
+            keys.add(key)
+    return keys
+
+
+def change_ratio(previous: set, current: set) -> float:
+    """两次结果之间变化的比例（1 - Jaccard 相似度）"""
+    union = previous | current
+    if not union:
+        return 0.0
+    return 1 - len(previous & current) / len(union)
+
+
+class PlatformChangeRate:
+    """单个平台的变化速度与当前轮询间隔"""
+    
+    def __init__(self, base: float, interval: float, rate: Optional[float] = None):
+        # 学习开始时配置的初始间隔（秒），配置变化后据此丢弃旧的学习结果
+        self.base = base
+        self.interval = interval
+        # 每秒变化的条目比例（指数平滑）；None 表示尚无观察
+        self.rate = rate
+        self.last_change: Optional[float] = None
+        self._keys: Optional[set] = None
+        self._seen_at: Optional[float] = None
+    
+    def observe(
+        self,
+        keys: set,
+        now: float,
+        min_interval: float,
+        max_interval: float,
+        target_change: float,
+        smoothing: float,
+    ) -> float:
+        """记录一次采集结果，返回调整后的轮询间隔"""
+        previous, seen_at = self._keys, self._seen_at
+        self._keys, self._seen_at = keys, now
+        if previous is None or seen_at is None or now <= seen_at:
+            return self.interval
+        
+        change = change_ratio(previous, keys)
+        self.last_change = change
+        sample = change / (now - seen_at)
+        self.rate = sample if self.rate is None else smoothing * sample + (1 - smoothing) * self.rate
+        
+        # 没有变化时间隔加倍；否则取使每次轮询约看到 target_change 变化的间隔
+        target = self.interval * MAX_STEP if self.rate <= 0 else target_change / self.rate
+        target = min(max(target, self.interval / MAX_STEP), self.interval * MAX_STEP)
+        self.interval = min(max(target, min_interval), max_interval)
+        return self.interval
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """导出状态"""
+        return {
+            "base": self.base,
+            "interval": round(self.interval, 1),
+            "rate": self.rate,
+            "last_change": None if self.last_change is None else round(self.last_change, 3),
+        }
+
+
+class AdaptiveIntervals:
+    """
+    自适应轮询间隔
+    
+    比较同一平台相邻两次采集结果的条目（标题 / id），按变化比例除以间隔时间估计变化速度，
+    再把下一次间隔调整为 目标变化比例 / 变化速度，限制在 [min_interval, max_interval] 之内。
+    变化快的榜单（微博、抖音、百度）间隔逐渐缩短，几乎不变的榜单（豆瓣电影、微信读书）逐渐拉长。
+    """
+    
+    def __init__(
+        self,
+        base_intervals: Dict[str, float],
+        default_interval: float,
+        min_interval: float = POLL_MIN_INTERVAL,
+        max_interval: float = POLL_MAX_INTERVAL,
+        target_change: float = POLL_TARGET_CHANGE,
+        smoothing: float = POLL_ADAPT_SMOOTHING,
+        state_file: Optional[str] = POLL_STATE_FILE,
+    ):
+        """
+        初始化
+        
+        Args:
+            base_intervals: 平台名称 -> 初始轮询间隔（秒），尚无学习结果时使用
+            default_interval: 未配置初始间隔的平台使用的间隔（秒）
+            min_interval: 间隔下限（秒）
+            max_interval: 间隔上限（秒）
+            target_change: 期望每次轮询看到的变化比例
+            smoothing: 变化速度的平滑系数
+            state_file: 学习结果的保存路径，None 表示不持久化
+        """
+        self.base_intervals = base_intervals
+        self.default_interval = default_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_change = target_change
+        self.smoothing = smoothing
+        self.state_file = state_file
+        self._platforms: Dict[str, PlatformChangeRate] = {}
+        self._load()
+    
+    def _base_interval(self, platform_name: str) -> float:
+        """平台配置的初始间隔（秒）"""
+        return float(self.base_intervals.get(platform_name, self.default_interval))
+    
+    def _load(self):
+        """
+        从状态文件恢复学习到的间隔与变化速度
+        
+        保存时的初始间隔与当前配置（POLL_INTERVALS / DEFAULT_INTERVALS / POLL_INTERVAL）不同的平台，
+        或没有记录初始间隔的旧状态，丢弃学习结果，从新配置的间隔重新开始。
+        """
+        if not self.state_file:
+            return
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        for name, item in saved.items():
+            if not isinstance(item, dict) or not item.get("interval"):
+                continue
+            base = self._base_interval(name)
+            if item.get("base") != base:
+                continue
+            interval = min(max(float(item["interval"]), self.min_interval), self.max_interval)
+            self._platforms[name] = PlatformChangeRate(base, interval, item.get("rate"))
+    
+    def _save(self):
+        """写回状态文件（先写临时文件再替换）"""
+        if not self.state_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except OSError:
+            pass
+    
+    def _platform(self, platform_name: str) -> PlatformChangeRate:
+        platform = self._platforms.get(platform_name)
+        if platform is None:
+            base = self._base_interval(platform_name)
+            platform = PlatformChangeRate(base, min(max(base, self.min_interval), self.max_interval))
+            self._platforms[platform_name] = platform
+        return platform
+    
+    def interval_for(self, platform_name: str) -> float:
+        """平台当前的轮询间隔（秒）"""
+        return self._platform(platform_name).interval
+    
+    def observe(self, platform_name: str, items: List[Dict[str, Any]], now: Optional[float] = None) -> float:
+        """记录平台一次成功采集的条目，返回调整后的轮询间隔"""
+        platform = self._platform(platform_name)
+        previous = platform.interval
+        interval = platform.observe(
+            item_keys(items),
+            time.monotonic() if now is None else now,
+            self.min_interval,
+            self.max_interval,
+            self.target_change,
+            self.smoothing,
+        )
+        if interval != previous:
+            self._save()
+        return interval
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """导出所有平台的间隔与变化速度"""
+        return {name: platform.to_dict() for name, platform in sorted(self._platforms.items())}
@@ -0,0 +1,212 @@
+"""自适应并发限制 - AIMD（加性增、乘性减），替代固定的 Semaphore 控制同时采集的平台数"""
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 初始并发数（同时采集的平台数）
+CONCURRENT_LIMIT = int(os.getenv("CONCURRENT_LIMIT", "10"))
+# 是否按网络状况自动调整并发数；关闭时固定为 CONCURRENT_LIMIT
+CONCURRENCY_ADAPTIVE = os.getenv("CONCURRENCY_ADAPTIVE", "1") not in ["0", "false", "False"]
+# 并发数的上下限
+CONCURRENCY_MIN = int(os.getenv("CONCURRENCY_MIN", "2"))
+CONCURRENCY_MAX = int(os.getenv("CONCURRENCY_MAX", "50"))
+# 超时或 429 时并发数乘以该系数
+CONCURRENCY_DECREASE = float(os.getenv("CONCURRENCY_DECREASE", "0.5"))
+# 请求耗时超过该主机最快耗时的多少倍时认为网络已拥塞，停止增加并发
+CONCURRENCY_LATENCY_FACTOR = float(os.getenv("CONCURRENCY_LATENCY_FACTOR", "3"))
+
+# 耗时比例的指数平滑系数
+LATENCY_SMOOTHING = 0.2
+# 最多保留的调整记录数
+MAX_TRAJECTORY = 500
+
+INCREASE = "increase"
+TIMEOUT = "timeout"
+RATE_LIMITED = "429"
+
+
+def is_congestion_signal(record: Dict[str, Any]) -> Optional[str]:
+    """
+    请求记录是否说明上游或网络已过载：超时返回 "timeout"，429 返回 "429"，否则返回 None
+    
+    本地排队造成的超时（记录中 local_timeout 为 True）不说明上游拥塞，不计入。
+    """
+    if record.get("status") == 429:
+        return RATE_LIMITED
+    if "Timeout" in (record.get("error") or "") and not record.get("local_timeout"):
+        return TIMEOUT
+    return None
+
+
+class AdaptiveLimiter:
+    """
+    AIMD 并发限制
+    
+    用法与 asyncio.Semaphore 相同（async with limiter），上限随网络状况变化：
+        - 每完成 limit 个健康的请求（无错误、耗时未超过该主机最快耗时的 latency_factor 倍），上限加 1
+        - 出现上游超时或 429 时上限乘以 decrease（本地排队造成的超时不计入）；在上一次减少之前发出的请求不再触发减少，
+          避免同一波拥塞让上限连续减半
+        - 其余错误（5xx、连接失败等）和耗时变慢只暂停增加
+    请求结果通过 on_record 接收，注册为 NetworkMetrics 的回调。
+    """
+    
+    def __init__(
+        self,
+        initial: int = CONCURRENT_LIMIT,
+        min_limit: int = CONCURRENCY_MIN,
+        max_limit: int = CONCURRENCY_MAX,
+        decrease: float = CONCURRENCY_DECREASE,
+        latency_factor: float = CONCURRENCY_LATENCY_FACTOR,
+    ):
+        """
+        初始化
+        
+        Args:
+            initial: 初始并发数
+            min_limit: 并发数下限
+            max_limit: 并发数上限
+            decrease: 乘性减少的系数
+            latency_factor: 耗时比例超过该值时暂停增加
+        """
+        self.min_limit = max(1, min(min_limit, initial))
+        self.max_limit = max(max_limit, initial)
+        self.initial = initial
+        self.limit = initial
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._started = time.perf_counter()
+        self._last_decrease = self._started
+        self._healthy = 0
+        # 主机 -> 最快的请求耗时；以及所有请求 耗时 / 最快耗时 的平滑值
+        self._fastest: Dict[str, float] = {}
+        self._latency_ratio = 1.0
+        
+        self.peak = initial
+        self.lowest = initial
+        self.increases = 0
+        self.decreases = 0
+        self.trajectory: Deque[Dict[str, Any]] = deque(maxlen=MAX_TRAJECTORY)
+    
+    @property
+    def in_flight(self) -> int:
+        """正在进行的任务数"""
+        return self._in_flight
+    
+    def _wake(self):
+        """按上限唤醒等待的任务"""
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+    
+    async def acquire(self):
+        """获取一个并发名额，达到上限时排队等待"""
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # 已分到名额后才被取消时归还名额
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+    
+    def release(self):
+        """归还名额"""
+        self._in_flight -= 1
+        self._wake()
+    
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self.release()
+    
+    def _set_limit(self, limit: int, reason: str):
+        """调整上限并记录"""
+        if limit == self.limit:
+            return
+        self.limit = limit
+        self.peak = max(self.peak, limit)
+        self.lowest = min(self.lowest, limit)
+        self.trajectory.append({
+            "t": round(time.perf_counter() - self._started, 3),
+            "limit": limit,
+            "reason": reason,
+            "in_flight": self._in_flight,
+        })
+        self._wake()
+    
+    def on_record(self, record: Dict[str, Any]):
+        """接收一条请求记录（NetworkMetrics 回调），按结果调整上限"""
+        now = time.perf_counter()
+        signal = is_congestion_signal(record)
+        if signal is not None:
+            self._healthy = 0
+            # 上一次减少之前发出的请求反映的是减少之前的拥塞，不再重复减少
+            if now - record["total"] < self._last_decrease:
+                return
+            self._last_decrease = now
+            self.decreases += 1
+            self._set_limit(max(self.min_limit, math.floor(self.limit * self.decrease)), signal)
+            return
+        
+        if record.get("error") or (record.get("status") or 0) >= 500:
+            self._healthy = 0
+            return
+        
+        total = record["total"]
+        host = record.get("host", "")
+        fastest = min(self._fastest.get(host, total), total)
+        self._fastest[host] = fastest
+        ratio = total / fastest if fastest > 0 else 1.0
+        self._latency_ratio = LATENCY_SMOOTHING * ratio + (1 - LATENCY_SMOOTHING) * self._latency_ratio
+        if self._latency_ratio > self.latency_factor:
+            self._healthy = 0
+            return
+        
+        self._healthy += 1
+        if self._healthy >= self.limit and self.limit < self.max_limit:
+            self._healthy = 0
+            self.increases += 1
+            self._set_limit(self.limit + 1, INCREASE)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """导出调整过程"""
+        return {
+            "initial": self.initial,
+            "final": self.limit,
+            "peak": self.peak,
+            "lowest": self.lowest,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "trajectory": list(self.trajectory),
+        }
+
+
+def format_trajectory(trajectory: List[Dict[str, Any]], initial: int, max_steps: int = 30) -> str:
+    """把调整过程格式化为一行，如 10 → 11 → 12 → 6(429) → 7；超过 max_steps 步时省略中间部分"""
+    steps = [str(initial)] + [
+        f"{step['limit']}" if step["reason"] == INCREASE else f"{step['limit']}({step['reason']})"
+        for step in trajectory
+    ]
+    if len(steps) > max_steps:
+        half = max_steps // 2
+        steps = steps[:half] + ["…"] + steps[-half:]
+    return " → ".join(steps)
@@ -0,0 +1,272 @@
+"""熔断器 - 按主机/接口快速跳过已知不可用的上游，状态跨运行持久化"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Any, Set
+from urllib.parse import urlsplit
+
+import aiohttp
+from dotenv import load_dotenv
+
+from ..cache.cache_manager import CACHE_DIR
+
+try:
+    import fcntl
+except ImportError:
+    # Windows 没有 fcntl，保存状态文件时不加锁（只有多进程采集会并发写入）
+    fcntl = None
+
+load_dotenv()
+
+# 是否启用熔断
+CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER", "1") not in ["0", "false", "False"]
+# 连续失败多少次后打开熔断器
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+# 熔断器打开后多久（秒）进入半开状态，放行请求试探上游是否恢复
+CIRCUIT_RECOVERY_TIMEOUT = float(os.getenv("CIRCUIT_RECOVERY_TIMEOUT", "300"))
+CIRCUIT_STATE_FILE = os.getenv("CIRCUIT_STATE_FILE", os.path.join(CACHE_DIR, "circuit_breakers.json"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """熔断器处于打开状态，请求未发出"""
+    
+    def __init__(self, key: str, retry_in: float):
+        super().__init__(f"熔断器已打开，跳过请求: {key}（{retry_in:.0f} 秒后重试）")
+        self.key = key
+        self.retry_in = retry_in
+
+
+def is_circuit_failure(error: BaseException) -> bool:
+    """判断错误是否说明上游不可用：连接失败、超时、429 和 5xx；其余 4xx 说明上游仍在响应"""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+class CircuitBreaker:
+    """单个接口的熔断器（closed -> open -> half_open -> closed）"""
+    
+    def __init__(
+        self,
+        key: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        recovery_timeout: float = CIRCUIT_RECOVERY_TIMEOUT,
+        state: str = CLOSED,
+        failures: int = 0,
+        opened_at: Optional[float] = None,
+    ):
+        self.key = key
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = state
+        self.failures = failures
+        self.opened_at = opened_at
+        # 半开状态下是否已有试探请求在进行（只在进程内有效，不持久化）
+        self.probe_in_flight = False
+    
+    def allow_request(self, probe: bool = True) -> bool:
+        """
+        是否放行请求
+        
+        打开状态超过 recovery_timeout 后转为半开；半开时只放行一个试探请求，其余请求在试探结束
+        （record_success / record_failure / release_probe）前都被拒绝，避免恢复中的上游瞬间承受全部负载。
+        
+        Args:
+            probe: 放行时是否占用试探名额；False 只查询是否处于熔断，不改变状态（用于不经过 HTTPClient、
+                不会回报结果的请求）
+        """
+        if self.state == OPEN:
+            if time.time() - (self.opened_at or 0) < self.recovery_timeout:
+                return False
+            if not probe:
+                return True
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            if self.probe_in_flight:
+                return False
+            if probe:
+                self.probe_in_flight = True
+        return True
+    
+    def retry_in(self) -> float:
+        """距离进入半开状态还有多少秒"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.time() - (self.opened_at or 0)))
+    
+    def record_success(self) -> bool:
+        """记录成功，返回状态是否发生变化"""
+        changed = self.state != CLOSED or self.failures != 0
+        self.probe_in_flight = False
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        return changed
+    
+    def record_failure(self):
+        """记录失败，连续失败达到阈值或半开试探失败时打开熔断器"""
+        self.failures += 1
+        self.probe_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = time.time()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """导出状态"""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opened_at": self.opened_at,
+        }
+
+
+@contextmanager
+def _file_lock(path: str):
+    """进程间文件锁（没有 fcntl 时不加锁）"""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class CircuitBreakerRegistry:
+    """
+    熔断器注册表，状态保存在缓存目录下的 JSON 文件中
+    
+    多进程采集时每个进程各有一个注册表：保存时加文件锁并重新读取状态文件，只写入本进程改动过的接口，
+    其他进程保存的熔断器不会被覆盖。
+    """
+    
+    def __init__(self, state_file: str = CIRCUIT_STATE_FILE):
+        self.state_file = state_file
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        # 上次保存之后本进程改动过的接口
+        self._changed: Set[str] = set()
+        self._lock = threading.Lock()
+        self._load()
+    
+    def _read(self) -> Dict[str, Any]:
+        """读取状态文件，不存在或损坏时返回空字典"""
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return saved if isinstance(saved, dict) else {}
+    
+    def _load(self):
+        """从状态文件恢复熔断器"""
+        for key, item in self._read().items():
+            if isinstance(item, dict):
+                self._breakers[key] = CircuitBreaker(
+                    key,
+                    state=item.get("state", CLOSED),
+                    failures=item.get("failures", 0),
+                    opened_at=item.get("opened_at"),
+                )
+    
+    def _save(self):
+        """按接口合并写回状态文件（先写临时文件再替换，避免写到一半被读取）"""
+        with self._lock:
+            changed = self._changed
+            self._changed = set()
+            updates = {key: self._breakers[key].to_dict() if key in self._breakers else None for key in changed}
+        if not updates:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+            with _file_lock(f"{self.state_file}.lock"):
+                saved = self._read()
+                for key, item in updates.items():
+                    if item is None:
+                        saved.pop(key, None)
+                    else:
+                        saved[key] = item
+                tmp_file = f"{self.state_file}.{os.getpid()}.tmp"
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(dict(sorted(saved.items())), f, ensure_ascii=False, indent=2)
+                os.replace(tmp_file, self.state_file)
+        except OSError:
+            # 写入失败时保留改动记录，下次保存时重试
+            with self._lock:
+                self._changed.update(changed)
+    
+    @staticmethod
+    def key_for(url: str) -> str:
+        """熔断键：主机 + 路径（不含查询参数）"""
+        parts = urlsplit(url)
+        return f"{parts.hostname or ''}{parts.path or '/'}"
+    
+    def check(self, url: str, probe: bool = True):
+        """
+        请求前检查，熔断器打开（或半开且已有试探请求）时抛出 CircuitOpenError
+        
+        probe=True 时放行的请求可能成为半开状态下的试探请求，请求结束后必须调用 record_success、
+        record_failure 或 release_probe 之一；不回报结果的请求应传 probe=False。
+        """
+        with self._lock:
+            breaker = self._breakers.get(self.key_for(url))
+            if breaker is None or breaker.allow_request(probe):
+                return
+        raise CircuitOpenError(breaker.key, breaker.retry_in())
+    
+    def record_success(self, url: str):
+        """记录请求成功；熔断器恢复为 closed 后不再保留，注册表只记录出过问题的接口"""
+        key = self.key_for(url)
+        with self._lock:
+            breaker = self._breakers.pop(key, None)
+            changed = breaker is not None and breaker.record_success()
+            if changed:
+                self._changed.add(key)
+        if changed:
+            self._save()
+    
+    def record_failure(self, url: str):
+        """记录请求失败"""
+        key = self.key_for(url)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(key)
+                self._breakers[key] = breaker
+            breaker.record_failure()
+            self._changed.add(key)
+        self._save()
+    
+    def release_probe(self, url: str):
+        """请求既没有成功也没有失败（被取消、解析出错等）时释放试探名额，状态不变"""
+        with self._lock:
+            breaker = self._breakers.get(self.key_for(url))
+            if breaker is not None:
+                breaker.probe_in_flight = False
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """导出所有有失败记录的熔断器状态"""
+        with self._lock:
+            return {key: breaker.to_dict() for key, breaker in sorted(self._breakers.items())}
+
+
+# 进程级共享注册表
+_shared_registry: Optional[CircuitBreakerRegistry] = None
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """获取共享的熔断器注册表"""
+    global _shared_registry
+    
+    if _shared_registry is None:
+        _shared_registry = CircuitBreakerRegistry()
+    return _shared_registry
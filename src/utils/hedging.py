@@ -0,0 +1,123 @@
+"""备用数据源 - 按优先级尝试平台的多个数据源，超过延迟阈值时对冲启动下一个，取第一个有效结果"""
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 当前数据源超过该时间（秒）仍未返回时启动下一个数据源，0 表示不对冲，只在失败后依次尝试
+HEDGE_DELAY = float(os.getenv("HEDGE_DELAY", "3"))
+
+# 平台自身接口的数据源名称
+PRIMARY = "primary"
+
+
+class Source(NamedTuple):
+    """数据源"""
+    
+    name: str
+    # 无参数的协程函数，返回数据列表；抛出异常或返回空列表都视为失败
+    fetch: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    # 该数据源启动后多久（秒）仍未返回时对冲启动下一个，None 表示使用 HEDGE_DELAY，<= 0 表示不对冲
+    hedge_after: Optional[float] = None
+    # 只在没有其他数据源运行时（前面的都已失败）启动，对冲时跳过；用于无法取消的数据源（如线程中的 curl）
+    failover_only: bool = False
+
+
+async def first_valid(sources: Sequence[Source], hedge_delay: float = HEDGE_DELAY) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    按顺序尝试数据源，返回第一个有效结果
+    
+    - 没有数据源在运行时（刚开始或已启动的都失败了），按优先级启动下一个数据源
+    - 最近启动的数据源超过对冲延迟仍未返回时，对冲启动下一个（跳过 failover_only 的数据源），
+      已启动的继续运行，先返回有效数据的胜出
+    - 数据源失败（抛出异常或返回空列表）而其他数据源仍在运行时，不立即启动新的数据源，只重新计时对冲，
+      避免一个快速失败就让整条链同时运行
+    - 拿到有效数据后取消其余仍在运行的数据源
+    
+    数据源在当前任务的上下文中运行（current_platform 等保持不变），调用方被取消时一并取消。
+    
+    Args:
+        sources: 按优先级排列的数据源
+        hedge_delay: 默认的对冲延迟（秒），数据源未指定 hedge_after 时使用，<= 0 表示不对冲
+    
+    Returns:
+        (数据源名称, 数据列表)；没有数据源返回有效数据时，有数据源抛出异常则抛出第一个异常，
+        否则返回最后一个数据源的空结果
+    """
+    if not sources:
+        return PRIMARY, []
+    
+    loop = asyncio.get_running_loop()
+    # 尚未启动的数据源（按优先级）
+    pending = list(range(len(sources)))
+    running: Dict[asyncio.Future, int] = {}
+    errors: List[Exception] = []
+    empty_name = sources[-1].name
+    hedge_at: Optional[float] = None
+    
+    def arm(source: Source):
+        """从现在起按 source 的对冲延迟计时（已有更早的计时则保留）"""
+        nonlocal hedge_at
+        delay = hedge_delay if source.hedge_after is None else source.hedge_after
+        if delay <= 0:
+            return
+        at = loop.time() + delay
+        hedge_at = at if hedge_at is None else min(hedge_at, at)
+    
+    def launch(index: int):
+        nonlocal hedge_at
+        pending.remove(index)
+        running[asyncio.ensure_future(sources[index].fetch())] = index
+        hedge_at = None
+        arm(sources[index])
+    
+    def next_hedge() -> Optional[int]:
+        return next((index for index in pending if not sources[index].failover_only), None)
+    
+    try:
+        while running or pending:
+            if not running:
+                # 没有数据源在运行：按优先级切换到下一个
+                launch(pending[0])
+                continue
+            
+            timeout = None
+            if hedge_at is not None and next_hedge() is not None:
+                timeout = max(0.0, hedge_at - loop.time())
+            done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                # 超过对冲延迟：启动下一个可对冲的数据源，当前的继续等待
+                launch(next_hedge())
+                continue
+            
+            failed: Optional[Source] = None
+            # 同时完成时按优先级取结果
+            for task in sorted(done, key=running.get):
+                source = sources[running.pop(task)]
+                try:
+                    data = task.result()
+                except Exception as e:
+                    errors.append(e)
+                    failed = source
+                    continue
+                if data:
+                    return source.name, data
+                empty_name = source.name
+                failed = source
+            
+            # 其他数据源仍在运行：不立即启动下一个，只重新计时对冲
+            if failed is not None and running:
+                arm(failed)
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+    
+    if errors:
+        raise errors[0]
+    return empty_name, []
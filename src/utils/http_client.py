@@ -1,26 +1,42 @@
 """HTTP 客户端封装"""
 
 import asyncio
+import codecs
 import hashlib
 import json
 import os
-from typing import Dict, Optional, Any
+import re
+import time
+from contextlib import nullcontext
+from typing import Awaitable, Callable, Dict, Optional, Any, NamedTuple, Tuple
 from urllib.parse import urlencode
 
 import aiohttp
-import chardet
 from aiohttp import ClientTimeout
 
 from dotenv import load_dotenv
 
+from ..cache.cache_manager import CacheManager, CACHE_DIR
+from . import json_utils
+from .circuit_breaker import CIRCUIT_BREAKER_ENABLED, get_circuit_breakers, is_circuit_failure
+from .http_metrics import create_trace_config, get_network_metrics, mark, new_request_trace
+from .http_replay import REPLAY, open_response, replay_mode
+from .rate_limiter import get_host_limiter
+from .retry_policy import RetryPolicy
+
+try:
+    from aiohttp.compression_utils import HAS_BROTLI
+except ImportError:
+    HAS_BROTLI = False
+
 load_dotenv()
 
-# 默认请求头
+# 默认请求头（aiohttp 能解压 brotli 时才声明支持 br，解压统一交给 aiohttp 按 Content-Encoding 处理）
 DEFAULT_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
     "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-    "Accept-Encoding": "gzip, deflate, br",
+    "Accept-Encoding": "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate",
     "Connection": "keep-alive",
     "Upgrade-Insecure-Requests": "1",
 }
@@ -28,27 +44,142 @@ DEFAULT_HEADERS = {
 REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "30"))
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
 
+# 连接池配置（所有平台共享同一个连接池）
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+
+# 是否合并相同的并发 GET 请求；合并后的结果复用时间（秒），0 表示只合并同时进行中的请求
+HTTP_COALESCE = os.getenv("HTTP_COALESCE", "1") not in ["0", "false", "False"]
+HTTP_COALESCE_TTL = float(os.getenv("HTTP_COALESCE_TTL", "5"))
+
+# 条件请求（ETag / Last-Modified）配置
+HTTP_CONDITIONAL_GET = os.getenv("HTTP_CONDITIONAL_GET", "1") not in ["0", "false", "False"]
+HTTP_VALIDATOR_TTL = int(os.getenv("HTTP_VALIDATOR_TTL", str(7 * 24 * 3600)))
+
+# 编码检测：声明的编码优先，其次尝试 UTF-8，最后只对前 CHARSET_SAMPLE_SIZE 字节做 chardet 检测
+CHARSET_SAMPLE_SIZE = int(os.getenv("CHARSET_SAMPLE_SIZE", "32768"))
+_META_SCAN_SIZE = 4096
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([A-Za-z0-9_\-]+)', re.IGNORECASE)
+# GB2312/GBK 页面里常混有超出字符集的字符，统一按超集 GB18030 解码
+_CHARSET_ALIASES = {"gb2312": "gb18030", "gbk": "gb18030", "x-gbk": "gb18030"}
+
+
+class RawContent(NamedTuple):
+    """原始响应体及其编码（response_type="raw" 时返回），可直接交给支持 bytes 的解析器"""
+    content: bytes
+    encoding: str
+
+# 进程级共享会话，绑定创建它的事件循环
+_shared_session: Optional[aiohttp.ClientSession] = None
+_shared_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# 进行中的 GET 请求（合并键 -> 任务）及刚完成的结果（合并键 -> (过期时间, 结果)）
+_inflight_requests: Dict[str, "asyncio.Future"] = {}
+_recent_responses: Dict[str, Tuple[float, Any]] = {}
+
+# 条件请求校验信息存储（ETag / Last-Modified + 响应体）
+_validator_store: Optional[CacheManager] = None
+
+
+def get_validator_store() -> CacheManager:
+    """获取条件请求校验信息存储，持久化在缓存目录下的 validators 子目录"""
+    global _validator_store
+    
+    if _validator_store is None:
+        _validator_store = CacheManager(
+            cache_dir=os.path.join(CACHE_DIR, "validators"),
+            default_ttl=HTTP_VALIDATOR_TTL,
+            memory_size=64,
+        )
+    return _validator_store
+
+
+async def get_shared_session() -> aiohttp.ClientSession:
+    """
+    获取进程级共享会话
+    
+    所有 HTTPClient 默认共用同一个连接池，不同平台访问同一主机（如 tophub.today、
+    新浪、豆瓣）时可以复用 keep-alive 连接、DNS 缓存和 TLS 会话。
+    会话与事件循环绑定，事件循环更换后（如多次调用 asyncio.run）会自动重建。
+    """
+    global _shared_session, _shared_session_loop
+    
+    loop = asyncio.get_running_loop()
+    if _shared_session is not None and not _shared_session.closed and _shared_session_loop is loop:
+        return _shared_session
+    
+    # 旧会话属于其他事件循环，无法在当前循环中关闭，直接丢弃引用后重建
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+    )
+    _shared_session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=ClientTimeout(total=REQUEST_TIMEOUT),
+        headers=DEFAULT_HEADERS,
+        trace_configs=[create_trace_config()],
+    )
+    _shared_session_loop = loop
+    return _shared_session
+
+
+async def close_shared_session():
+    """关闭进程级共享会话（进程退出前调用）"""
+    global _shared_session, _shared_session_loop
+    
+    if _shared_session is not None and not _shared_session.closed:
+        await _shared_session.close()
+    _shared_session = None
+    _shared_session_loop = None
+
+
+def _finish_inflight(key: str, task: "asyncio.Future"):
+    """合并请求完成后的清理：移出进行中表，按需缓存结果"""
+    if _inflight_requests.get(key) is task:
+        del _inflight_requests[key]
+    
+    if task.cancelled():
+        return
+    # 读取异常，避免所有调用方都已取消时出现 "exception was never retrieved"
+    if task.exception() is not None:
+        return
+    
+    if HTTP_COALESCE_TTL > 0:
+        now = time.monotonic()
+        for expired_key in [k for k, (expire_at, _) in _recent_responses.items() if expire_at <= now]:
+            del _recent_responses[expired_key]
+        _recent_responses[key] = (now + HTTP_COALESCE_TTL, task.result())
+
 
 class HTTPClient:
     """异步 HTTP 客户端"""
     
-    def __init__(self):
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None, retry_policy: Optional[RetryPolicy] = None):
+        """
+        初始化客户端
+        
+        Args:
+            session: 外部注入的会话；不传时使用进程级共享会话。
+                客户端不负责关闭任何会话，共享会话由 close_shared_session 统一关闭。
+            retry_policy: 重试策略，默认使用环境变量配置的 RetryPolicy
+        """
         self.timeout = ClientTimeout(total=REQUEST_TIMEOUT)
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional[aiohttp.ClientSession] = session
+        self.retry_policy = retry_policy or RetryPolicy()
     
     async def _get_session(self) -> aiohttp.ClientSession:
-        """获取或创建会话"""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(
-                timeout=self.timeout,
-                headers=DEFAULT_HEADERS
-            )
-        return self.session
+        """获取会话"""
+        if self.session is not None and not self.session.closed:
+            return self.session
+        return await get_shared_session()
     
     async def close(self):
-        """关闭会话"""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        """释放客户端（共享会话保持存活，供后续请求复用）"""
+        pass
     
     def _generate_cache_key(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> str:
         """生成缓存键"""
@@ -67,9 +198,53 @@ class HTTPClient:
         headers: Optional[Dict] = None,
         response_type: str = "json",
         retries: int = MAX_RETRIES,
+        coalesce: bool = True,
         **kwargs
     ) -> Any:
-        """GET 请求"""
+        """
+        GET 请求
+        
+        相同的并发 GET 请求（按 _generate_cache_key 和 response_type 判定）会合并为一次网络往返，
+        所有调用方共享同一个解码后的结果，因此调用方不应修改返回的对象。
+        请求完成后 HTTP_COALESCE_TTL 秒内到达的相同请求也直接复用该结果。
+        携带 Cookie/Authorization 或额外请求参数的请求不参与合并。
+        
+        response_type 可选 "json"、"text"、"bytes" 以及 "raw"（返回 RawContent，
+        即原始字节加检测到的编码，供可直接解析 bytes 的解析器跳过解码）。
+        """
+        extra_kwargs = [k for k in kwargs if k != "timeout"]
+        sensitive = any(k.lower() in ["cookie", "authorization"] for k in (headers or {}))
+        if not (coalesce and HTTP_COALESCE) or extra_kwargs or sensitive:
+            return await self._get(url, params, headers, response_type, retries, **kwargs)
+        
+        key = f"{response_type}:{self._generate_cache_key(url, params, headers)}"
+        
+        recent = _recent_responses.get(key)
+        if recent is not None:
+            if recent[0] > time.monotonic():
+                return recent[1]
+            _recent_responses.pop(key, None)
+        
+        loop = asyncio.get_running_loop()
+        task = _inflight_requests.get(key)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(self._get(url, params, headers, response_type, retries, **kwargs))
+            _inflight_requests[key] = task
+            task.add_done_callback(lambda t, key=key: _finish_inflight(key, t))
+        
+        # shield: 单个调用方被取消时不影响其他等待同一请求的调用方
+        return await asyncio.shield(task)
+    
+    async def _get(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        response_type: str = "json",
+        retries: int = MAX_RETRIES,
+        **kwargs
+    ) -> Any:
+        """执行实际的 GET 请求（不做合并）"""
         session = await self._get_session()
         
         # 合并请求头
@@ -80,73 +255,286 @@ class HTTPClient:
         # 如果kwargs中有timeout，使用它；否则使用session的默认timeout
         request_timeout = kwargs.pop('timeout', None)
         
+        # 条件请求：带上上次响应的 ETag / Last-Modified（录制 / 回放时关闭，cassette 中只保存完整响应）
+        conditional = HTTP_CONDITIONAL_GET and not replay_mode()
+        validator_key = self._generate_cache_key(url, params, headers)
+        stored = get_validator_store().get(validator_key) if conditional else None
+        if stored:
+            if stored.get("etag") and "If-None-Match" not in request_headers:
+                request_headers["If-None-Match"] = stored["etag"]
+            if stored.get("last_modified") and "If-Modified-Since" not in request_headers:
+                request_headers["If-Modified-Since"] = stored["last_modified"]
+        
+        async def send(attempt_timeout: Any, trace: Dict[str, Any]) -> Any:
+            async with open_response(
+                session,
+                "GET",
+                url,
+                params=params,
+                headers=request_headers,
+                timeout=attempt_timeout,
+                trace_request_ctx=trace,
+                **kwargs
+            ) as response:
+                response.raise_for_status()
+                
+                if response.status == 304 and stored:
+                    # 内容未变化：从上次保存的响应体解码，不再下载。不复用上次解码出的对象，
+                    # 调用方修改返回的 list / dict 时会影响之后所有的 304 响应
+                    mark(trace, "body_end")
+                    return self._decode_body(stored["body"], stored.get("content_type", ""), response_type)
+                
+                content = await response.read()
+                mark(trace, "body_end")
+                content_type = response.headers.get("Content-Type", "")
+                result = self._decode_body(content, content_type, response_type)
+                
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if conditional and response.status == 200 and (etag or last_modified):
+                    get_validator_store().set(validator_key, {
+                        "etag": etag,
+                        "last_modified": last_modified,
+                        "content_type": content_type,
+                        "body": content,
+                    })
+                
+                return result
+        
+        return await self._request_with_retries("GET", url, send, retries, timeout=request_timeout)
+    
+    async def _request_with_retries(
+        self,
+        method: str,
+        url: str,
+        send: Callable[[Any, Dict[str, Any]], Awaitable[Any]],
+        retries: int,
+        idempotent: bool = True,
+        timeout: Any = None,
+    ) -> Any:
+        """
+        按重试策略执行请求
+        
+        Args:
+            method: 请求方法（用于耗时统计）
+            url: 请求地址（用于错误信息）
+            send: 执行一次请求的协程函数，参数为本次尝试的超时设置和耗时记录（作为 trace_request_ctx 传给 aiohttp）
+            retries: 最大尝试次数
+            idempotent: 是否幂等，非幂等请求只在确定未被处理时重试
+            timeout: 调用方指定的超时设置
+        
+        每次尝试先在主机配额内排队，拿到配额后按截止时间的剩余部分计算超时（排队时间也计入截止时间）；
+        send 只负责发出请求，退避等待期间不占用主机并发名额。
+        接口的熔断器打开时直接抛出 CircuitOpenError，不发出请求。
+        每次尝试的各阶段耗时记录到 get_network_metrics()。
+        """
+        if not CIRCUIT_BREAKER_ENABLED:
+            return await self._retry_loop(method, url, send, retries, idempotent, timeout)
+        
+        breakers = get_circuit_breakers()
+        breakers.check(url)
+        try:
+            result = await self._retry_loop(method, url, send, retries, idempotent, timeout)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if is_circuit_failure(e):
+                breakers.record_failure(url)
+            else:
+                # 普通 4xx 说明上游仍在正常响应
+                breakers.record_success(url)
+            raise
+        except BaseException:
+            # 被取消或解码出错：不改变熔断状态，只释放半开状态下的试探名额
+            breakers.release_probe(url)
+            raise
+        breakers.record_success(url)
+        return result
+    
+    async def _retry_loop(
+        self,
+        method: str,
+        url: str,
+        send: Callable[[Any, Dict[str, Any]], Awaitable[Any]],
+        retries: int,
+        idempotent: bool,
+        timeout: Any,
+    ) -> Any:
+        """重试循环"""
+        policy = self.retry_policy
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + policy.deadline if policy.deadline and policy.deadline > 0 else None
+        policy.budget.deposit()
+        metrics = get_network_metrics()
+        
+        delay = 0.0
         for attempt in range(retries):
+            # 记录从排队开始，wait 阶段即等待主机配额的时间
+            trace = new_request_trace(method, url, attempt)
+            # 先在主机配额内排队，拿到配额后再计算本次尝试的超时：排队时间计入请求截止时间，
+            # 排队超过截止时间时直接超时
+            wait_limit = None if deadline is None else max(0.0, deadline - loop.time())
+            error: Optional[BaseException] = None
             try:
-                async with session.get(url, params=params, headers=request_headers, timeout=request_timeout, **kwargs) as response:
-                    response.raise_for_status()
+                async with self._limit(url, wait_limit):
+                    # aiohttp 把 timeout=None 视为不限时，这里统一回退到客户端默认超时
+                    attempt_timeout = timeout if timeout is not None else self.timeout
+                    capped = False
+                    if deadline is not None:
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            raise asyncio.TimeoutError(f"请求超过截止时间 {policy.deadline} 秒: {url}")
+                        total = attempt_timeout if isinstance(attempt_timeout, (int, float)) else attempt_timeout.total
+                        # 超时被截止时间缩短到不足正常超时的一半时，超时说明的是排队后剩余时间不足，
+                        # 不是上游响应慢（只缩短一点时仍按上游超时处理）
+                        capped = remaining < (total or policy.deadline) / 2
+                        attempt_timeout = self._cap_timeout(timeout, remaining)
                     
-                    if response_type == "json":
-                        # 检查 Content-Type，如果不是 JSON 则返回文本
-                        content_type = response.headers.get("Content-Type", "").lower()
-                        if "application/json" not in content_type and "text/json" not in content_type:
-                            # 尝试解析为 JSON
-                            text = await response.text()
-                            if not text or not text.strip():
-                                # 空响应，返回空字典
-                                return {}
-                            try:
-                                import json
-                                return json.loads(text)
-                            except json.JSONDecodeError:
-                                # JSON解析失败，返回空字典而不是抛出异常
-                                return {}
-                        try:
-                            return await response.json()
-                        except Exception:
-                            # JSON解析失败，尝试从文本解析
-                            text = await response.text()
-                            if not text or not text.strip():
-                                return {}
-                            try:
-                                import json
-                                return json.loads(text)
-                            except json.JSONDecodeError:
-                                return {}
-                    elif response_type == "text":
-                        # 处理编码
-                        content = await response.read()
-                        # 尝试解码 brotli
-                        try:
-                            import brotli
-                            content = brotli.decompress(content)
-                        except (ImportError, Exception):
-                            pass
-                        # 优先使用UTF-8，如果检测到其他编码则使用检测结果，但始终使用errors='replace'避免解码失败
-                        try:
-                            encoding = chardet.detect(content)["encoding"] or "utf-8"
-                            # 如果检测到的编码不可靠，强制使用UTF-8
-                            if encoding and encoding.lower() not in ['utf-8', 'utf8', 'ascii']:
-                                # 对于非UTF-8编码，先尝试UTF-8，失败再使用检测的编码
-                                try:
-                                    return content.decode('utf-8', errors='replace')
-                                except Exception:
-                                    return content.decode(encoding, errors='replace')
-                            else:
-                                return content.decode(encoding or 'utf-8', errors='replace')
-                        except Exception:
-                            # 如果chardet失败，直接使用UTF-8
-                            return content.decode('utf-8', errors='replace')
-                    elif response_type == "bytes":
-                        return await response.read()
-                    else:
-                        return await response.text()
-            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-                if attempt == retries - 1:
-                    raise
-                await asyncio.sleep(2 ** attempt)  # 指数退避
+                    try:
+                        result = await send(attempt_timeout, trace)
+                    except BaseException as e:
+                        if capped and isinstance(e, asyncio.TimeoutError):
+                            trace["local_timeout"] = True
+                        metrics.finish(trace, error=e)
+                        if not isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError)):
+                            raise
+                        error = e
+            except asyncio.TimeoutError as e:
+                # 排队等待主机配额时到达截止时间：请求没有发出，记为本地超时
+                trace["local_timeout"] = True
+                metrics.finish(trace, error=e)
+                raise
+            
+            if error is None:
+                metrics.finish(trace)
+                return result
+            
+            # 退避等待在配额之外进行，不占用主机并发名额
+            if attempt == retries - 1 or not policy.should_retry(error, idempotent):
+                raise error
+            delay = policy.next_delay(delay, error)
+            if delay is None:
+                raise error
+            if deadline is not None and loop.time() + delay >= deadline:
+                raise error
+            if not policy.budget.try_withdraw():
+                raise error
+            await asyncio.sleep(delay)
         
         raise Exception(f"请求失败，已重试 {retries} 次")
     
+    @staticmethod
+    def _limit(url: str, timeout: Optional[float] = None):
+        """主机限流，排队超过 timeout 秒时抛出 asyncio.TimeoutError；回放时不访问网络，不做限流"""
+        if replay_mode() == REPLAY:
+            return nullcontext()
+        return get_host_limiter().limit(url, timeout)
+    
+    def _cap_timeout(self, timeout: Any, remaining: float) -> ClientTimeout:
+        """把本次尝试的总超时限制在截止时间剩余部分以内"""
+        if timeout is None:
+            timeout = self.timeout
+        if isinstance(timeout, (int, float)):
+            return ClientTimeout(total=min(timeout, remaining))
+        total = min(timeout.total, remaining) if timeout.total else remaining
+        return ClientTimeout(
+            total=total,
+            connect=timeout.connect,
+            sock_read=timeout.sock_read,
+            sock_connect=timeout.sock_connect,
+        )
+    
+    def _decode_body(self, content: bytes, content_type: str, response_type: str) -> Any:
+        """按 response_type 解码响应体"""
+        if response_type == "bytes":
+            return content
+        
+        if response_type == "json":
+            # 不论 Content-Type 是否为 JSON 都尝试解析，失败时返回空字典而不是抛出异常
+            if not content or not content.strip():
+                # 空响应，返回空字典
+                return {}
+            charset = self._charset_from_content_type(content_type)
+            try:
+                if charset is None or charset in ["utf-8", "utf8", "ascii"]:
+                    # UTF-8 直接从 bytes 解析，省去中间的 str
+                    return json_utils.loads(content)
+                return json_utils.loads(content.decode(charset, errors="replace"))
+            except json_utils.JSONDecodeError:
+                return {}
+        
+        if response_type == "text":
+            return self._decode_text(content, content_type)[0]
+        
+        if response_type == "raw":
+            return RawContent(content, self._detect_encoding(content, content_type))
+        
+        return content.decode(self._charset_from_content_type(content_type) or "utf-8", errors="replace")
+    
+    def _decode_text(self, content: bytes, content_type: str) -> Tuple[str, str]:
+        """解码文本响应，返回 (文本, 编码)"""
+        encoding = self._charset_from_content_type(content_type) or self._charset_from_meta(content)
+        if encoding:
+            return content.decode(encoding, errors="replace"), encoding
+        
+        try:
+            return content.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            pass
+        
+        encoding = self._guess_charset(content)
+        return content.decode(encoding, errors="replace"), encoding
+    
+    def _detect_encoding(self, content: bytes, content_type: str) -> str:
+        """只检测编码、不保留解码结果"""
+        encoding = self._charset_from_content_type(content_type) or self._charset_from_meta(content)
+        if encoding:
+            return encoding
+        
+        try:
+            content.decode("utf-8")
+            return "utf-8"
+        except UnicodeDecodeError:
+            return self._guess_charset(content)
+    
+    @staticmethod
+    def _normalize_charset(charset: Optional[str]) -> Optional[str]:
+        """校验编码名称，无法识别时返回 None"""
+        if not charset:
+            return None
+        charset = charset.strip().strip('"\'').lower()
+        charset = _CHARSET_ALIASES.get(charset, charset)
+        try:
+            codecs.lookup(charset)
+        except LookupError:
+            return None
+        return charset
+    
+    @classmethod
+    def _charset_from_content_type(cls, content_type: str) -> Optional[str]:
+        """从 Content-Type 中提取 charset"""
+        for part in content_type.split(";")[1:]:
+            name, _, value = part.strip().partition("=")
+            if name.strip().lower() == "charset":
+                return cls._normalize_charset(value)
+        return None
+    
+    @classmethod
+    def _charset_from_meta(cls, content: bytes) -> Optional[str]:
+        """从 HTML 开头的 <meta charset> 中提取编码"""
+        match = _META_CHARSET_RE.search(content[:_META_SCAN_SIZE])
+        if match:
+            return cls._normalize_charset(match.group(1).decode("ascii", errors="ignore"))
+        return None
+    
+    @classmethod
+    def _guess_charset(cls, content: bytes) -> str:
+        """对前 CHARSET_SAMPLE_SIZE 字节做 chardet 检测"""
+        try:
+            import chardet
+            detected = chardet.detect(content[:CHARSET_SAMPLE_SIZE])["encoding"]
+        except Exception:
+            detected = None
+        return cls._normalize_charset(detected) or "utf-8"
+    
     async def post(
         self,
         url: str,
@@ -154,9 +542,14 @@ class HTTPClient:
         json_data: Optional[Dict] = None,
         headers: Optional[Dict] = None,
         retries: int = MAX_RETRIES,
+        idempotent: bool = False,
         **kwargs
     ) -> Any:
-        """POST 请求"""
+        """
+        POST 请求
+        
+        POST 默认视为非幂等，只在连接失败或 429 时重试；确认接口幂等时可传 idempotent=True。
+        """
         session = await self._get_session()
         
         # 合并请求头
@@ -164,31 +557,36 @@ class HTTPClient:
         if headers:
             request_headers.update(headers)
         
-        for attempt in range(retries):
-            try:
-                async with session.post(
-                    url,
-                    data=data,
-                    json=json_data,
-                    headers=request_headers,
-                    **kwargs
-                ) as response:
-                    response.raise_for_status()
-                    try:
-                        return await response.json()
-                    except Exception:
-                        # JSON解析失败，尝试从文本解析
-                        text = await response.text()
-                        if not text or not text.strip():
-                            return {}
-                        try:
-                            import json
-                            return json.loads(text)
-                        except json.JSONDecodeError:
-                            return {}
-            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-                if attempt == retries - 1:
-                    raise
-                await asyncio.sleep(2 ** attempt)
+        request_timeout = kwargs.pop('timeout', None)
         
-        raise Exception(f"请求失败，已重试 {retries} 次")
+        async def send(attempt_timeout: Any, trace: Dict[str, Any]) -> Any:
+            async with open_response(
+                session,
+                "POST",
+                url,
+                data=data,
+                json=json_data,
+                headers=request_headers,
+                timeout=attempt_timeout,
+                trace_request_ctx=trace,
+                **kwargs
+            ) as response:
+                response.raise_for_status()
+                content = await response.read()
+                mark(trace, "body_end")
+                return self._decode_body(content, response.headers.get("Content-Type", ""), "json")
+        
+        return await self._request_with_retries("POST", url, send, retries, idempotent=idempotent, timeout=request_timeout)
+
+
+# 进程级共享的默认客户端（客户端本身不保存请求状态，会话、重试预算和限流都是进程级共享的）
+_shared_client: Optional[HTTPClient] = None
+
+
+def get_http_client() -> HTTPClient:
+    """获取所有平台共享的默认 HTTP 客户端"""
+    global _shared_client
+    
+    if _shared_client is None:
+        _shared_client = HTTPClient()
+    return _shared_client
@@ -0,0 +1,273 @@
+"""网络耗时统计 - 通过 aiohttp TraceConfig 记录每个请求各阶段的耗时"""
+
+import math
+import time
+from collections import deque
+from types import SimpleNamespace
+from typing import Callable, Deque, Dict, List, Optional, Any
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .run_context import current_platform
+
+# 单次运行最多保留的请求记录数（守护进程长时间运行时避免无限增长）
+MAX_RECORDS = 20000
+
+# 汇总时统计分位数的阶段
+PHASES = ["wait", "dns", "connect", "ttfb", "body", "decode", "total"]
+
+
+def new_request_trace(method: str, url: str, attempt: int = 0) -> Dict[str, Any]:
+    """
+    创建一次请求尝试的记录，作为 trace_request_ctx 传给 aiohttp
+    
+    各阶段耗时单位为秒：
+        wait: 等待主机限流配额
+        dns: DNS 解析（命中缓存时为 0）
+        connect: 建立连接，HTTPS 时包含 TLS 握手（复用连接时为 0）
+        ttfb: 开始请求到收到响应头（包含 dns 和 connect）
+        body: 读取响应体
+        decode: 解码响应体
+        total: 以上全部
+    """
+    return {
+        "method": method,
+        "url": url,
+        "host": urlsplit(url).hostname or "",
+        "platform": current_platform.get(),
+        "attempt": attempt,
+        "status": None,
+        "bytes": 0,
+        "reused": False,
+        "error": None,
+        # 超时由本地排队造成（等待主机配额时到达截止时间、超时被截止时间缩短到不足一半），不说明上游拥塞
+        "local_timeout": False,
+        "created": time.perf_counter(),
+    }
+
+
+def mark(trace: Optional[Dict[str, Any]], name: str):
+    """在记录上打一个时间点"""
+    if trace is not None:
+        trace[name] = time.perf_counter()
+
+
+def _trace_of(trace_config_ctx: SimpleNamespace) -> Optional[Dict[str, Any]]:
+    """取出请求时传入的记录，未传入时返回 None"""
+    trace = trace_config_ctx.trace_request_ctx
+    return trace if isinstance(trace, dict) else None
+
+
+async def _on_request_start(session, trace_config_ctx, params):
+    mark(_trace_of(trace_config_ctx), "request_start")
+
+
+async def _on_dns_resolvehost_start(session, trace_config_ctx, params):
+    mark(_trace_of(trace_config_ctx), "dns_start")
+
+
+async def _on_dns_resolvehost_end(session, trace_config_ctx, params):
+    mark(_trace_of(trace_config_ctx), "dns_end")
+
+
+async def _on_connection_create_start(session, trace_config_ctx, params):
+    mark(_trace_of(trace_config_ctx), "connect_start")
+
+
+async def _on_connection_create_end(session, trace_config_ctx, params):
+    mark(_trace_of(trace_config_ctx), "connect_end")
+
+
+async def _on_connection_reuseconn(session, trace_config_ctx, params):
+    trace = _trace_of(trace_config_ctx)
+    if trace is not None:
+        trace["reused"] = True
+
+
+async def _on_request_end(session, trace_config_ctx, params):
+    trace = _trace_of(trace_config_ctx)
+    if trace is not None:
+        trace["response_start"] = time.perf_counter()
+        trace["status"] = params.response.status
+
+
+async def _on_response_chunk_received(session, trace_config_ctx, params):
+    trace = _trace_of(trace_config_ctx)
+    if trace is not None:
+        trace["bytes"] += len(params.chunk)
+
+
+async def _on_request_exception(session, trace_config_ctx, params):
+    trace = _trace_of(trace_config_ctx)
+    if trace is not None:
+        trace["error"] = type(params.exception).__name__
+
+
+def create_trace_config() -> aiohttp.TraceConfig:
+    """创建记录各阶段耗时的 TraceConfig（只处理带有 trace_request_ctx 记录的请求）"""
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_dns_resolvehost_start.append(_on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(_on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(_on_connection_create_start)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(_on_connection_reuseconn)
+    trace_config.on_request_end.append(_on_request_end)
+    trace_config.on_response_chunk_received.append(_on_response_chunk_received)
+    trace_config.on_request_exception.append(_on_request_exception)
+    return trace_config
+
+
+def _span(trace: Dict[str, Any], start: str, end: str) -> Optional[float]:
+    """计算两个时间点之间的耗时，任一时间点缺失时返回 None"""
+    if start in trace and end in trace:
+        return max(0.0, trace[end] - trace[start])
+    return None
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """最近秩法计算分位数"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class NetworkMetrics:
+    """请求记录汇总"""
+    
+    def __init__(self, max_records: int = MAX_RECORDS):
+        self.records: Deque[Dict[str, Any]] = deque(maxlen=max_records)
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+    
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """注册回调，每条请求记录完成时调用"""
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """移除回调"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def reset(self):
+        """清空记录（每次运行开始时调用）"""
+        self.records.clear()
+    
+    def finish(self, trace: Dict[str, Any], error: Optional[BaseException] = None):
+        """
+        结束一次请求尝试，计算各阶段耗时并保存
+        
+        Args:
+            trace: new_request_trace 创建的记录
+            error: 本次尝试抛出的异常
+        """
+        end = time.perf_counter()
+        if error is not None:
+            trace["error"] = type(error).__name__
+            status = getattr(error, "status", None)
+            if status:
+                trace["status"] = status
+        
+        record = {
+            "method": trace["method"],
+            "url": trace["url"],
+            "host": trace["host"],
+            "platform": trace["platform"],
+            "attempt": trace["attempt"],
+            "status": trace["status"],
+            "bytes": trace["bytes"],
+            "reused": trace["reused"],
+            "error": trace["error"],
+            "local_timeout": trace["local_timeout"],
+            "wait": _span(trace, "created", "request_start"),
+            "dns": _span(trace, "dns_start", "dns_end") or 0.0,
+            "connect": _span(trace, "connect_start", "connect_end") or 0.0,
+            "ttfb": _span(trace, "request_start", "response_start"),
+            "body": _span(trace, "response_start", "body_end"),
+            "decode": max(0.0, end - trace["body_end"]) if "body_end" in trace else None,
+            "total": end - trace["created"],
+        }
+        self.records.append(record)
+        
+        for listener in list(self._listeners):
+            try:
+                listener(record)
+            except Exception:
+                pass
+    
+    @staticmethod
+    def _phase_stats(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+        """计算各阶段的 p50 / p95（毫秒）"""
+        stats = {}
+        for phase in PHASES:
+            values = [r[phase] for r in records if r.get(phase) is not None]
+            if values:
+                stats[phase] = {
+                    "p50_ms": round(_percentile(values, 50) * 1000, 1),
+                    "p95_ms": round(_percentile(values, 95) * 1000, 1),
+                }
+        return stats
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        按主机和平台汇总
+        
+        Returns:
+            {"requests", "errors", "bytes", "hosts": {主机: {...}}, "platforms": {平台: {...}}}，
+            主机按 total 的 p95 从高到低排列
+        """
+        records = list(self.records)
+        
+        by_host: Dict[str, List[Dict[str, Any]]] = {}
+        by_platform: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            by_host.setdefault(record["host"], []).append(record)
+            by_platform.setdefault(record["platform"] or "-", []).append(record)
+        
+        hosts = {}
+        for host, items in by_host.items():
+            hosts[host] = {
+                "requests": len(items),
+                "retries": sum(1 for r in items if r["attempt"] > 0),
+                "errors": sum(1 for r in items if r["error"]),
+                "reused": sum(1 for r in items if r["reused"]),
+                "bytes": sum(r["bytes"] for r in items),
+                "platforms": sorted({r["platform"] for r in items if r["platform"]}),
+                "phases": self._phase_stats(items),
+            }
+        hosts = dict(sorted(
+            hosts.items(),
+            key=lambda item: item[1]["phases"].get("total", {}).get("p95_ms", 0),
+            reverse=True,
+        ))
+        
+        platforms = {}
+        for platform, items in sorted(by_platform.items()):
+            platforms[platform] = {
+                "requests": len(items),
+                "retries": sum(1 for r in items if r["attempt"] > 0),
+                "errors": sum(1 for r in items if r["error"]),
+                "bytes": sum(r["bytes"] for r in items),
+                "time_s": round(sum(r["total"] for r in items), 3),
+            }
+        
+        return {
+            "requests": len(records),
+            "errors": sum(1 for r in records if r["error"]),
+            "bytes": sum(r["bytes"] for r in records),
+            "hosts": hosts,
+            "platforms": platforms,
+        }
+
+
+# 进程级共享统计
+_shared_metrics: Optional[NetworkMetrics] = None
+
+
+def get_network_metrics() -> NetworkMetrics:
+    """获取共享的网络耗时统计"""
+    global _shared_metrics
+    
+    if _shared_metrics is None:
+        _shared_metrics = NetworkMetrics()
+    return _shared_metrics
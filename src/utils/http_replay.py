@@ -0,0 +1,307 @@
+"""HTTP 传输层 - 录制 / 回放（压缩的 cassette 文件）与 URL 重写（指向本地模拟服务器）"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from http.cookies import SimpleCookie
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import aiohttp
+from dotenv import load_dotenv
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+load_dotenv()
+
+# 项目根目录（src 的上一级）
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 模式：空（正常请求）、record（请求并录制）、replay（只从 cassette 回放，不访问网络）
+HTTP_REPLAY_MODE = os.getenv("HTTP_REPLAY_MODE", "").lower()
+HTTP_CASSETTE_DIR = os.getenv("HTTP_CASSETTE_DIR", os.path.join(_PROJECT_ROOT, "cassettes"))
+# 回放时模拟的延迟：秒数，或 recorded（按录制时的耗时）
+HTTP_REPLAY_LATENCY = os.getenv("HTTP_REPLAY_LATENCY", "0")
+# 每次运行都会变化的查询参数 / JSON 请求体字段（时间戳、JSONP 回调名等），不参与请求匹配
+HTTP_REPLAY_IGNORE = os.getenv("HTTP_REPLAY_IGNORE", "_,callback,timestamp,top_time")
+# URL 重写：所有请求改发到该地址，原主机名放在路径第一段，
+# 如 https://weibo.com/ajax/side/hotSearch -> http://127.0.0.1:8900/weibo.com/ajax/side/hotSearch
+HTTP_URL_REWRITE = os.getenv("HTTP_URL_REWRITE", "").rstrip("/")
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class ReplayResponse:
+    """回放的响应，提供 HTTPClient 与各平台用到的 aiohttp.ClientResponse 接口"""
+    
+    def __init__(self, method: str, url: str, status: int, headers: List[Tuple[str, str]], body: bytes, reason: str = ""):
+        self.method = method
+        self.url = URL(url)
+        self.status = status
+        self.reason = reason
+        self.headers = CIMultiDictProxy(CIMultiDict(headers))
+        self._body = body
+        
+        self.cookies: SimpleCookie = SimpleCookie()
+        for value in self.headers.getall("Set-Cookie", []):
+            try:
+                self.cookies.load(value)
+            except Exception:
+                pass
+    
+    @property
+    def request_info(self) -> aiohttp.RequestInfo:
+        """请求信息（用于构造 ClientResponseError）"""
+        return aiohttp.RequestInfo(self.url, self.method, CIMultiDictProxy(CIMultiDict()), self.url)
+    
+    @property
+    def ok(self) -> bool:
+        """状态码是否小于 400"""
+        return self.status < 400
+    
+    def raise_for_status(self):
+        """与 aiohttp 一致：状态码 >= 400 时抛出 ClientResponseError"""
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                self.request_info,
+                (),
+                status=self.status,
+                message=self.reason,
+                headers=self.headers,
+            )
+    
+    async def read(self) -> bytes:
+        """响应体"""
+        return self._body
+    
+    async def text(self, encoding: Optional[str] = None, errors: str = "strict") -> str:
+        """按指定编码（默认 UTF-8）解码响应体"""
+        return self._body.decode(encoding or "utf-8", errors=errors)
+    
+    async def __aenter__(self) -> "ReplayResponse":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return None
+
+
+class Cassette:
+    """
+    cassette 目录
+    
+    每个请求保存为 <主机>/<请求键>.json.gz，请求键由方法、URL、查询参数和请求体计算，
+    HTTP_REPLAY_IGNORE 中的字段不参与计算。同一请求重复录制时保留最后一次的响应。
+    """
+    
+    def __init__(self, cassette_dir: str = HTTP_CASSETTE_DIR, latency: str = HTTP_REPLAY_LATENCY, ignore: str = HTTP_REPLAY_IGNORE):
+        self.cassette_dir = cassette_dir
+        self.latency = latency
+        self.ignore = {name.strip() for name in ignore.split(",") if name.strip()}
+    
+    def _normalize_url(self, url: str, params: Optional[Any]) -> str:
+        """合并查询参数、去掉忽略的字段并排序"""
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        if params:
+            items = params.items() if hasattr(params, "items") else params
+            query.extend((str(k), str(v)) for k, v in items)
+        query = sorted((k, v) for k, v in query if k not in self.ignore)
+        return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+    
+    def _normalize_body(self, data: Any, json_data: Any) -> str:
+        """请求体转换为稳定的字符串"""
+        if json_data is not None:
+            if isinstance(json_data, dict):
+                json_data = {k: v for k, v in json_data.items() if k not in self.ignore}
+            return json.dumps(json_data, sort_keys=True, ensure_ascii=False, default=str)
+        if data is None:
+            return ""
+        if isinstance(data, dict):
+            return urlencode(sorted((str(k), str(v)) for k, v in data.items() if k not in self.ignore))
+        if isinstance(data, bytes):
+            return data.decode("utf-8", errors="replace")
+        return str(data)
+    
+    def path_for(self, method: str, url: str, params: Any = None, data: Any = None, json_data: Any = None) -> str:
+        """计算请求对应的 cassette 文件路径"""
+        key_str = "\n".join([method.upper(), self._normalize_url(url, params), self._normalize_body(data, json_data)])
+        key = hashlib.sha1(key_str.encode("utf-8")).hexdigest()
+        host = urlsplit(url).hostname or "_"
+        return os.path.join(self.cassette_dir, host, f"{key}.json.gz")
+    
+    def save(
+        self,
+        method: str,
+        url: str,
+        params: Any,
+        data: Any,
+        json_data: Any,
+        status: int,
+        reason: str,
+        headers: List[Tuple[str, str]],
+        body: bytes,
+        elapsed: float,
+    ):
+        """保存一条响应（先写临时文件再替换）"""
+        path = self.path_for(method, url, params, data, json_data)
+        entry = {
+            "method": method.upper(),
+            "url": self._normalize_url(url, params),
+            "status": status,
+            "reason": reason,
+            "headers": headers,
+            "body": base64.b64encode(body).decode("ascii"),
+            "elapsed": round(elapsed, 4),
+            "recorded_at": time.time(),
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    
+    def load(self, method: str, url: str, params: Any = None, data: Any = None, json_data: Any = None) -> Optional[Dict[str, Any]]:
+        """读取一条响应，不存在时返回 None"""
+        path = self.path_for(method, url, params, data, json_data)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    async def replay(self, method: str, url: str, params: Any = None, data: Any = None, json_data: Any = None) -> ReplayResponse:
+        """
+        回放请求
+        
+        cassette 中没有该请求时返回 404 响应（raise_for_status 抛出 ClientResponseError），
+        与线上接口失效时的处理路径一致。
+        """
+        entry = self.load(method, url, params, data, json_data)
+        if entry is None:
+            return ReplayResponse(method, url, 404, [], b"", reason="cassette 中没有录制该请求")
+        
+        if self.latency == "recorded":
+            delay = entry.get("elapsed", 0)
+        else:
+            try:
+                delay = float(self.latency)
+            except ValueError:
+                delay = 0
+        if delay > 0:
+            await asyncio.sleep(delay)
+        
+        return ReplayResponse(
+            method,
+            url,
+            entry["status"],
+            [tuple(item) for item in entry.get("headers", [])],
+            base64.b64decode(entry.get("body", "")),
+            reason=entry.get("reason", ""),
+        )
+
+
+# 当前模式、共享 cassette 与 URL 重写地址
+_mode = HTTP_REPLAY_MODE if HTTP_REPLAY_MODE in [RECORD, REPLAY] else ""
+_cassette: Optional[Cassette] = None
+_rewrite_base = HTTP_URL_REWRITE
+
+
+def configure_replay(mode: str = "", cassette_dir: Optional[str] = None, latency: Optional[str] = None):
+    """
+    在代码中切换录制 / 回放模式（覆盖环境变量）
+    
+    Args:
+        mode: ""、"record" 或 "replay"
+        cassette_dir: cassette 目录，默认 HTTP_CASSETTE_DIR
+        latency: 回放延迟，默认 HTTP_REPLAY_LATENCY
+    """
+    global _mode, _cassette
+    
+    _mode = mode if mode in [RECORD, REPLAY] else ""
+    _cassette = Cassette(
+        cassette_dir=cassette_dir or HTTP_CASSETTE_DIR,
+        latency=HTTP_REPLAY_LATENCY if latency is None else str(latency),
+    )
+
+
+def set_url_rewrite(base: str = ""):
+    """在代码中设置 URL 重写地址（覆盖环境变量），空字符串表示不重写"""
+    global _rewrite_base
+    
+    _rewrite_base = base.rstrip("/")
+
+
+def rewrite_url(url: str) -> str:
+    """
+    按 URL 重写配置改写请求地址
+    
+    只改写实际发出的请求；主机限流、熔断、耗时统计和 cassette 仍按原地址计算。
+    """
+    if not _rewrite_base:
+        return url
+    parts = urlsplit(url)
+    rewritten = f"{_rewrite_base}/{parts.netloc}{parts.path or '/'}"
+    return f"{rewritten}?{parts.query}" if parts.query else rewritten
+
+
+def url_rewrite() -> str:
+    """当前的 URL 重写地址，空字符串表示不重写"""
+    return _rewrite_base
+
+
+def replay_mode() -> str:
+    """当前模式"""
+    return _mode
+
+
+def get_cassette() -> Cassette:
+    """获取共享的 cassette"""
+    global _cassette
+    
+    if _cassette is None:
+        _cassette = Cassette()
+    return _cassette
+
+
+@asynccontextmanager
+async def open_response(session: aiohttp.ClientSession, method: str, url: str, **kwargs):
+    """
+    发出请求并返回响应，按当前模式录制或回放
+    
+    用法与 session.request 相同：
+        async with open_response(session, "GET", url, params=params) as response:
+            ...
+    
+    record 模式下响应体会在交给调用方之前读取并保存，调用方再次 read() 时直接返回已读取的内容。
+    """
+    if _mode == REPLAY:
+        yield await get_cassette().replay(method, url, kwargs.get("params"), kwargs.get("data"), kwargs.get("json"))
+        return
+    
+    if _mode != RECORD:
+        async with session.request(method, rewrite_url(url), **kwargs) as response:
+            yield response
+        return
+    
+    started = time.perf_counter()
+    async with session.request(method, rewrite_url(url), **kwargs) as response:
+        body = await response.read()
+        get_cassette().save(
+            method,
+            url,
+            kwargs.get("params"),
+            kwargs.get("data"),
+            kwargs.get("json"),
+            response.status,
+            response.reason or "",
+            list(response.headers.items()),
+            body,
+            time.perf_counter() - started,
+        )
+        yield response
@@ -0,0 +1,109 @@
+"""JSON 编解码工具 - 优先使用 orjson / ujson，未安装时回退到标准库"""
+
+import json
+import os
+from typing import Any, Union
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# JSON 后端：auto（按 orjson > ujson > json 顺序自动选择）、orjson、ujson、json
+JSON_BACKEND = os.getenv("JSON_BACKEND", "auto").lower()
+
+# 各后端解析失败时抛出的异常都是 ValueError 的子类
+JSONDecodeError = ValueError
+
+# 超出 64 位范围的整数（大于 2^64 - 1 或小于 -2^63）orjson 会解析成 float（丢失精度）。可能超出范围的是
+# 20 位及以上的连续数字，以及负号后 19 位及以上的数字（如 -9999999999999999999）。
+# 检测时把数字映射为 "0"、负号保留、其余字节映射为空格，再查找这两种模式（比正则快一个数量级）
+_WIDE_NUMBER_RUN = b"0" * 20
+_WIDE_NEGATIVE_RUN = b"-" + b"0" * 19
+_DIGIT_TABLE = bytes(
+    ord("0") if ord("0") <= byte <= ord("9") else byte if byte == ord("-") else ord(" ")
+    for byte in range(256)
+)
+
+orjson = None
+ujson = None
+
+if JSON_BACKEND in ["auto", "orjson"]:
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+if orjson is None and JSON_BACKEND in ["auto", "ujson"]:
+    try:
+        import ujson
+    except ImportError:
+        ujson = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+elif ujson is not None:
+    BACKEND = "ujson"
+else:
+    BACKEND = "json"
+
+
+def _has_wide_number(data: Union[str, bytes, bytearray, memoryview]) -> bool:
+    """输入中是否有 20 位及以上的连续数字，或负号后 19 位及以上的数字"""
+    if isinstance(data, str):
+        data = data.encode("utf-8", "surrogatepass")
+    elif isinstance(data, memoryview):
+        data = bytes(data)
+    digits = data.translate(_DIGIT_TABLE)
+    return _WIDE_NUMBER_RUN in digits or _WIDE_NEGATIVE_RUN in digits
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """
+    解析 JSON
+    
+    bytes 输入（需为 UTF-8）直接交给后端解析，省去中间的 str 解码。
+    解析失败时抛出 ValueError。
+    
+    orjson / ujson 不能精确解析超出 64 位的整数（orjson 会静默转成 float），输入中有 20 位及以上的
+    连续数字或负号后 19 位及以上的数字时改用标准库解析，保证与 json.loads 的结果一致
+    （字符串中的长数字也会触发，只影响速度）。
+    """
+    if orjson is not None or ujson is not None:
+        if not _has_wide_number(data):
+            if orjson is not None:
+                return orjson.loads(data)
+            if isinstance(data, memoryview):
+                data = bytes(data)
+            return ujson.loads(data)
+    if isinstance(data, memoryview):
+        data = bytes(data)
+    return json.loads(data)
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """序列化为 UTF-8 字节（不转义非 ASCII 字符），indent=True 时使用 2 空格缩进"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            # 超出 64 位的整数等 orjson 不支持的值，交给标准库处理
+            pass
+    elif ujson is not None:
+        try:
+            return ujson.dumps(
+                obj,
+                ensure_ascii=False,
+                escape_forward_slashes=False,
+                indent=2 if indent else 0,
+            ).encode("utf-8")
+        except (TypeError, OverflowError):
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """序列化为字符串（不转义非 ASCII 字符）"""
+    return dumps_bytes(obj, indent=indent).decode("utf-8")
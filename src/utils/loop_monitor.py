@@ -0,0 +1,266 @@
+"""事件循环健康监控 - 采样调度延迟，记录阻塞事件循环的慢回调及当时正在采集的平台"""
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from .run_context import current_platform
+
+load_dotenv()
+
+# 是否在采集时监控事件循环
+LOOP_MONITOR = os.getenv("LOOP_MONITOR", "0") not in ["0", "false", "False"]
+# 调度延迟的采样间隔（秒）
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.05"))
+# 单个回调执行超过该时间（秒）时记为慢回调
+LOOP_SLOW_CALLBACK = float(os.getenv("LOOP_SLOW_CALLBACK", "0.1"))
+
+# 最多保留的采样数和慢回调记录数（守护进程长时间运行时避免无限增长）
+MAX_SAMPLES = 100000
+MAX_SLOW_CALLBACKS = 1000
+# 报告中列出的最慢回调数
+TOP_SLOW_CALLBACKS = 20
+# 调度延迟直方图的分桶上界（毫秒），最后一个桶为 >= 最大上界
+LAG_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000]
+# asyncio 包所在目录，定位慢回调时跳过其中的协程
+ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+
+# 当前生效的监控器；Handle._run 被替换后按它记录慢回调
+_active: Optional["LoopMonitor"] = None
+_original_run = None
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """最近秩法计算分位数"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def bucket_labels() -> List[str]:
+    """直方图分桶的名称，如 <1ms、1-5ms、>=1000ms"""
+    labels = [f"<{LAG_BUCKETS_MS[0]}ms"]
+    for low, high in zip(LAG_BUCKETS_MS, LAG_BUCKETS_MS[1:]):
+        labels.append(f"{low}-{high}ms")
+    labels.append(f">={LAG_BUCKETS_MS[-1]}ms")
+    return labels
+
+
+def _bucket_index(lag_ms: float) -> int:
+    for index, bound in enumerate(LAG_BUCKETS_MS):
+        if lag_ms < bound:
+            return index
+    return len(LAG_BUCKETS_MS)
+
+
+def describe_callback(handle: asyncio.Handle) -> str:
+    """
+    回调的可读名称
+    
+    任务的一步（Task.__step）显示协程名和执行完这一步后挂起的位置（最内层协程的文件:行号），
+    阻塞的代码通常就在这个位置之前；其他回调显示函数名。
+    """
+    callback = getattr(handle, "_callback", None)
+    task = getattr(callback, "__self__", None)
+    if isinstance(task, asyncio.Task):
+        coro = task.get_coro()
+        name = getattr(coro, "__qualname__", repr(coro))
+        # 沿 await 链找到最内层挂起的协程（跳过 asyncio 自身的协程，如 asyncio.sleep）
+        location = None
+        inner = coro
+        while inner is not None and getattr(inner, "cr_frame", None) is not None:
+            filename = inner.cr_frame.f_code.co_filename
+            if not filename.startswith(ASYNCIO_DIR):
+                location = f"{os.path.basename(filename)}:{inner.cr_frame.f_lineno}"
+            inner = getattr(inner, "cr_await", None)
+        return f"{name} @ {location}" if location else name
+    if callback is None:
+        return repr(handle)
+    return getattr(callback, "__qualname__", repr(callback))
+
+
+def _monitored_run(handle: asyncio.Handle):
+    """替换 asyncio.Handle._run：计时每个回调，超过阈值时交给当前监控器记录"""
+    monitor = _active
+    if monitor is None or handle._loop is not monitor.loop:
+        return _original_run(handle)
+    start = time.perf_counter()
+    try:
+        return _original_run(handle)
+    finally:
+        elapsed = time.perf_counter() - start
+        if elapsed >= monitor.slow_callback:
+            monitor.record_slow(handle, elapsed)
+
+
+class LoopMonitor:
+    """
+    事件循环健康监控
+    
+    - 调度延迟：后台任务每隔 interval 秒 sleep 一次，实际醒来时间比预期晚多少就是这段时间里
+      事件循环被占用的程度，汇总为分位数和直方图
+    - 慢回调：替换 asyncio.Handle._run 为每个回调计时，超过 slow_callback 秒的记录下来，
+      并从回调所在的上下文中取出 current_platform，归到当时正在采集的平台
+    
+    网络慢时调度延迟正常、总耗时长；解析大页面、subprocess.run、requests.get 等同步调用阻塞
+    事件循环时，调度延迟和慢回调会明显增加。同一进程中同时只有一个监控器记录慢回调。
+    """
+    
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL, slow_callback: float = LOOP_SLOW_CALLBACK):
+        """
+        初始化
+        
+        Args:
+            interval: 调度延迟的采样间隔（秒）
+            slow_callback: 慢回调阈值（秒）
+        """
+        self.interval = interval
+        self.slow_callback = slow_callback
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.lags: Deque[float] = deque(maxlen=MAX_SAMPLES)
+        self.slow: Deque[Dict[str, Any]] = deque(maxlen=MAX_SLOW_CALLBACKS)
+        self._sampler: Optional[asyncio.Task] = None
+        self._started = time.perf_counter()
+    
+    def start(self):
+        """开始监控当前事件循环"""
+        global _active, _original_run
+        
+        self.loop = asyncio.get_running_loop()
+        self._started = time.perf_counter()
+        if _active is None:
+            if _original_run is None:
+                _original_run = asyncio.Handle._run
+            asyncio.Handle._run = _monitored_run
+            _active = self
+        self._sampler = self.loop.create_task(self._sample())
+    
+    async def stop(self):
+        """停止监控，恢复 asyncio.Handle._run"""
+        global _active
+        
+        if self._sampler is not None:
+            self._sampler.cancel()
+            await asyncio.gather(self._sampler, return_exceptions=True)
+            self._sampler = None
+        if _active is self:
+            asyncio.Handle._run = _original_run
+            _active = None
+    
+    async def __aenter__(self) -> "LoopMonitor":
+        self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+    
+    async def _sample(self):
+        """每隔 interval 秒记录一次实际醒来时间与预期的差"""
+        while True:
+            expected = self.loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, self.loop.time() - expected))
+    
+    def record_slow(self, handle: asyncio.Handle, elapsed: float):
+        """记录一个慢回调"""
+        context = getattr(handle, "_context", None)
+        self.slow.append({
+            "t": round(time.perf_counter() - self._started - elapsed, 3),
+            "duration_ms": round(elapsed * 1000, 1),
+            "platform": (context.get(current_platform, "") if context is not None else "") or "-",
+            "callback": describe_callback(handle),
+        })
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        汇总调度延迟和慢回调
+        
+        Returns:
+            {"interval_ms", "samples", "lag": {p50/p95/p99/max/mean_ms}, "histogram": {分桶: 次数},
+             "slow_threshold_ms", "slow_callbacks", "blocked_ms", "platforms": {平台: {...}}, "slowest": [...]}
+        """
+        lags = list(self.lags)
+        histogram = [0] * (len(LAG_BUCKETS_MS) + 1)
+        for lag in lags:
+            histogram[_bucket_index(lag * 1000)] += 1
+        
+        lag_stats = {}
+        if lags:
+            lag_stats = {
+                "p50_ms": round(_percentile(lags, 50) * 1000, 1),
+                "p95_ms": round(_percentile(lags, 95) * 1000, 1),
+                "p99_ms": round(_percentile(lags, 99) * 1000, 1),
+                "max_ms": round(max(lags) * 1000, 1),
+                "mean_ms": round(sum(lags) / len(lags) * 1000, 2),
+            }
+        
+        slow = list(self.slow)
+        platforms: Dict[str, Dict[str, Any]] = {}
+        for item in slow:
+            stats = platforms.setdefault(item["platform"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stats["count"] += 1
+            stats["total_ms"] = round(stats["total_ms"] + item["duration_ms"], 1)
+            stats["max_ms"] = max(stats["max_ms"], item["duration_ms"])
+        
+        return {
+            "interval_ms": round(self.interval * 1000, 1),
+            "samples": len(lags),
+            "lag": lag_stats,
+            "histogram": dict(zip(bucket_labels(), histogram)),
+            "slow_threshold_ms": round(self.slow_callback * 1000, 1),
+            "slow_callbacks": len(slow),
+            "blocked_ms": round(sum(item["duration_ms"] for item in slow), 1),
+            "platforms": dict(sorted(platforms.items(), key=lambda item: item[1]["total_ms"], reverse=True)),
+            "slowest": sorted(slow, key=lambda item: item["duration_ms"], reverse=True)[:TOP_SLOW_CALLBACKS],
+        }
+
+
+def merge_summaries(summaries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    合并多个进程的监控结果（多进程采集时每个子进程各自监控自己的事件循环）
+    
+    直方图、次数和阻塞时间相加，最慢回调重新排序；分位数无法合并，取各进程中的最大值，
+    各进程的原始结果保留在 shards 中。
+    """
+    if not summaries:
+        return {}
+    
+    labels = bucket_labels()
+    samples = sum(summary["samples"] for summary in summaries)
+    lag_stats = {}
+    with_lag = [summary for summary in summaries if summary["lag"]]
+    if with_lag:
+        lag_stats = {
+            key: max(summary["lag"][key] for summary in with_lag)
+            for key in ["p50_ms", "p95_ms", "p99_ms", "max_ms"]
+        }
+        lag_stats["mean_ms"] = round(
+            sum(summary["lag"]["mean_ms"] * summary["samples"] for summary in with_lag) / max(1, samples), 2
+        )
+    
+    platforms: Dict[str, Dict[str, Any]] = {}
+    for summary in summaries:
+        for name, stats in summary["platforms"].items():
+            merged = platforms.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            merged["count"] += stats["count"]
+            merged["total_ms"] = round(merged["total_ms"] + stats["total_ms"], 1)
+            merged["max_ms"] = max(merged["max_ms"], stats["max_ms"])
+    
+    slowest = [item for summary in summaries for item in summary["slowest"]]
+    return {
+        "interval_ms": summaries[0]["interval_ms"],
+        "samples": samples,
+        "lag": lag_stats,
+        "histogram": {label: sum(summary["histogram"].get(label, 0) for summary in summaries) for label in labels},
+        "slow_threshold_ms": summaries[0]["slow_threshold_ms"],
+        "slow_callbacks": sum(summary["slow_callbacks"] for summary in summaries),
+        "blocked_ms": round(sum(summary["blocked_ms"] for summary in summaries), 1),
+        "platforms": dict(sorted(platforms.items(), key=lambda item: item[1]["total_ms"], reverse=True)),
+        "slowest": sorted(slowest, key=lambda item: item["duration_ms"], reverse=True)[:TOP_SLOW_CALLBACKS],
+        "shards": summaries,
+    }
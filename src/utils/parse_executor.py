@@ -0,0 +1,77 @@
+"""解析执行器 - 把 CPU 密集的 HTML / JSON 解析从事件循环转移到线程池或进程池"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+INLINE = "inline"
+THREAD = "thread"
+PROCESS = "process"
+
+# 解析在哪里执行：inline（事件循环内直接执行）、thread（线程池）、process（进程池）
+PARSE_EXECUTOR = os.getenv("PARSE_EXECUTOR", THREAD).lower()
+# 线程池 / 进程池的大小
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_executor: Optional[Executor] = None
+
+
+def parse_executor_kind() -> str:
+    """
+    当前的执行方式（无效配置按 thread 处理）
+    
+    守护进程（如多进程采集的子进程）不能再创建子进程，process 配置在其中按 thread 处理；
+    采集已分散到多个进程，解析在各自的线程池中执行即可利用多个核心。
+    """
+    kind = PARSE_EXECUTOR if PARSE_EXECUTOR in [INLINE, THREAD, PROCESS] else THREAD
+    if kind == PROCESS and multiprocessing.current_process().daemon:
+        return THREAD
+    return kind
+
+
+def get_parse_executor() -> Optional[Executor]:
+    """获取共享的解析执行器，inline 模式返回 None"""
+    global _executor
+    
+    kind = parse_executor_kind()
+    if kind == INLINE:
+        return None
+    if _executor is None:
+        if kind == PROCESS:
+            # 与多进程采集一致使用 spawn，子进程不继承事件循环和连接池
+            _executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        else:
+            _executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parser")
+    return _executor
+
+
+async def run_parser(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    在解析执行器中运行解析函数
+    
+    process 模式下 func 必须是模块级函数，参数和返回值要能被 pickle（传入 str / bytes，返回由
+    dict / list / str / 数字组成的普通数据），不能返回 BeautifulSoup 节点等对象。
+    
+    Args:
+        func: 解析函数（纯函数，不访问网络和共享状态）
+        *args: 传给 func 的参数
+    """
+    executor = get_parse_executor()
+    if executor is None:
+        return func(*args)
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+
+def shutdown_parse_executor():
+    """关闭共享的解析执行器（进程退出前调用）"""
+    global _executor
+    
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
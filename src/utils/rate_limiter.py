@@ -0,0 +1,155 @@
+"""按主机限流 - 令牌桶限速 + 并发上限"""
+
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Any, Tuple
+from urllib.parse import urlsplit
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 未单独配置的主机使用的默认值（0 表示不限制）
+HOST_RATE_LIMIT = float(os.getenv("HOST_RATE_LIMIT", "5"))
+HOST_RATE_BURST = int(os.getenv("HOST_RATE_BURST", "10"))
+HOST_MAX_IN_FLIGHT = int(os.getenv("HOST_MAX_IN_FLIGHT", "6"))
+
+# 主机级配置：按域名后缀匹配，同一条规则下的所有子域名共享配额
+# rate: 每秒请求数，burst: 突发容量，max_in_flight: 同时进行的请求数，
+# group: 可选，group 相同的规则共用同一份配额（如新浪的 sina.com.cn 和 sina.cn）
+HOST_LIMITS: Dict[str, Dict[str, Any]] = {
+    # 11 个经 TopHub 采集的平台、AI 简报以及抖音 / 贴吧的备用数据源共用 tophub.today，不使用默认配额
+    "tophub.today": {"rate": 2.0, "burst": 4, "max_in_flight": 3},
+    # sina / sina-news 分别访问 sina.cn 和 sina.com.cn，共用一份新浪的配额
+    "sina.com.cn": {"rate": 2.0, "burst": 4, "max_in_flight": 2, "group": "sina"},
+    "sina.cn": {"rate": 2.0, "burst": 4, "max_in_flight": 2, "group": "sina"},
+    "douban.com": {"rate": 1.0, "burst": 2, "max_in_flight": 2},
+    # hackernews 每次要拉取 30 条详情
+    "hacker-news.firebaseio.com": {"rate": 20.0, "burst": 30, "max_in_flight": 10},
+}
+
+# 通过环境变量 HOST_LIMITS（JSON）覆盖或追加主机配置，例如：
+# HOST_LIMITS='{"tophub.today": {"rate": 1, "burst": 2, "max_in_flight": 2}}'
+if os.getenv("HOST_LIMITS"):
+    try:
+        for _host, _config in json.loads(os.getenv("HOST_LIMITS")).items():
+            HOST_LIMITS[_host.lower()] = {**HOST_LIMITS.get(_host.lower(), {}), **_config}
+    except (ValueError, AttributeError):
+        pass
+
+
+class TokenBucket:
+    """令牌桶：平均每秒 rate 个请求，最多允许 burst 个突发请求"""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self):
+        """按经过的时间补充令牌"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+    
+    async def acquire(self):
+        """获取一个令牌，不足时等待（按到达顺序排队）"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class _HostState:
+    """单个主机（或主机规则）的限流状态"""
+    
+    def __init__(self, rate: float, burst: int, max_in_flight: int):
+        self.bucket = TokenBucket(rate, burst) if rate and rate > 0 else None
+        self.semaphore = asyncio.Semaphore(max_in_flight) if max_in_flight and max_in_flight > 0 else None
+
+
+class HostLimiter:
+    """按主机限流器"""
+    
+    def __init__(
+        self,
+        host_limits: Optional[Dict[str, Dict[str, Any]]] = None,
+        default_rate: float = HOST_RATE_LIMIT,
+        default_burst: int = HOST_RATE_BURST,
+        default_max_in_flight: int = HOST_MAX_IN_FLIGHT,
+    ):
+        self.host_limits = HOST_LIMITS if host_limits is None else host_limits
+        self.default_config = {
+            "rate": default_rate,
+            "burst": default_burst,
+            "max_in_flight": default_max_in_flight,
+        }
+        self._states: Dict[str, _HostState] = {}
+    
+    def _resolve(self, host: str) -> Tuple[str, Dict[str, Any]]:
+        """查找主机对应的规则，返回 (限流键, 配置)；规则指定了 group 时以 group 为限流键"""
+        host = host.lower()
+        for suffix, config in self.host_limits.items():
+            if host == suffix or host.endswith("." + suffix):
+                return config.get("group") or suffix, {**self.default_config, **config}
+        return host, self.default_config
+    
+    def _get_state(self, host: str) -> _HostState:
+        """获取或创建主机的限流状态"""
+        key, config = self._resolve(host)
+        state = self._states.get(key)
+        if state is None:
+            state = _HostState(config["rate"], config["burst"], config["max_in_flight"])
+            self._states[key] = state
+        return state
+    
+    @asynccontextmanager
+    async def limit(self, url: str, timeout: Optional[float] = None):
+        """
+        在主机配额内执行一次请求：先占用并发名额，再等待令牌
+        
+        Args:
+            url: 请求地址
+            timeout: 排队（等待并发名额和令牌）的时间上限（秒），超过时抛出 asyncio.TimeoutError，None 表示不限制
+        """
+        host = urlsplit(url).hostname or ""
+        state = self._get_state(host)
+        loop = asyncio.get_running_loop()
+        wait_until = None if timeout is None else loop.time() + timeout
+        
+        def remaining() -> Optional[float]:
+            return None if wait_until is None else max(0.0, wait_until - loop.time())
+        
+        if state.semaphore is not None:
+            await asyncio.wait_for(state.semaphore.acquire(), remaining())
+        try:
+            if state.bucket is not None:
+                await asyncio.wait_for(state.bucket.acquire(), remaining())
+            yield
+        finally:
+            if state.semaphore is not None:
+                state.semaphore.release()
+
+
+# 进程级共享限流器，与事件循环绑定
+_shared_limiter: Optional[HostLimiter] = None
+_shared_limiter_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_host_limiter() -> HostLimiter:
+    """获取当前事件循环的共享限流器，事件循环更换后自动重建"""
+    global _shared_limiter, _shared_limiter_loop
+    
+    loop = asyncio.get_running_loop()
+    if _shared_limiter is None or _shared_limiter_loop is not loop:
+        _shared_limiter = HostLimiter()
+        _shared_limiter_loop = loop
+    return _shared_limiter
@@ -0,0 +1,145 @@
+"""重试策略 - 去相关抖动退避、Retry-After、全局重试预算与单请求截止时间"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Set
+
+import aiohttp
+from dotenv import load_dotenv
+
+load_dotenv()
+
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "10"))
+# 单个请求（含全部重试和退避）的总截止时间（秒），0 表示不限制
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", "60"))
+# 每个请求为全局预算存入的重试额度；预算的初始值与上限
+RETRY_BUDGET_RATIO = float(os.getenv("RETRY_BUDGET_RATIO", "0.2"))
+RETRY_BUDGET_MIN = float(os.getenv("RETRY_BUDGET_MIN", "10"))
+RETRY_BUDGET_MAX = float(os.getenv("RETRY_BUDGET_MAX", "100"))
+
+# 可重试的 HTTP 状态码
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class RetryBudget:
+    """
+    全局重试预算
+    
+    每个请求存入 ratio 个额度，每次重试消耗 1 个额度。大面积失败时额度很快耗尽，
+    后续请求只尝试一次，避免重试把上游的压力成倍放大。
+    """
+    
+    def __init__(self, ratio: float = RETRY_BUDGET_RATIO, initial: float = RETRY_BUDGET_MIN, max_tokens: float = RETRY_BUDGET_MAX):
+        self.ratio = ratio
+        self.max_tokens = max(max_tokens, initial)
+        self._tokens = initial
+        self._lock = threading.Lock()
+    
+    def deposit(self):
+        """记录一次请求"""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+    
+    def try_withdraw(self) -> bool:
+        """尝试为一次重试扣减额度，额度不足时返回 False"""
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+    
+    @property
+    def tokens(self) -> float:
+        """当前剩余额度"""
+        return self._tokens
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After（秒数或 HTTP 日期），返回需要等待的秒数"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+class RetryPolicy:
+    """重试策略"""
+    
+    def __init__(
+        self,
+        base_delay: float = RETRY_BASE_DELAY,
+        max_delay: float = RETRY_MAX_DELAY,
+        deadline: float = REQUEST_DEADLINE,
+        retry_statuses: Optional[Set[int]] = None,
+        budget: Optional[RetryBudget] = None,
+    ):
+        """
+        初始化重试策略
+        
+        Args:
+            base_delay: 最小退避时间（秒）
+            max_delay: 最大退避时间（秒），Retry-After 超过该值时放弃重试
+            deadline: 单个请求含重试的总截止时间（秒），0 表示不限制
+            retry_statuses: 可重试的 HTTP 状态码
+            budget: 重试预算，默认使用全局共享预算
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_statuses = RETRY_STATUSES if retry_statuses is None else retry_statuses
+        self.budget = budget or get_retry_budget()
+    
+    def should_retry(self, error: BaseException, idempotent: bool = True) -> bool:
+        """
+        判断错误是否可以重试
+        
+        非幂等请求（如 POST）只在请求确定没有被服务端处理时重试：连接建立失败或 429。
+        """
+        if isinstance(error, aiohttp.ClientResponseError):
+            if not idempotent:
+                return error.status == 429
+            return error.status in self.retry_statuses
+        if isinstance(error, aiohttp.ClientConnectorError):
+            return True
+        if isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError)):
+            return idempotent
+        return False
+    
+    def next_delay(self, previous_delay: float, error: Optional[BaseException] = None) -> Optional[float]:
+        """
+        计算下一次重试前的等待时间
+        
+        优先遵守服务端的 Retry-After（超过 max_delay 时返回 None，表示放弃重试），
+        否则使用去相关抖动：delay = min(max_delay, random(base_delay, previous_delay * 3))
+        """
+        if isinstance(error, aiohttp.ClientResponseError) and error.headers:
+            retry_after = parse_retry_after(error.headers.get("Retry-After"))
+            if retry_after is not None:
+                return retry_after if retry_after <= self.max_delay else None
+        upper = max(self.base_delay, previous_delay * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+
+# 进程级共享重试预算
+_shared_budget: Optional[RetryBudget] = None
+
+
+def get_retry_budget() -> RetryBudget:
+    """获取全局共享的重试预算"""
+    global _shared_budget
+    
+    if _shared_budget is None:
+        _shared_budget = RetryBudget()
+    return _shared_budget
@@ -0,0 +1,6 @@
+"""运行上下文 - 在异步任务之间传递当前平台等信息"""
+
+from contextvars import ContextVar
+
+# 当前正在采集的平台名称，由 collect_platform 在各自的任务中设置
+current_platform: ContextVar[str] = ContextVar("current_platform", default="")
@@ -12,6 +12,7 @@ from typing import Dict, Optional
 from dotenv import load_dotenv
 
 from ..utils.http_client import HTTPClient
+from ..utils.http_replay import open_response
 
 load_dotenv()
 
@@ -119,7 +120,7 @@ async def get_douyin_cookie(http_client: HTTPClient) -> Optional[str]:
         # 需要获取原始响应头
         import aiohttp
         async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
+            async with open_response(session, "GET", url) as response:
                 cookies = response.cookies
                 if 'passport_csrf_token' in cookies:
                     return str(cookies['passport_csrf_token'].value)
@@ -1,132 +1,19 @@
 """TopHub 备用数据获取工具"""
 
-import json
 import re
 from typing import Dict, List, Any, Optional
 from bs4 import BeautifulSoup
 
 from ..utils.http_client import HTTPClient
+from ..utils.parse_executor import run_parser
 
 
 async def fetch_douyin_from_tophub(http_client: HTTPClient) -> List[Dict[str, Any]]:
     """从 TopHub 获取抖音总榜数据"""
     try:
-        # 直接访问首页，查找抖音总榜的链接
-        home_url = "https://tophub.today/"
-        
-        html = await http_client.get(
-            url=home_url,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-            },
-            response_type="text"
-        )
-        
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # 查找抖音总榜的链接 - 搜索包含"抖音"和"总榜"的链接
-        douyin_url = None
-        links = soup.find_all('a', href=True)
-        
-        for link in links:
-            link_text = link.get_text(strip=True)
-            href = link.get('href', '')
-            # 检查链接文本或父元素文本
-            parent_text = ""
-            if link.parent:
-                parent_text = link.parent.get_text()
-            
-            if ('抖音' in link_text or '抖音' in parent_text) and ('总榜' in link_text or '总榜' in parent_text or '/n/' in href):
-                if '/n/' in href:
-                    douyin_url = href if href.startswith('http') else f"https://tophub.today{href}"
-                    break
-        
-        # 如果找到了链接，访问该页面
-        if douyin_url:
-            page_html = await http_client.get(
-                url=douyin_url,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-                    "Referer": "https://tophub.today/",
-                },
-                response_type="text"
-            )
-            
-            soup = BeautifulSoup(page_html, 'html.parser')
-        
-        # 解析表格数据 - 查找常见的表格结构
-        table_rows = soup.select('table tbody tr')
-        if not table_rows:
-            # 尝试其他选择器
-            table_rows = soup.select('.table tbody tr, .list tbody tr, tbody tr')
-        
-        if table_rows:
-            result = []
-            for idx, row in enumerate(table_rows[:50]):
-                # 提取标题 - 通常在第一个td或a标签中
-                title_elem = row.select_one('td:first-child a, td a:first-child, .title a, a.title')
-                if not title_elem:
-                    title_elem = row.select_one('td:first-child, .title')
-                
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    if not title or len(title) < 2:
-                        continue
-                    
-                    # 提取链接
-                    href = ""
-                    if title_elem.name == 'a':
-                        href = title_elem.get('href', '')
-                    else:
-                        link_elem = row.select_one('a')
-                        if link_elem:
-                            href = link_elem.get('href', '')
-                    
-                    # 构建完整URL
-                    if href:
-                        if not href.startswith('http'):
-                            if href.startswith('/'):
-                                url_full = f"https://tophub.today{href}"
-                            else:
-                                url_full = f"https://tophub.today/{href}"
-                        else:
-                            url_full = href
-                    else:
-                        url_full = f"https://www.douyin.com/hot/{idx}"
-                    
-                    # 提取热度值 - 通常在最后一个td中
-                    hot_elem = row.select_one('td:last-child, .hot, .score, .heat, td:nth-child(2)')
-                    hot_value = 0
-                    if hot_elem:
-                        hot_text = hot_elem.get_text(strip=True)
-                        # 处理中文数字（如"100万"、"1.2万"）
-                        hot_text = hot_text.replace('万', '0000').replace('千', '000').replace('次播放', '')
-                        hot_match = re.search(r'(\d+(?:\.\d+)?)', hot_text.replace(',', ''))
-                        if hot_match:
-                            try:
-                                num = float(hot_match.group(1))
-                                hot_value = int(num)
-                            except:
-                                pass
-                    
-                    result.append({
-                        "id": str(idx),
-                        "title": title,
-                        "timestamp": 0,
-                        "hot": hot_value,
-                        "url": url_full,
-                        "mobileUrl": url_full,
-                    })
-            
-            if result:
-                return result
-        
-        return []
-        
+        # 直接访问首页，查找抖音总榜的链接 - 搜索包含"抖音"和"总榜"的链接
+        page_html = await _fetch_board_page(http_client, "抖音", "总榜")
+        return await run_parser(parse_douyin_table, page_html)
     except Exception as e:
         return []
 
@@ -134,122 +21,167 @@ async def fetch_douyin_from_tophub(http_client: HTTPClient) -> List[Dict[str, An
 async def fetch_tieba_from_tophub(http_client: HTTPClient) -> List[Dict[str, Any]]:
     """从 TopHub 获取百度贴吧热议榜数据"""
     try:
-        # 直接访问首页，查找百度贴吧热议榜的链接
-        home_url = "https://tophub.today/"
-        
-        html = await http_client.get(
-            url=home_url,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-            },
-            response_type="text"
-        )
-        
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # 查找百度贴吧热议榜的链接 - 搜索包含"贴吧"和"热议"的链接
-        tieba_url = None
-        links = soup.find_all('a', href=True)
-        
-        for link in links:
-            link_text = link.get_text(strip=True)
-            href = link.get('href', '')
-            # 检查链接文本或父元素文本
-            parent_text = ""
-            if link.parent:
-                parent_text = link.parent.get_text()
+        # 直接访问首页，查找百度贴吧热议榜的链接 - 搜索包含"贴吧"和"热议"的链接
+        page_html = await _fetch_board_page(http_client, "贴吧", "热议")
+        return await run_parser(parse_tieba_table, page_html)
+    except Exception as e:
+        return []
+
+
+async def _fetch_board_page(http_client: HTTPClient, platform_keyword: str, board_keyword: str) -> str:
+    """获取 TopHub 首页，找到榜单链接后返回榜单页，找不到时返回首页"""
+    home_url = "https://tophub.today/"
+    
+    html = await http_client.get(
+        url=home_url,
+        headers={
+            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+        },
+        response_type="text"
+    )
+    
+    board_url = await run_parser(find_board_link, html, platform_keyword, board_keyword)
+    
+    # 如果找到了链接，访问该页面
+    if not board_url:
+        return html
+    return await http_client.get(
+        url=board_url,
+        headers={
+            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+            "Referer": "https://tophub.today/",
+        },
+        response_type="text"
+    )
+
+
+def find_board_link(html: str, platform_keyword: str, board_keyword: str) -> Optional[str]:
+    """在 TopHub 首页查找榜单链接（链接或其父元素的文本同时包含平台和榜单关键词）（模块级纯函数，可在解析执行器中运行）"""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    for link in soup.find_all('a', href=True):
+        link_text = link.get_text(strip=True)
+        href = link.get('href', '')
+        # 检查链接文本或父元素文本
+        parent_text = ""
+        if link.parent:
+            parent_text = link.parent.get_text()
+        
+        if (platform_keyword in link_text or platform_keyword in parent_text) and (board_keyword in link_text or board_keyword in parent_text or '/n/' in href):
+            if '/n/' in href:
+                return href if href.startswith('http') else f"https://tophub.today{href}"
+    return None
+
+
+def parse_douyin_table(html: str) -> List[Dict[str, Any]]:
+    """解析 TopHub 抖音总榜（模块级纯函数，可在解析执行器中运行）"""
+    return [
+        {
+            "id": row["id"],
+            "title": row["title"],
+            "timestamp": 0,
+            "hot": row["hot"],
+            "url": row["url"],
+            "mobileUrl": row["url"],
+        }
+        for row in _parse_rows(html, "https://www.douyin.com/hot/{idx}", "次播放")
+    ]
+
+
+def parse_tieba_table(html: str) -> List[Dict[str, Any]]:
+    """解析 TopHub 百度贴吧热议榜（模块级纯函数，可在解析执行器中运行）"""
+    return [
+        {
+            "id": row["id"],
+            "title": row["title"],
+            "desc": "",
+            "cover": "",
+            "hot": row["hot"],
+            "timestamp": 0,
+            "url": row["url"],
+            "mobileUrl": row["url"],
+        }
+        for row in _parse_rows(html, "https://tieba.baidu.com/hottopic/browse/topicList", "实时讨论")
+    ]
+
+
+def _parse_rows(html: str, default_url: str, hot_suffix: str) -> List[Dict[str, Any]]:
+    """
+    解析榜单表格的前 50 行
+    
+    Args:
+        html: 榜单页（或首页）HTML
+        default_url: 行内没有链接时使用的地址，可包含 {idx}
+        hot_suffix: 热度文本中要去掉的后缀，如"次播放"
+    
+    Returns:
+        由 id / title / hot / url 组成的列表
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # 解析表格数据 - 查找常见的表格结构
+    table_rows = soup.select('table tbody tr')
+    if not table_rows:
+        # 尝试其他选择器
+        table_rows = soup.select('.table tbody tr, .list tbody tr, tbody tr')
+    
+    result = []
+    for idx, row in enumerate(table_rows[:50]):
+        # 提取标题 - 通常在第一个td或a标签中
+        title_elem = row.select_one('td:first-child a, td a:first-child, .title a, a.title')
+        if not title_elem:
+            title_elem = row.select_one('td:first-child, .title')
+        
+        if title_elem:
+            title = title_elem.get_text(strip=True)
+            if not title or len(title) < 2:
+                continue
             
-            if ('贴吧' in link_text or '贴吧' in parent_text) and ('热议' in link_text or '热议' in parent_text or '/n/' in href):
-                if '/n/' in href:
-                    tieba_url = href if href.startswith('http') else f"https://tophub.today{href}"
-                    break
-        
-        # 如果找到了链接，访问该页面
-        if tieba_url:
-            page_html = await http_client.get(
-                url=tieba_url,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-                    "Referer": "https://tophub.today/",
-                },
-                response_type="text"
-            )
+            # 提取链接
+            href = ""
+            if title_elem.name == 'a':
+                href = title_elem.get('href', '')
+            else:
+                link_elem = row.select_one('a')
+                if link_elem:
+                    href = link_elem.get('href', '')
             
-            soup = BeautifulSoup(page_html, 'html.parser')
-        
-        # 解析表格数据
-        table_rows = soup.select('table tbody tr')
-        if not table_rows:
-            table_rows = soup.select('.table tbody tr, .list tbody tr, tbody tr')
-        
-        if table_rows:
-            result = []
-            for idx, row in enumerate(table_rows[:50]):
-                # 提取标题
-                title_elem = row.select_one('td:first-child a, td a:first-child, .title a, a.title')
-                if not title_elem:
-                    title_elem = row.select_one('td:first-child, .title')
-                
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    if not title or len(title) < 2:
-                        continue
-                    
-                    # 提取链接
-                    href = ""
-                    if title_elem.name == 'a':
-                        href = title_elem.get('href', '')
+            # 构建完整URL
+            if href:
+                if not href.startswith('http'):
+                    if href.startswith('/'):
+                        url_full = f"https://tophub.today{href}"
                     else:
-                        link_elem = row.select_one('a')
-                        if link_elem:
-                            href = link_elem.get('href', '')
-                    
-                    # 构建完整URL
-                    if href:
-                        if not href.startswith('http'):
-                            if href.startswith('/'):
-                                url_full = f"https://tophub.today{href}"
-                            else:
-                                url_full = f"https://tophub.today/{href}"
-                        else:
-                            url_full = href
-                    else:
-                        url_full = f"https://tieba.baidu.com/hottopic/browse/topicList"
-                    
-                    # 提取热度值
-                    hot_elem = row.select_one('td:last-child, .hot, .score, .heat, td:nth-child(2)')
-                    hot_value = 0
-                    if hot_elem:
-                        hot_text = hot_elem.get_text(strip=True)
-                        # 处理中文数字（如"100万"、"1.2万"）
-                        hot_text = hot_text.replace('万', '0000').replace('千', '000').replace('实时讨论', '')
-                        hot_match = re.search(r'(\d+(?:\.\d+)?)', hot_text.replace(',', ''))
-                        if hot_match:
-                            try:
-                                num = float(hot_match.group(1))
-                                hot_value = int(num)
-                            except:
-                                pass
-                    
-                    result.append({
-                        "id": str(idx),
-                        "title": title,
-                        "desc": "",
-                        "cover": "",
-                        "hot": hot_value,
-                        "timestamp": 0,
-                        "url": url_full,
-                        "mobileUrl": url_full,
-                    })
+                        url_full = f"https://tophub.today/{href}"
+                else:
+                    url_full = href
+            else:
+                url_full = default_url.format(idx=idx)
             
-            if result:
-                return result
-        
-        return []
-        
-    except Exception as e:
-        return []
+            # 提取热度值 - 通常在最后一个td中
+            hot_elem = row.select_one('td:last-child, .hot, .score, .heat, td:nth-child(2)')
+            hot_value = 0
+            if hot_elem:
+                hot_text = hot_elem.get_text(strip=True)
+                # 处理中文数字（如"100万"、"1.2万"）
+                hot_text = hot_text.replace('万', '0000').replace('千', '000').replace(hot_suffix, '')
+                hot_match = re.search(r'(\d+(?:\.\d+)?)', hot_text.replace(',', ''))
+                if hot_match:
+                    try:
+                        num = float(hot_match.group(1))
+                        hot_value = int(num)
+                    except:
+                        pass
+            
+            result.append({
+                "id": str(idx),
+                "title": title,
+                "hot": hot_value,
+                "url": url_full,
+            })
+    
+    return result
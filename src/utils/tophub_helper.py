@@ -5,6 +5,7 @@ from typing import Dict, List, Any, Optional
 from bs4 import BeautifulSoup
 
 from ..utils.http_client import HTTPClient
+from ..utils.parse_executor import run_parser
 
 
 async def fetch_from_tophub(http_client: HTTPClient, platform_keywords: List[str], platform_name: str) -> List[Dict[str, Any]]:
@@ -33,24 +34,8 @@ async def fetch_from_tophub(http_client: HTTPClient, platform_keywords: List[str
             response_type="text"
         )
         
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # 查找平台的链接
-        platform_url = None
-        links = soup.find_all('a', href=True)
-        
-        for link in links:
-            link_text = link.get_text(strip=True)
-            href = link.get('href', '')
-            parent_text = ""
-            if link.parent:
-                parent_text = link.parent.get_text()
-            
-            # 检查是否匹配所有关键词
-            full_text = f"{link_text} {parent_text}"
-            if all(keyword in full_text for keyword in platform_keywords) and '/n/' in href:
-                platform_url = href if href.startswith('http') else f"https://tophub.today{href}"
-                break
+        # 在首页查找平台的链接
+        platform_url = await run_parser(find_platform_link, html, platform_keywords)
         
         # 如果找到了链接，访问该页面
         if platform_url:
@@ -64,84 +49,114 @@ async def fetch_from_tophub(http_client: HTTPClient, platform_keywords: List[str
                 },
                 response_type="text"
             )
-            
-            soup = BeautifulSoup(page_html, 'html.parser')
+        else:
+            page_html = html
         
-        # 解析表格数据
-        table_rows = soup.select('table tbody tr')
-        if not table_rows:
-            table_rows = soup.select('.table tbody tr, .list tbody tr, tbody tr')
+        return await run_parser(parse_table, page_html, platform_url)
+    
+    except Exception as e:
+        return []
+
+
+def find_platform_link(html: str, platform_keywords: List[str]) -> Optional[str]:
+    """在 TopHub 首页中查找同时包含所有关键词的榜单链接（模块级纯函数，可在解析执行器中运行）"""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    platform_url = None
+    links = soup.find_all('a', href=True)
+    
+    for link in links:
+        link_text = link.get_text(strip=True)
+        href = link.get('href', '')
+        parent_text = ""
+        if link.parent:
+            parent_text = link.parent.get_text()
         
-        if table_rows:
-            result = []
-            for idx, row in enumerate(table_rows[:50]):
-                # 提取标题
-                title_elem = row.select_one('td:first-child a, td a:first-child, .title a, a.title')
-                if not title_elem:
-                    title_elem = row.select_one('td:first-child, .title')
+        # 检查是否匹配所有关键词
+        full_text = f"{link_text} {parent_text}"
+        if all(keyword in full_text for keyword in platform_keywords) and '/n/' in href:
+            platform_url = href if href.startswith('http') else f"https://tophub.today{href}"
+            break
+    
+    return platform_url
+
+
+def parse_table(html: str, platform_url: Optional[str] = None) -> List[Dict[str, Any]]:
+    """解析 TopHub 榜单页的表格（模块级纯函数，可在解析执行器中运行）"""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # 解析表格数据
+    table_rows = soup.select('table tbody tr')
+    if not table_rows:
+        table_rows = soup.select('.table tbody tr, .list tbody tr, tbody tr')
+    
+    if table_rows:
+        result = []
+        for idx, row in enumerate(table_rows[:50]):
+            # 提取标题
+            title_elem = row.select_one('td:first-child a, td a:first-child, .title a, a.title')
+            if not title_elem:
+                title_elem = row.select_one('td:first-child, .title')
+            
+            if title_elem:
+                title = title_elem.get_text(strip=True)
+                if not title or len(title) < 2:
+                    continue
                 
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    if not title or len(title) < 2:
-                        continue
-                    
-                    # 提取链接
-                    href = ""
-                    if title_elem.name == 'a':
-                        href = title_elem.get('href', '')
-                    else:
-                        link_elem = row.select_one('a')
-                        if link_elem:
-                            href = link_elem.get('href', '')
-                    
-                    # 构建完整URL
-                    if href:
-                        if not href.startswith('http'):
-                            if href.startswith('/'):
-                                url_full = f"https://tophub.today{href}"
-                            else:
-                                url_full = f"https://tophub.today/{href}"
+                # 提取链接
+                href = ""
+                if title_elem.name == 'a':
+                    href = title_elem.get('href', '')
+                else:
+                    link_elem = row.select_one('a')
+                    if link_elem:
+                        href = link_elem.get('href', '')
+                
+                # 构建完整URL
+                if href:
+                    if not href.startswith('http'):
+                        if href.startswith('/'):
+                            url_full = f"https://tophub.today{href}"
                         else:
-                            url_full = href
+                            url_full = f"https://tophub.today/{href}"
                     else:
-                        url_full = platform_url or f"https://tophub.today/"
-                    
-                    # 提取热度值
-                    hot_elem = row.select_one('td:last-child, .hot, .score, .heat, td:nth-child(2)')
-                    hot_value = 0
-                    if hot_elem:
-                        hot_text = hot_elem.get_text(strip=True)
-                        # 处理中文数字（如"100万"、"1.2万"）
-                        hot_text = hot_text.replace('万', '0000').replace('千', '000').replace('次播放', '').replace('实时讨论', '')
-                        hot_match = re.search(r'(\d+(?:\.\d+)?)', hot_text.replace(',', ''))
-                        if hot_match:
-                            try:
-                                num = float(hot_match.group(1))
-                                hot_value = int(num)
-                            except:
-                                pass
-                    
-                    # 提取描述（如果有）
-                    desc_elem = row.select_one('td:nth-child(2), .desc, .description')
-                    desc = ""
-                    if desc_elem and desc_elem != hot_elem:
-                        desc = desc_elem.get_text(strip=True)
-                    
-                    result.append({
-                        "id": str(idx),
-                        "title": title,
-                        "desc": desc,
-                        "cover": "",
-                        "hot": hot_value,
-                        "timestamp": 0,
-                        "url": url_full,
-                        "mobileUrl": url_full,
-                    })
-            
-            if result:
-                return result
-        
-        return []
+                        url_full = href
+                else:
+                    url_full = platform_url or f"https://tophub.today/"
+                
+                # 提取热度值
+                hot_elem = row.select_one('td:last-child, .hot, .score, .heat, td:nth-child(2)')
+                hot_value = 0
+                if hot_elem:
+                    hot_text = hot_elem.get_text(strip=True)
+                    # 处理中文数字（如"100万"、"1.2万"）
+                    hot_text = hot_text.replace('万', '0000').replace('千', '000').replace('次播放', '').replace('实时讨论', '')
+                    hot_match = re.search(r'(\d+(?:\.\d+)?)', hot_text.replace(',', ''))
+                    if hot_match:
+                        try:
+                            num = float(hot_match.group(1))
+                            hot_value = int(num)
+                        except:
+                            pass
+                
+                # 提取描述（如果有）
+                desc_elem = row.select_one('td:nth-child(2), .desc, .description')
+                desc = ""
+                if desc_elem and desc_elem != hot_elem:
+                    desc = desc_elem.get_text(strip=True)
+                
+                result.append({
+                    "id": str(idx),
+                    "title": title,
+                    "desc": desc,
+                    "cover": "",
+                    "hot": hot_value,
+                    "timestamp": 0,
+                    "url": url_full,
+                    "mobileUrl": url_full,
+                })
         
-    except Exception as e:
-        return []
+        if result:
+            return result
+    
+    return []